@@ -0,0 +1,29 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_task_planner_inputs"
+down_revision = "0013_utt_bot_model_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("task_templates", sa.Column("last_completed_at", sa.DateTime(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE task_templates
+            SET last_completed_at = (
+                SELECT MAX(task_history.completed_at)
+                FROM task_history
+                WHERE task_history.task_id = task_templates.id
+            )
+            """
+        )
+    )
+    op.create_index("ix_task_history_user_completed_at", "task_history", ["user_id", "completed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_history_user_completed_at", table_name="task_history")
+    op.drop_column("task_templates", "last_completed_at")
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime
+import json
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015_task_scheduled_slots"
+down_revision = "0014_task_planner_inputs"
+branch_labels = None
+depends_on = None
+
+
+def _parse_slot(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(UTC).replace(tzinfo=None)
+    return parsed
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_scheduled_slots",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("task_id", sa.String(length=36), sa.ForeignKey("task_templates.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("slot_at", sa.DateTime(), nullable=False),
+        sa.Column("value", sa.String(length=64), nullable=False),
+    )
+    op.create_index("ix_task_scheduled_slots_user_slot_at", "task_scheduled_slots", ["user_id", "slot_at"])
+    op.create_index("ix_task_scheduled_slots_task_id", "task_scheduled_slots", ["task_id"])
+
+    slots_table = sa.table(
+        "task_scheduled_slots",
+        sa.column("id", sa.String(length=36)),
+        sa.column("user_id", sa.String(length=36)),
+        sa.column("task_id", sa.String(length=36)),
+        sa.column("slot_at", sa.DateTime()),
+        sa.column("value", sa.String(length=64)),
+    )
+    rows = []
+    templates = op.get_bind().execute(sa.text("SELECT id, user_id, metadata_json FROM task_templates"))
+    for task_id, user_id, metadata in templates:
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        for value in (metadata or {}).get("scheduled_slots") or []:
+            slot_at = _parse_slot(value)
+            if slot_at is None:
+                continue
+            rows.append({"id": str(uuid.uuid4()), "user_id": user_id, "task_id": task_id, "slot_at": slot_at, "value": str(value)})
+    if rows:
+        op.bulk_insert(slots_table, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_scheduled_slots_task_id", table_name="task_scheduled_slots")
+    op.drop_index("ix_task_scheduled_slots_user_slot_at", table_name="task_scheduled_slots")
+    op.drop_table("task_scheduled_slots")
@@ -0,0 +1,14 @@
+from alembic import op
+
+revision = "0016_task_history_task_index"
+down_revision = "0015_task_scheduled_slots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_task_history_user_task_completed_at", "task_history", ["user_id", "task_id", "completed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_history_user_task_completed_at", table_name="task_history")
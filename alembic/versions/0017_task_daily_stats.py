@@ -0,0 +1,50 @@
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.task_stats import daily_stat_rows, tally_history
+
+revision = "0017_task_daily_stats"
+down_revision = "0016_task_history_task_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_daily_stats",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("task_id", sa.String(length=36), sa.ForeignKey("task_templates.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("progress_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("task_id", "day", name="uq_task_daily_stats_task_day"),
+    )
+    op.create_index("ix_task_daily_stats_user_day", "task_daily_stats", ["user_id", "day"])
+
+    stats_table = sa.table(
+        "task_daily_stats",
+        sa.column("id", sa.String(length=36)),
+        sa.column("user_id", sa.String(length=36)),
+        sa.column("task_id", sa.String(length=36)),
+        sa.column("day", sa.Date()),
+        sa.column("completed_count", sa.Integer()),
+        sa.column("progress_count", sa.Integer()),
+        sa.column("skipped_count", sa.Integer()),
+        sa.column("minutes", sa.Integer()),
+    )
+    history = op.get_bind().execute(
+        sa.text("SELECT user_id, task_id, completed_at, status, duration_minutes FROM task_history").columns(
+            completed_at=sa.DateTime()
+        )
+    )
+    rows = daily_stat_rows(tally_history(history))
+    if rows:
+        op.bulk_insert(stats_table, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_daily_stats_user_day", table_name="task_daily_stats")
+    op.drop_table("task_daily_stats")
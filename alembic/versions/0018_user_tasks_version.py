@@ -0,0 +1,17 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0018_user_tasks_version"
+down_revision = "0017_task_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("tasks_version", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("users", sa.Column("tasks_changed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "tasks_changed_at")
+    op.drop_column("users", "tasks_version")
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0019_user_gym_seed_version"
+down_revision = "0018_user_tasks_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing users start at 0, so their seed cleanup runs once more and is then recorded.
+    op.add_column("users", sa.Column("gym_seed_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "gym_seed_version")
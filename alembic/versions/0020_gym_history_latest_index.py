@@ -0,0 +1,19 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0020_gym_history_latest_index"
+down_revision = "0019_user_gym_seed_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_gym_exercise_history_user_exercise_recorded_at",
+        "gym_exercise_history",
+        ["user_id", "exercise_id", sa.text("recorded_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gym_exercise_history_user_exercise_recorded_at", table_name="gym_exercise_history")
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0021_gym_exercise_muscle_tokens"
+down_revision = "0020_gym_history_latest_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL here: the app fills muscle_tokens the first time a substitute lookup reads an exercise.
+    op.add_column("gym_exercises", sa.Column("muscle_tokens", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("gym_exercises", "muscle_tokens")
@@ -0,0 +1,30 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0022_gym_weekly_volume"
+down_revision = "0021_gym_exercise_muscle_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "gym_weekly_volume",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("muscle", sa.String(length=64), nullable=False),
+        sa.Column("direct_sets", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("indirect_sets", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("user_id", "week_start", "muscle", name="uq_gym_weekly_volume_user_week_muscle"),
+    )
+    op.create_index("ix_gym_weekly_volume_user_week", "gym_weekly_volume", ["user_id", "week_start"])
+    # Muscle normalization lives in the app, so the table is not backfilled here. Every user starts at
+    # rollup version 0 and is rebuilt from history on the first read (or by python -m app.services.gym_rollups).
+    op.add_column("users", sa.Column("gym_rollup_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "gym_rollup_version")
+    op.drop_index("ix_gym_weekly_volume_user_week", table_name="gym_weekly_volume")
+    op.drop_table("gym_weekly_volume")
@@ -0,0 +1,32 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0023_gym_exercise_daily_records"
+down_revision = "0022_gym_weekly_volume"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled per user on the next rollup rebuild: GYM_ROLLUP_VERSION 2 marks every existing user as stale.
+    op.create_table(
+        "gym_exercise_daily_records",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("exercise_id", sa.String(length=64), sa.ForeignKey("gym_exercises.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sets", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("volume", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("max_reps", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_weight", sa.Float(), nullable=True),
+        sa.Column("best_weight_reps", sa.Integer(), nullable=True),
+        sa.Column("best_e1rm", sa.Float(), nullable=True),
+        sa.UniqueConstraint("exercise_id", "day", name="uq_gym_exercise_daily_records_exercise_day"),
+    )
+    op.create_index("ix_gym_exercise_daily_records_user_id", "gym_exercise_daily_records", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gym_exercise_daily_records_user_id", table_name="gym_exercise_daily_records")
+    op.drop_table("gym_exercise_daily_records")
@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0024_user_calendar_feed_version"
+down_revision = "0023_gym_exercise_daily_records"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Feed tokens issued before this column carry no version and stop working; users fetch a new link once.
+    op.add_column("users", sa.Column("calendar_feed_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "calendar_feed_version")
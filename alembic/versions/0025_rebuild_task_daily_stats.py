@@ -0,0 +1,39 @@
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.task_stats import daily_stat_rows, tally_history
+
+revision = "0025_rebuild_task_daily_stats"
+down_revision = "0024_user_calendar_feed_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 0017 originally bucketed with CAST(completed_at AS DATE), which is not the write path's UTC day
+    # (and not a date at all on SQLite); recount every row with the shared definition.
+    stats_table = sa.table(
+        "task_daily_stats",
+        sa.column("id", sa.String(length=36)),
+        sa.column("user_id", sa.String(length=36)),
+        sa.column("task_id", sa.String(length=36)),
+        sa.column("day", sa.Date()),
+        sa.column("completed_count", sa.Integer()),
+        sa.column("progress_count", sa.Integer()),
+        sa.column("skipped_count", sa.Integer()),
+        sa.column("minutes", sa.Integer()),
+    )
+    bind = op.get_bind()
+    history = bind.execute(
+        sa.text("SELECT user_id, task_id, completed_at, status, duration_minutes FROM task_history").columns(
+            completed_at=sa.DateTime()
+        )
+    )
+    rows = daily_stat_rows(tally_history(history))
+    bind.execute(stats_table.delete())
+    if rows:
+        op.bulk_insert(stats_table, rows)
+
+
+def downgrade() -> None:
+    pass
@@ -1,23 +1,127 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+import time
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .metrics import Histogram, register_collector
+
+
+POOL_WAIT_SECONDS: dict[str, Histogram] = {"sync": Histogram(), "async": Histogram()}
+
+
+class _InstrumentedQueuePool(QueuePool):
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS[self.metrics_label].observe(time.perf_counter() - started)
+
+
+class _InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS[self.metrics_label].observe(time.perf_counter() - started)
+
+
+def _engine_options(settings: Settings, url: str, *, is_async: bool) -> dict:
+    options: dict = {
+        "poolclass": _InstrumentedAsyncQueuePool if is_async else _InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    timeout_ms = settings.db_statement_timeout_ms
+    if timeout_ms and make_url(url).get_backend_name() == "postgresql":
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
 
 
 settings = get_settings()
-engine = create_engine(settings.database_url, future=True, pool_pre_ping=True)
+engine = create_engine(settings.database_url, future=True, **_engine_options(settings, settings.database_url, is_async=False))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+async_engine = create_async_engine(
+    settings.resolved_async_database_url,
+    **_engine_options(settings, settings.resolved_async_database_url, is_async=True),
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def upsert_insert(db: Session, model):
+    """INSERT for the session's dialect, so callers can add on_conflict_do_update() for counters kept under a unique key."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"upsert is not supported on {dialect}")
+
+
 def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> dict:
+    pools = {"sync": engine.pool, "async": async_engine.sync_engine.pool}
+    status: dict = {}
+    for label, pool in pools.items():
+        status[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.db_max_overflow,
+            "wait_seconds": POOL_WAIT_SECONDS[label].snapshot(),
+        }
+    return status
+
+
+def _collect_pool_metrics():
+    status = pool_status()
+    for name, field, documentation in [
+        ("db_pool_size", "size", "Configured connection pool size."),
+        ("db_pool_checked_out", "checked_out", "Connections currently checked out of the pool."),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size."),
+    ]:
+        yield name, "gauge", documentation, [({"engine": label}, values[field]) for label, values in status.items()]
+    yield (
+        "db_pool_wait_seconds",
+        "histogram",
+        "Time spent waiting to check out a pooled connection.",
+        [({"engine": label}, values["wait_seconds"]) for label, values in status.items()],
+    )
+
+
+register_collector(_collect_pool_metrics)
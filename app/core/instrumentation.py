@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+from .metrics import HTTP_REQUEST_DB_SECONDS, HTTP_REQUEST_DURATION_SECONDS, HTTP_REQUESTS_IN_FLIGHT, HTTP_REQUESTS_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_IN_LIST_RE = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+
+
+@dataclass
+class RequestStats:
+    db_seconds: float = 0.0
+    db_statements: int = 0
+    statement_shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.statement_shapes.most_common() if count > threshold]
+
+    def server_timing(self, elapsed_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_statements} queries", '
+            f"app;dur={elapsed_seconds * 1000:.1f}"
+        )
+
+
+def _statement_shape(statement: str) -> str:
+    return _IN_LIST_RE.sub("IN (...)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started_at"].pop()
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.db_seconds += time.perf_counter() - started
+    stats.db_statements += 1
+    stats.statement_shapes[_statement_shape(statement)] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    # A statement that raised never reaches after_cursor_execute; drop its start time so it does not
+    # stay on the pooled connection and get paired with a later statement.
+    connection = exception_context.connection
+    if connection is None or exception_context.statement is None:
+        return
+    started = connection.info.get("query_started_at")
+    if started:
+        started.pop()
+
+
+def _route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(time.perf_counter() - started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            method = scope["method"]
+            route = _route_template(scope)
+            labels = {"method": method, "route": route, "status": str(status_code)}
+            HTTP_REQUESTS_TOTAL.inc(**labels)
+            HTTP_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - started, **labels)
+            HTTP_REQUEST_DB_SECONDS.observe(stats.db_seconds, method=method, route=route)
+            threshold = get_settings().sql_repeat_warning_threshold
+            if threshold > 0:
+                for shape, count in stats.repeated_shapes(threshold):
+                    logger.warning("Possible N+1: statement ran %d times in %s %s: %s", count, method, route, shape[:300])
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A collector yields (name, kind, documentation, [(labels, value), ...]) at scrape time.
+Collector = Callable[[], Iterable[tuple[str, str, str, list[tuple[dict[str, str], float]]]]]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        running += counts[-1]
+        cumulative["+Inf"] = running
+        return {"buckets": cumulative, "count": running, "sum": round(total, 6)}
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class HistogramMetric(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], Histogram] = {}
+
+    def labels(self, **labels: str) -> Histogram:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, Histogram(self.buckets))
+        return series
+
+    def observe(self, value: float, **labels: str) -> None:
+        self.labels(**labels).observe(value)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = dict(self._series)
+        lines: list[str] = []
+        for key, histogram in series.items():
+            lines.extend(_render_histogram(self.name, self.labelnames, key, histogram.snapshot()))
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+_COLLECTORS: list[Collector] = []
+
+
+def register_collector(collector: Collector) -> None:
+    _COLLECTORS.append(collector)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: dict[str, str] | None = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(str(value))}"' for name, value in (extra or {}).items())
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _render_histogram(name: str, labelnames: tuple[str, ...], key: tuple[str, ...], snapshot: dict) -> list[str]:
+    lines = [
+        f"{name}_bucket{_format_labels(labelnames, key, {'le': bound})} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(snapshot['sum'])}")
+    lines.append(f"{name}_count{_format_labels(labelnames, key)} {snapshot['count']}")
+    return lines
+
+
+def render_prometheus() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for collector in _COLLECTORS:
+        for name, kind, documentation, samples in collector():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for labels, snapshot in samples:
+                    lines.extend(_render_histogram(name, tuple(labels), tuple(labels.values()), snapshot))
+            else:
+                lines.extend(
+                    f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}"
+                    for labels, value in samples
+                )
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUESTS_TOTAL = Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+HTTP_REQUEST_DURATION_SECONDS = HistogramMetric(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+)
+HTTP_REQUEST_DB_SECONDS = HistogramMetric(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route")
+)
+UTTT_BOT_INFERENCE_SECONDS = HistogramMetric(
+    "uttt_bot_inference_seconds", "Ultimate TTT policy model inference time.", ("model_version",)
+)
@@ -3,11 +3,30 @@ from urllib.parse import urlparse
 
 import jwt
 from fastapi import Depends, HTTPException, Request, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from ..models.user import User
 from .config import get_settings
-from .database import get_db
+from .database import get_async_db, get_db
+from .metrics import register_collector
+from .session_cache import SessionCache
+from .ttl_cache import cache_collector
+
+
+_settings = get_settings()
+session_cache = SessionCache(_settings.auth_cache_max_entries, _settings.auth_cache_ttl_seconds)
+
+
+register_collector(
+    cache_collector(
+        session_cache,
+        "auth_session_cache",
+        "Session lookups served from cache.",
+        "Session lookups that hit the database.",
+        "Session tokens currently cached.",
+    )
+)
 
 
 def require_api_key(request: Request) -> None:
@@ -61,6 +80,42 @@ def decode_oauth_state(token: str) -> dict:
     return payload
 
 
+def create_calendar_token(user_id: str, feed_version: int) -> str:
+    settings = get_settings()
+    payload = {
+        "sub": user_id,
+        "type": "calendar_feed",
+        "ver": feed_version,
+        "iat": int(_now_utc().timestamp()),
+        "iss": settings.public_base_url.rstrip("/"),
+    }
+    return jwt.encode(payload, settings.auth_secret_key, algorithm="HS256")
+
+
+async def decode_calendar_token(token: str, db: AsyncSession) -> User:
+    """Owner of a calendar feed token that is still the user's current feed link.
+
+    Calendar clients cannot send cookies or headers, so the feed URL itself carries a signed user token.
+    It does not expire; rotating the link bumps users.calendar_feed_version, which revokes older tokens.
+    """
+    settings = get_settings()
+    try:
+        payload = jwt.decode(
+            token,
+            settings.auth_secret_key,
+            algorithms=["HS256"],
+            issuer=settings.public_base_url.rstrip("/"),
+        )
+    except jwt.PyJWTError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar feed not found") from exc
+    if payload.get("type") != "calendar_feed" or not payload.get("sub") or not isinstance(payload.get("ver"), int):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar feed not found")
+    user = await db.get(User, str(payload["sub"]))
+    if user is None or user.calendar_feed_version != payload["ver"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar feed not found")
+    return user
+
+
 def _cookie_options(origin: str | None = None) -> dict:
     settings = get_settings()
     hostname = urlparse(origin or "").hostname or ""
@@ -103,11 +158,7 @@ def _extract_session_token(request: Request) -> str | None:
     return None
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    token = _extract_session_token(request)
-    if not token:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-
+def _decode_session_token(token: str) -> dict:
     settings = get_settings()
     try:
         payload = jwt.decode(
@@ -121,8 +172,73 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
 
     if payload.get("type") != "session":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
+    return payload
+
+
+def _require_session_token(request: Request) -> str:
+    token = _extract_session_token(request)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return token
+
+
+def _cached_user(token: str) -> User | None:
+    if not get_settings().auth_cache_enabled:
+        return None
+    user = session_cache.get(token)
+    if user is not None:
+        make_transient_to_detached(user)
+    return user
+
+
+def _remember_user(token: str, payload: dict, user: User, version: int) -> None:
+    if get_settings().auth_cache_enabled:
+        session_cache.put(token, user, payload.get("exp"), version)
+
 
+def invalidate_cached_user(user_id: str) -> None:
+    session_cache.invalidate_user(user_id)
+
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    token = _require_session_token(request)
+    cached = _cached_user(token)
+    if cached is not None:
+        return db.merge(cached, load=False)
+
+    payload = _decode_session_token(token)
+    # Read before the load: if the user is invalidated meanwhile, the row loaded here is not cached.
+    version = session_cache.version(payload.get("sub"))
     user = db.get(User, payload.get("sub"))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    _remember_user(token, payload, user, version)
     return user
+
+
+async def get_current_user_async(request: Request, db: AsyncSession = Depends(get_async_db)) -> User:
+    token = _require_session_token(request)
+    cached = _cached_user(token)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    payload = _decode_session_token(token)
+    # Read before the load: if the user is invalidated meanwhile, the row loaded here is not cached.
+    version = session_cache.version(payload.get("sub"))
+    user = await db.get(User, payload.get("sub"))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    _remember_user(token, payload, user, version)
+    return user
+
+
+def get_current_user_for_update(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> User:
+    """The session user's current row, locked until commit.
+
+    get_current_user may return a cached snapshot up to APP_AUTH_CACHE_TTL_SECONDS old, so handlers that
+    read-modify-write user columns such as preferences_json use this instead.
+    """
+    fresh = db.get(User, user.id, populate_existing=True, with_for_update=True)
+    if fresh is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return fresh
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import copy
+import time
+
+from ..models.user import User
+from .ttl_cache import VersionedTTLCache
+
+
+class SessionCache(VersionedTTLCache[str, dict]):
+    """Column snapshots of verified users keyed by session token and owned by the user id."""
+
+    def get(self, token: str) -> User | None:
+        snapshot = super().get(token)
+        if snapshot is None:
+            return None
+        return User(**copy.deepcopy(snapshot))
+
+    def put(self, token: str, user: User, token_expires_at: float | None = None, version: int | None = None) -> None:
+        """Cache user under token; pass the user's version read before loading them so a concurrent invalidation wins."""
+        ttl = self.ttl_seconds
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+        snapshot = {attr.key: copy.deepcopy(getattr(user, attr.key)) for attr in User.__mapper__.column_attrs}
+        super().put(token, snapshot, version, owner=snapshot["id"], ttl_seconds=ttl)
+
+    def invalidate_user(self, user_id: str) -> None:
+        self.invalidate(user_id)
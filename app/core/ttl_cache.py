@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import threading
+import time
+from typing import Generic, TypeVar
+
+from .metrics import Collector
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class VersionedTTLCache(Generic[K, V]):
+    """In-process LRU of per-owner values with an optional TTL and a version counter per owner.
+
+    Owners are usually user ids. invalidate() bumps the owner's version and drops its entries, and a
+    put() that carries the version read before the value was built is ignored once a write has bumped
+    it, so a value built from data that changed mid-request is never stored.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (owner, version, expires_at or None, value)
+        self._entries: OrderedDict[K, tuple[Hashable, int, float | None, V]] = OrderedDict()
+        self._keys_by_owner: dict[Hashable, set[K]] = {}
+        self._versions: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, owner: Hashable) -> int:
+        with self._lock:
+            return self._versions.get(owner, 0)
+
+    def invalidate(self, owner: Hashable) -> None:
+        with self._lock:
+            self._versions[owner] = self._versions.get(owner, 0) + 1
+            for key in list(self._keys_by_owner.get(owner, ())):
+                self._discard(key)
+
+    def get(self, key: K, match: Callable[[V], bool] | None = None) -> V | None:
+        """Cached value of key; an entry that is stale, expired or rejected by `match` counts as a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            owner, version, expires_at, value = entry
+            if (
+                version != self._versions.get(owner, 0)
+                or (expires_at is not None and expires_at <= time.monotonic())
+                or (match is not None and not match(value))
+            ):
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+        self,
+        key: K,
+        value: V,
+        version: int | None = None,
+        *,
+        owner: Hashable | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        """Store value under key; owner defaults to the key and ttl_seconds to the cache's TTL."""
+        owner = key if owner is None else owner
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if self.max_entries <= 0 or (ttl is not None and ttl <= 0):
+            return
+        with self._lock:
+            current = self._versions.get(owner, 0)
+            # The owner's data changed while this value was being built; it is already stale.
+            if version is not None and version != current:
+                return
+            self._discard(key)
+            self._entries[key] = (owner, current, None if ttl is None else time.monotonic() + ttl, value)
+            self._keys_by_owner.setdefault(owner, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_owner.clear()
+            self._versions.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def _discard(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_owner.get(entry[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._keys_by_owner.pop(entry[0], None)
+
+
+def cache_collector(cache: VersionedTTLCache, prefix: str, hits_help: str, misses_help: str, entries_help: str) -> Collector:
+    """Prometheus collector for a cache's counters, exported as <prefix>_hits_total, _misses_total, _hit_ratio and _entries."""
+
+    def collect():
+        stats = cache.stats()
+        yield f"{prefix}_hits_total", "counter", hits_help, [({}, stats["hits"])]
+        yield f"{prefix}_misses_total", "counter", misses_help, [({}, stats["misses"])]
+        yield f"{prefix}_hit_ratio", "gauge", "Share of lookups served from cache.", [({}, stats["hit_ratio"] or 0.0)]
+        yield f"{prefix}_entries", "gauge", entries_help, [({}, stats["entries"])]
+
+    return collect
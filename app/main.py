@@ -3,18 +3,21 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import get_settings
+from .core.instrumentation import MetricsMiddleware
 from .routers import auth, budget, cctv, food, gym, health, media, tasks, ultimate_ttt
 
 settings = get_settings()
 
 app = FastAPI(title=settings.app_name, version="0.1.0")
 
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.parsed_allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(health.router)
@@ -1,6 +1,6 @@
-from .task import TaskTemplate, TaskHistory  # noqa: F401
+from .task import TaskTemplate, TaskHistory, TaskScheduledSlot, TaskDailyStat  # noqa: F401
 from .food import MealEntry, FoodImage  # noqa: F401
-from .gym import GymDayAssignment, GymExercise, GymExerciseHistory  # noqa: F401
+from .gym import GymDayAssignment, GymExercise, GymExerciseDailyRecord, GymExerciseHistory, GymWeeklyVolume  # noqa: F401
 from .budget import BudgetCategory, BudgetEntry  # noqa: F401
 from .cctv import CCTVStream, CCTVRecording  # noqa: F401
 from .media_asset import MediaAsset  # noqa: F401
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -23,6 +23,8 @@ class GymExercise(Base):
     mistakes = Column(JSON, nullable=False, default=list)
     swap_suggestions = Column(JSON, nullable=False, default=list)
     extra_metadata = Column(JSON, nullable=False, default=dict)
+    # Normalized primary/secondary/group muscles, refreshed whenever those fields are written.
+    muscle_tokens = Column(JSON, nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -77,3 +79,48 @@ class GymExerciseHistory(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     exercise = relationship("GymExercise", back_populates="history")
+
+
+# Backs latest-session-per-exercise lookups (ROW_NUMBER over exercise_id by recorded_at DESC) and windowed history reads.
+Index(
+    "ix_gym_exercise_history_user_exercise_recorded_at",
+    GymExerciseHistory.user_id,
+    GymExerciseHistory.exercise_id,
+    GymExerciseHistory.recorded_at.desc(),
+)
+
+
+# Sets per normalized muscle and ISO week, maintained on every history write (see services/gym_rollups.py).
+class GymWeeklyVolume(Base):
+    __tablename__ = "gym_weekly_volume"
+    __table_args__ = (
+        UniqueConstraint("user_id", "week_start", "muscle", name="uq_gym_weekly_volume_user_week_muscle"),
+        Index("ix_gym_weekly_volume_user_week", "user_id", "week_start"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    week_start = Column(Date, nullable=False)
+    muscle = Column(String(64), nullable=False)
+    # Sets where this muscle is the exercise's primary muscle, and where it is only secondary or a listed group.
+    direct_sets = Column(Integer, nullable=False, default=0)
+    indirect_sets = Column(Integer, nullable=False, default=0)
+
+
+# Per-exercise bests and totals per day, maintained on every history write (see services/gym_records.py).
+class GymExerciseDailyRecord(Base):
+    __tablename__ = "gym_exercise_daily_records"
+    __table_args__ = (UniqueConstraint("exercise_id", "day", name="uq_gym_exercise_daily_records_exercise_day"),)
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    exercise_id = Column(String(64), ForeignKey("gym_exercises.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    sessions = Column(Integer, nullable=False, default=0)
+    sets = Column(Integer, nullable=False, default=0)
+    volume = Column(Float, nullable=False, default=0.0)
+    max_reps = Column(Integer, nullable=False, default=0)
+    best_weight = Column(Float, nullable=True)
+    best_weight_reps = Column(Integer, nullable=True)
+    # Best Epley estimate (weight * (1 + reps / 30)) over the day's sets.
+    best_e1rm = Column(Float, nullable=True)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -20,14 +20,21 @@ class TaskTemplate(Base):
     recurrence = Column(JSON, nullable=False, default=dict)
     metadata_json = Column(JSON, nullable=False, default=dict)
     is_archived = Column(Boolean, nullable=False, default=False)
+    last_completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     history = relationship("TaskHistory", back_populates="task", cascade="all, delete-orphan")
+    slots = relationship("TaskScheduledSlot", back_populates="task", cascade="all, delete-orphan", order_by="TaskScheduledSlot.slot_at")
+    daily_stats = relationship("TaskDailyStat", back_populates="task", cascade="all, delete-orphan")
 
 
 class TaskHistory(Base):
     __tablename__ = "task_history"
+    __table_args__ = (
+        Index("ix_task_history_user_completed_at", "user_id", "completed_at"),
+        Index("ix_task_history_user_task_completed_at", "user_id", "task_id", "completed_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -38,3 +45,35 @@ class TaskHistory(Base):
     status = Column(String(32), nullable=False, default="completed")
 
     task = relationship("TaskTemplate", back_populates="history")
+
+
+class TaskScheduledSlot(Base):
+    __tablename__ = "task_scheduled_slots"
+    __table_args__ = (Index("ix_task_scheduled_slots_user_slot_at", "user_id", "slot_at"),)
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(String(36), ForeignKey("task_templates.id", ondelete="CASCADE"), nullable=False, index=True)
+    slot_at = Column(DateTime, nullable=False)
+    value = Column(String(64), nullable=False)
+
+    task = relationship("TaskTemplate", back_populates="slots")
+
+
+class TaskDailyStat(Base):
+    __tablename__ = "task_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("task_id", "day", name="uq_task_daily_stats_task_day"),
+        Index("ix_task_daily_stats_user_day", "user_id", "day"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(String(36), ForeignKey("task_templates.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    completed_count = Column(Integer, nullable=False, default=0)
+    progress_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    minutes = Column(Integer, nullable=False, default=0)
+
+    task = relationship("TaskTemplate", back_populates="daily_stats")
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, JSON, String
+from sqlalchemy import Column, DateTime, Integer, JSON, String
 
 from ..core.database import Base
 
@@ -17,4 +17,13 @@ class User(Base):
     preferences_json = Column(JSON, nullable=False, default=dict)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_login_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    last_login_at = Column(DateTime, nullable=True)
+    # Bumped by every task or task history write; backs the calendar feed's ETag and Last-Modified.
+    tasks_version = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_changed_at = Column(DateTime, nullable=True)
+    # GYM_SEED_VERSION last applied by ensure_user_gym_defaults.
+    gym_seed_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # GYM_ROLLUP_VERSION of the user's materialized gym rollups; older values are rebuilt on next read.
+    gym_rollup_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Embedded in calendar feed tokens; rotating the feed link bumps it and every older link stops working.
+    calendar_feed_version = Column(Integer, nullable=False, default=0, server_default="0")
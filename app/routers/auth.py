@@ -10,7 +10,16 @@ from sqlalchemy.orm import Session
 
 from ..core.config import get_settings
 from ..core.database import get_db
-from ..core.security import clear_auth_cookie, create_oauth_state, create_session_token, decode_oauth_state, get_current_user, set_auth_cookie
+from ..core.security import (
+    clear_auth_cookie,
+    create_oauth_state,
+    create_session_token,
+    decode_oauth_state,
+    get_current_user,
+    get_current_user_for_update,
+    invalidate_cached_user,
+    set_auth_cookie,
+)
 from ..models.user import User
 from ..schemas.auth import UserPreferencesUpdate, UserRead
 from ..services.gym_seed import ensure_user_gym_defaults
@@ -62,6 +71,7 @@ def _upsert_google_user(db: Session, profile: dict) -> User:
     user.last_login_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user.id)
     ensure_user_gym_defaults(db, user.id)
     db.refresh(user)
     return user
@@ -149,12 +159,13 @@ def read_current_user(current_user: User = Depends(get_current_user)):
 
 
 @router.patch("/me/preferences", response_model=UserRead)
-def update_preferences(payload: UserPreferencesUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def update_preferences(payload: UserPreferencesUpdate, current_user: User = Depends(get_current_user_for_update), db: Session = Depends(get_db)):
     merged = dict(current_user.preferences_json or {})
     merged.update(payload.preferences_json or {})
     current_user.preferences_json = merged
     db.add(current_user)
     db.commit()
+    invalidate_cached_user(current_user.id)
     db.refresh(current_user)
     return current_user
 
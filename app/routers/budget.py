@@ -1,11 +1,11 @@
 from datetime import date, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
-from ..core.security import get_current_user, require_api_key
+from ..core.database import get_async_db
+from ..core.security import get_current_user_async, require_api_key
 from ..models.budget import BudgetCategory, BudgetEntry
 from ..models.user import User
 from ..schemas.budget import (
@@ -40,8 +40,8 @@ def _resolve_month(month: str | None) -> tuple[str, date, date]:
     return start.strftime("%Y-%m"), start, end
 
 
-def _load_entry(db: Session, entry_id: str, user_id: str) -> BudgetEntry:
-    entry = db.query(BudgetEntry).filter(BudgetEntry.id == entry_id, BudgetEntry.user_id == user_id).first()
+async def _load_entry(db: AsyncSession, entry_id: str, user_id: str) -> BudgetEntry:
+    entry = await db.scalar(select(BudgetEntry).where(BudgetEntry.id == entry_id, BudgetEntry.user_id == user_id))
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget entry not found")
     return entry
@@ -51,48 +51,48 @@ def _normalize_category_name(value: str) -> str:
     return " ".join((value or "").split()).strip()
 
 
-def _list_categories(db: Session, user_id: str) -> list[BudgetCategory]:
-    return (
-        db.query(BudgetCategory)
-        .filter(BudgetCategory.user_id == user_id)
+async def _list_categories(db: AsyncSession, user_id: str) -> list[BudgetCategory]:
+    categories = await db.scalars(
+        select(BudgetCategory)
+        .where(BudgetCategory.user_id == user_id)
         .order_by(BudgetCategory.created_at.asc(), BudgetCategory.name.asc())
-        .all()
     )
+    return list(categories)
 
 
-def _get_category_by_name(db: Session, user_id: str, name: str) -> BudgetCategory | None:
+async def _get_category_by_name(db: AsyncSession, user_id: str, name: str) -> BudgetCategory | None:
     normalized = _normalize_category_name(name)
     if not normalized:
         return None
-    return (
-        db.query(BudgetCategory)
-        .filter(BudgetCategory.user_id == user_id, func.lower(BudgetCategory.name) == normalized.lower())
-        .first()
+    return await db.scalar(
+        select(BudgetCategory)
+        .where(BudgetCategory.user_id == user_id, func.lower(BudgetCategory.name) == normalized.lower())
+        .limit(1)
     )
 
 
-def _create_category(db: Session, user_id: str, name: str) -> BudgetCategory:
+async def _create_category(db: AsyncSession, user_id: str, name: str) -> BudgetCategory:
     normalized = _normalize_category_name(name)
     if not normalized:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category is required")
 
-    existing = _get_category_by_name(db, user_id, normalized)
+    existing = await _get_category_by_name(db, user_id, normalized)
     if existing:
         return existing
 
     category = BudgetCategory(user_id=user_id, name=normalized)
     db.add(category)
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    await db.refresh(category)
     return category
 
 
-def _require_category(db: Session, user_id: str, name: str) -> BudgetCategory:
+async def _require_category(db: AsyncSession, user_id: str, name: str) -> BudgetCategory:
     normalized = _normalize_category_name(name)
     if not normalized:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category is required")
 
-    category = _get_category_by_name(db, user_id, normalized)
+    category = await _get_category_by_name(db, user_id, normalized)
     if category is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category does not exist")
     return category
@@ -127,63 +127,64 @@ def _build_response(entries: list[BudgetEntry], categories: list[BudgetCategory]
 
 
 @router.get("/categories", response_model=list[BudgetCategoryRead])
-def list_categories(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    categories = _list_categories(db, current_user.id)
+async def list_categories(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    categories = await _list_categories(db, current_user.id)
     return [BudgetCategoryRead.model_validate(category) for category in categories]
 
 
 @router.post("/categories", response_model=BudgetCategoryRead, status_code=status.HTTP_201_CREATED)
-def create_category(payload: BudgetCategoryCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    category = _create_category(db, current_user.id, payload.name)
+async def create_category(payload: BudgetCategoryCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    category = await _create_category(db, current_user.id, payload.name)
     return BudgetCategoryRead.model_validate(category)
 
 
 @router.get("/entries", response_model=BudgetEntriesResponse)
-def list_entries(
+async def list_entries(
     month: str | None = Query(default=None, pattern=r"^\d{4}-\d{2}$"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     month_key, month_start, month_end = _resolve_month(month)
-    categories = _list_categories(db, current_user.id)
+    categories = await _list_categories(db, current_user.id)
     entries = (
-        db.query(BudgetEntry)
-        .filter(
-            BudgetEntry.user_id == current_user.id,
-            BudgetEntry.spent_on >= month_start,
-            BudgetEntry.spent_on <= month_end,
+        await db.scalars(
+            select(BudgetEntry)
+            .where(
+                BudgetEntry.user_id == current_user.id,
+                BudgetEntry.spent_on >= month_start,
+                BudgetEntry.spent_on <= month_end,
+            )
+            .order_by(BudgetEntry.spent_on.desc(), BudgetEntry.created_at.desc())
         )
-        .order_by(BudgetEntry.spent_on.desc(), BudgetEntry.created_at.desc())
-        .all()
-    )
-    return _build_response(entries, categories, month_key)
+    ).all()
+    return _build_response(list(entries), categories, month_key)
 
 
 @router.post("/entries", response_model=BudgetEntryRead, status_code=status.HTTP_201_CREATED)
-def create_entry(payload: BudgetEntryCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    category = _require_category(db, current_user.id, payload.category)
+async def create_entry(payload: BudgetEntryCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    category = await _require_category(db, current_user.id, payload.category)
     entry = BudgetEntry(user_id=current_user.id, category=category.name, **payload.model_dump(exclude={"category"}))
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
 
 
 @router.patch("/entries/{entry_id}", response_model=BudgetEntryRead)
-def update_entry(entry_id: str, payload: BudgetEntryUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    entry = _load_entry(db, entry_id, current_user.id)
+async def update_entry(entry_id: str, payload: BudgetEntryUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    entry = await _load_entry(db, entry_id, current_user.id)
     for field, value in payload.model_dump(exclude_unset=True).items():
         if field == "category" and value is not None:
-            value = _require_category(db, current_user.id, value).name
+            value = (await _require_category(db, current_user.id, value)).name
         setattr(entry, field, value)
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
 
 
 @router.delete("/entries/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_entry(entry_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    entry = _load_entry(db, entry_id, current_user.id)
-    db.delete(entry)
-    db.commit()
\ No newline at end of file
+async def delete_entry(entry_id: str, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    entry = await _load_entry(db, entry_id, current_user.id)
+    await db.delete(entry)
+    await db.commit()
\ No newline at end of file
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from typing import Literal
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
-from ..core.security import get_current_user, require_api_key
+from ..core.database import get_async_db, get_db
+from ..core.security import get_current_user, get_current_user_async, get_current_user_for_update, invalidate_cached_user, require_api_key
 from ..data.gym_defaults import WEEK_TEMPLATE
-from ..models.gym import GymDayAssignment, GymExercise, GymExerciseHistory
+from ..models.gym import GymDayAssignment, GymExercise, GymExerciseDailyRecord, GymExerciseHistory, GymWeeklyVolume
 from ..models.user import User
 from ..schemas.gym import (
     GymBootstrapResponse,
@@ -21,31 +24,27 @@ from ..schemas.gym import (
     GymExerciseHistoryCreate,
     GymExerciseHistoryRead,
     GymExerciseRead,
+    GymExerciseTrendResponse,
     GymExerciseUpdate,
+    GymVolumeResponse,
+)
+from ..services.gym_muscles import muscle_tokens, normalize_muscle
+from ..services.gym_records import build_trend
+from ..services.gym_rollups import (
+    add_history_rollups,
+    ensure_gym_rollups,
+    exercise_muscles,
+    move_history_volume,
+    remove_history_rollups,
 )
 from ..services.gym_seed import ensure_user_gym_defaults, get_default_muscle_targets
+from ..services.gym_substitutes import SubstituteIndex, build_substitute_index, substitute_index_cache
+from ..services.gym_volume import build_volume_report, week_start
 
 router = APIRouter(prefix="/gym", tags=["gym"], dependencies=[Depends(require_api_key)])
 
-_MUSCLE_SYNONYMS = {
-    "shoulders": ("delt", "shoulder"),
-    "chest": ("pec", "chest"),
-    "quads": ("quad",),
-    "hamstrings": ("hamstring",),
-    "glutes": ("glute",),
-    "abs": ("ab", "core"),
-    "lats": ("lat",),
-    "traps": ("trap",),
-    "biceps": ("bicep", "biceps", "bi"),
-    "triceps": ("tricep", "triceps", "tri"),
-    "calves": ("calf", "gastrocnemius", "soleus"),
-    "forearms": ("forearm", "brach", "wrist flexor", "wrist extensor"),
-    "upper back": ("upper back", "upperback", "mid back", "midback"),
-    "lower back": ("lower back", "lowerback", "lumbar"),
-    "full body": ("full body", "fullbody", "total body"),
-}
-
 _DAY_MODES = {"strength", "cardio", "rest"}
+_VOLUME_DEFAULT_WEEKS = 8
 
 
 def _default_day_settings() -> dict[str, str]:
@@ -87,32 +86,19 @@ def _build_assignment_metadata(day_key: str) -> dict:
     return metadata
 
 
-def _normalize_muscle(value: str | None) -> str:
-    if not value:
-        return ""
-    text = value.strip().lower()
-    if not text:
-        return ""
-    for canonical, tokens in _MUSCLE_SYNONYMS.items():
-        if any(token in text for token in tokens):
-            return canonical
-    return text
+def _refresh_muscle_tokens(exercise: GymExercise) -> list[str]:
+    exercise.muscle_tokens = muscle_tokens(exercise.primary_muscle, exercise.secondary_muscle, exercise.muscle_groups)
+    return exercise.muscle_tokens
 
 
 def _collect_muscle_tokens(exercise: GymExercise | None) -> set[str]:
-    tokens: set[str] = set()
     if not exercise:
-        return tokens
-    sources = [
-        exercise.primary_muscle,
-        exercise.secondary_muscle,
-    ]
-    sources.extend(exercise.muscle_groups or [])
-    for source in sources:
-        normalized = _normalize_muscle(source)
-        if normalized:
-            tokens.add(normalized)
-    return tokens
+        return set()
+    # Rows written before muscle_tokens existed are indexed on first read and saved with the caller's commit.
+    tokens = exercise.muscle_tokens
+    if tokens is None:
+        tokens = _refresh_muscle_tokens(exercise)
+    return set(tokens)
 
 
 def _collect_slot_tokens(slot_metadata: dict | None) -> set[str]:
@@ -127,64 +113,57 @@ def _collect_slot_tokens(slot_metadata: dict | None) -> set[str]:
     else:
         sources = []
     for source in sources:
-        normalized = _normalize_muscle(str(source))
+        normalized = normalize_muscle(str(source))
         if normalized:
             tokens.add(normalized)
     return tokens
 
 
-def _rank_substitute_candidates(
-    reference: GymExercise,
-    candidates: list[GymExercise],
-    target_tokens: set[str] | None,
-) -> list[GymExercise]:
-    ref_primary = _normalize_muscle(reference.primary_muscle)
-    ref_secondary = _normalize_muscle(reference.secondary_muscle)
-    tokens_to_match = set(target_tokens or [])
-    ranked: list[tuple[float, str, GymExercise]] = []
-    for candidate in candidates:
-        if not candidate or not candidate.is_active:
-            continue
-        candidate_tokens = _collect_muscle_tokens(candidate)
-        if tokens_to_match and candidate.id != reference.id and not (tokens_to_match & candidate_tokens):
-            continue
-        primary = _normalize_muscle(candidate.primary_muscle)
-        secondary = _normalize_muscle(candidate.secondary_muscle)
-        score: float
-        if candidate.id == reference.id:
-            score = 0.0
-        elif primary == ref_primary:
-            score = 1.0
-        elif secondary == ref_primary:
-            score = 1.5
-        elif ref_secondary and (primary == ref_secondary or secondary == ref_secondary):
-            score = 2.0
-        else:
-            score = 3.0
-        ranked.append((score, candidate.name.lower(), candidate))
-
-    ranked.sort(key=lambda item: (item[0], item[1]))
-    return [item[2] for item in ranked]
+def _substitute_index(db: Session, user_id: str) -> SubstituteIndex:
+    index = substitute_index_cache.get(user_id)
+    if index is not None:
+        return index
+    version = substitute_index_cache.version(user_id)
+    rows = (
+        db.query(
+            GymExercise.id,
+            GymExercise.name,
+            GymExercise.primary_muscle,
+            GymExercise.secondary_muscle,
+            GymExercise.muscle_groups,
+            GymExercise.muscle_tokens,
+        )
+        .filter(GymExercise.user_id == user_id, GymExercise.is_active.is_(True))
+        .order_by(GymExercise.name)
+    )
+    index = build_substitute_index(rows.all())
+    substitute_index_cache.put(user_id, index, version)
+    return index
 
 
 def _append_explicit_options(
-    ranked: list[GymExercise],
+    ranked_ids: list[str],
     option_ids: list[str] | None,
     db: Session,
     user_id: str,
-) -> list[GymExercise]:
+) -> list[str]:
     if not option_ids:
-        return ranked
-    existing_ids = {candidate.id for candidate in ranked}
-    for option_id in option_ids:
-        if not option_id or option_id in existing_ids:
-            continue
-        exercise = db.query(GymExercise).filter(GymExercise.id == option_id, GymExercise.user_id == user_id).first()
-        if not exercise or not exercise.is_active:
-            continue
-        ranked.append(exercise)
-        existing_ids.add(exercise.id)
-    return ranked
+        return ranked_ids
+    existing_ids = set(ranked_ids)
+    missing = [option_id for option_id in dict.fromkeys(option_ids) if option_id and option_id not in existing_ids]
+    if not missing:
+        return ranked_ids
+    active_ids = set(
+        db.scalars(
+            select(GymExercise.id).where(
+                GymExercise.user_id == user_id,
+                GymExercise.id.in_(missing),
+                GymExercise.is_active.is_(True),
+            )
+        )
+    )
+    ranked_ids.extend(option_id for option_id in missing if option_id in active_ids)
+    return ranked_ids
 
 
 def _get_exercise_or_404(db: Session, user_id: str, exercise_id: str) -> GymExercise:
@@ -208,6 +187,25 @@ def _get_history_or_404(db: Session, user_id: str, history_id: str) -> GymExerci
     return history
 
 
+def _latest_history_statement(user_id: str):
+    # One row per exercise, picked in SQL from the (user_id, exercise_id, recorded_at DESC) index.
+    # Ids are random UUIDs, so sessions logged at the same time go to the one written last.
+    ranked = (
+        select(
+            GymExerciseHistory.id,
+            func.row_number()
+            .over(
+                partition_by=GymExerciseHistory.exercise_id,
+                order_by=(GymExerciseHistory.recorded_at.desc(), GymExerciseHistory.created_at.desc()),
+            )
+            .label("position"),
+        )
+        .where(GymExerciseHistory.user_id == user_id)
+        .subquery()
+    )
+    return select(GymExerciseHistory).join(ranked, ranked.c.id == GymExerciseHistory.id).where(ranked.c.position == 1)
+
+
 def _exercise_to_read(exercise: GymExercise, latest: GymExerciseHistory | None) -> GymExerciseRead:
     payload = GymExerciseRead.model_validate(exercise)
     updates: dict = {}
@@ -227,27 +225,34 @@ def _exercise_to_read(exercise: GymExercise, latest: GymExerciseHistory | None)
 
 
 @router.get("/bootstrap", response_model=GymBootstrapResponse)
-def bootstrap_gym(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    ensure_user_gym_defaults(db, current_user.id)
+async def bootstrap_gym(
+    history_since: datetime | None = None,
+    history_limit: int | None = Query(default=None, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    await db.run_sync(ensure_user_gym_defaults, current_user.id)
     assignments = (
-        db.query(GymDayAssignment)
-        .filter(GymDayAssignment.user_id == current_user.id)
-        .order_by(GymDayAssignment.day_key, GymDayAssignment.order_index)
-        .all()
-    )
-    exercises = db.query(GymExercise).filter(GymExercise.user_id == current_user.id).order_by(GymExercise.name).all()
-    history_entries = (
-        db.query(GymExerciseHistory)
-        .filter(GymExerciseHistory.user_id == current_user.id)
-        .order_by(GymExerciseHistory.recorded_at)
-        .all()
-    )
+        await db.scalars(
+            select(GymDayAssignment)
+            .where(GymDayAssignment.user_id == current_user.id)
+            .order_by(GymDayAssignment.day_key, GymDayAssignment.order_index)
+        )
+    ).all()
+    exercises = (
+        await db.scalars(select(GymExercise).where(GymExercise.user_id == current_user.id).order_by(GymExercise.name))
+    ).all()
+    history_query = select(GymExerciseHistory).where(GymExerciseHistory.user_id == current_user.id)
+    if history_since is not None:
+        history_query = history_query.where(GymExerciseHistory.recorded_at >= history_since)
+    if history_limit is not None:
+        # Keep the newest entries, then return them oldest first like the unwindowed payload.
+        history_query = history_query.order_by(GymExerciseHistory.recorded_at.desc()).limit(history_limit)
+        history_entries = list(reversed((await db.scalars(history_query)).all()))
+    else:
+        history_entries = (await db.scalars(history_query.order_by(GymExerciseHistory.recorded_at))).all()
 
-    latest_map: dict[str, GymExerciseHistory] = {}
-    for entry in history_entries:
-        existing = latest_map.get(entry.exercise_id)
-        if not existing or entry.recorded_at >= existing.recorded_at:
-            latest_map[entry.exercise_id] = entry
+    latest_map = {entry.exercise_id: entry for entry in (await db.scalars(_latest_history_statement(current_user.id))).all()}
 
     exercise_payload = [_exercise_to_read(exercise, latest_map.get(exercise.id)) for exercise in exercises]
     assignment_payload = [GymDayAssignmentRead.model_validate(item) for item in assignments]
@@ -265,16 +270,7 @@ def bootstrap_gym(db: Session = Depends(get_db), current_user: User = Depends(ge
 @router.get("/exercises", response_model=list[GymExerciseRead])
 def list_exercises(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     exercises = db.query(GymExercise).filter(GymExercise.user_id == current_user.id).order_by(GymExercise.name).all()
-    history_entries = (
-        db.query(GymExerciseHistory)
-        .filter(GymExerciseHistory.user_id == current_user.id)
-        .order_by(GymExerciseHistory.recorded_at.desc())
-        .all()
-    )
-    latest_map: dict[str, GymExerciseHistory] = {}
-    for entry in history_entries:
-        if entry.exercise_id not in latest_map:
-            latest_map[entry.exercise_id] = entry
+    latest_map = {entry.exercise_id: entry for entry in db.scalars(_latest_history_statement(current_user.id)).all()}
     return [_exercise_to_read(exercise, latest_map.get(exercise.id)) for exercise in exercises]
 
 
@@ -290,8 +286,10 @@ def create_exercise(payload: GymExerciseCreate, db: Session = Depends(get_db), c
         user_id=current_user.id,
         **payload.model_dump(exclude={"id"}, exclude_none=True),
     )
+    _refresh_muscle_tokens(exercise)
     db.add(exercise)
     db.commit()
+    substitute_index_cache.invalidate(current_user.id)
     db.refresh(exercise)
     return _exercise_to_read(exercise, None)
 
@@ -306,16 +304,29 @@ def update_exercise(exercise_id: str, payload: GymExerciseUpdate, db: Session =
         merged.update(update_data.pop("extra_metadata"))
         exercise.extra_metadata = merged
 
+    previous_muscles = exercise_muscles(exercise)
     for field, value in update_data.items():
         setattr(exercise, field, value)
+    if update_data.keys() & {"primary_muscle", "secondary_muscle", "muscle_groups"}:
+        _refresh_muscle_tokens(exercise)
+        muscles = exercise_muscles(exercise)
+        if muscles != previous_muscles:
+            # Move this exercise's logged sets from the old muscles to the new ones.
+            history = (
+                db.query(GymExerciseHistory)
+                .filter(GymExerciseHistory.exercise_id == exercise.id, GymExerciseHistory.user_id == current_user.id)
+                .all()
+            )
+            move_history_volume(db, current_user.id, history, previous_muscles, muscles)
 
     db.add(exercise)
     db.commit()
+    substitute_index_cache.invalidate(current_user.id)
     db.refresh(exercise)
     latest = (
         db.query(GymExerciseHistory)
         .filter(GymExerciseHistory.exercise_id == exercise.id, GymExerciseHistory.user_id == current_user.id)
-        .order_by(GymExerciseHistory.recorded_at.desc())
+        .order_by(GymExerciseHistory.recorded_at.desc(), GymExerciseHistory.created_at.desc())
         .first()
     )
     return _exercise_to_read(exercise, latest)
@@ -354,8 +365,36 @@ def delete_exercise(exercise_id: str, db: Session = Depends(get_db), current_use
 
         db.add(assignment)
 
+    remove_history_rollups(db, current_user.id, exercise, exercise.history)
     db.delete(exercise)
     db.commit()
+    substitute_index_cache.invalidate(current_user.id)
+
+
+@router.get("/exercises/{exercise_id}/trend", response_model=GymExerciseTrendResponse)
+def get_exercise_trend(
+    exercise_id: str,
+    resolution: Literal["day", "week", "month"] = "week",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """All-time records and per-period points of one exercise.
+
+    May rebuild and commit the user's rollups first when they predate GYM_ROLLUP_VERSION, so this GET can write.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    _get_exercise_or_404(db, current_user.id, exercise_id)
+    ensure_gym_rollups(db, current_user.id)
+    # Every day of the exercise is read so the all-time records do not depend on the requested window.
+    rows = (
+        db.query(GymExerciseDailyRecord)
+        .filter(GymExerciseDailyRecord.exercise_id == exercise_id, GymExerciseDailyRecord.user_id == current_user.id)
+        .all()
+    )
+    return build_trend(exercise_id, rows, resolution, start_date, end_date)
 
 
 @router.get("/history/{exercise_id}", response_model=list[GymExerciseHistoryRead])
@@ -370,6 +409,34 @@ def list_history(exercise_id: str, db: Session = Depends(get_db), current_user:
     return [GymExerciseHistoryRead.model_validate(entry) for entry in history]
 
 
+@router.get("/volume", response_model=GymVolumeResponse)
+def get_weekly_volume(
+    weeks: int = Query(_VOLUME_DEFAULT_WEEKS, ge=1, le=104),
+    end_date: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Weekly sets per muscle against the user's targets.
+
+    May rebuild and commit the user's rollups first when they predate GYM_ROLLUP_VERSION, so this GET can write.
+    """
+    ensure_gym_rollups(db, current_user.id)
+    last_week = week_start(datetime.combine(end_date or date.today(), datetime.min.time()))
+    first_week = last_week - timedelta(weeks=weeks - 1)
+    rows = db.query(
+        GymWeeklyVolume.week_start,
+        GymWeeklyVolume.muscle,
+        GymWeeklyVolume.direct_sets,
+        GymWeeklyVolume.indirect_sets,
+    ).filter(
+        GymWeeklyVolume.user_id == current_user.id,
+        GymWeeklyVolume.week_start >= first_week,
+        GymWeeklyVolume.week_start <= last_week,
+    )
+    targets = (current_user.preferences_json or {}).get("gym_muscle_targets") or get_default_muscle_targets()
+    return build_volume_report(rows.all(), targets, first_week, last_week)
+
+
 @router.post("/history", response_model=GymExerciseHistoryRead, status_code=status.HTTP_201_CREATED)
 def create_history_entry(payload: GymExerciseHistoryCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     exercise = _get_exercise_or_404(db, current_user.id, payload.exercise_id)
@@ -379,6 +446,7 @@ def create_history_entry(payload: GymExerciseHistoryCreate, db: Session = Depend
     data["user_id"] = current_user.id
     history_entry = GymExerciseHistory(**data)
     db.add(history_entry)
+    add_history_rollups(db, current_user.id, exercise, [history_entry])
 
     meta = dict(exercise.extra_metadata or {})
     meta["last_performed_on"] = data["recorded_at"].isoformat() if isinstance(data["recorded_at"], datetime) else data["recorded_at"]
@@ -394,13 +462,14 @@ def create_history_entry(payload: GymExerciseHistoryCreate, db: Session = Depend
 def delete_history_entry(history_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     entry = _get_history_or_404(db, current_user.id, history_id)
     exercise_id = entry.exercise_id
+    remove_history_rollups(db, current_user.id, entry.exercise, [entry])
     db.delete(entry)
     db.commit()
 
     latest = (
         db.query(GymExerciseHistory)
         .filter(GymExerciseHistory.exercise_id == exercise_id, GymExerciseHistory.user_id == current_user.id)
-        .order_by(GymExerciseHistory.recorded_at.desc())
+        .order_by(GymExerciseHistory.recorded_at.desc(), GymExerciseHistory.created_at.desc())
         .first()
     )
     exercise = db.query(GymExercise).filter(GymExercise.id == exercise_id, GymExercise.user_id == current_user.id).first()
@@ -498,25 +567,15 @@ def substitute_assignment(assignment_id: str, db: Session = Depends(get_db), cur
     slot_tokens = _collect_slot_tokens(assignment.slot_metadata)
     if slot_tokens:
         target_tokens |= slot_tokens
-    active_exercises = (
-        db.query(GymExercise)
-        .filter(GymExercise.user_id == current_user.id, GymExercise.is_active.is_(True))
-        .order_by(GymExercise.name)
-        .all()
-    )
 
     current_exercise_id = assignment.selected_exercise_id or reference_exercise.id
 
     def _build_rotation() -> list[str]:
-        ranked = _rank_substitute_candidates(reference_exercise, active_exercises, target_tokens)
-        ranked = _append_explicit_options(ranked, assignment.options, db, current_user.id)
-        unique_ids: list[str] = []
-        seen_ids: set[str] = set()
-        for exercise in ranked:
-            if exercise.id not in seen_ids:
-                unique_ids.append(exercise.id)
-                seen_ids.add(exercise.id)
-        if current_exercise_id not in seen_ids:
+        ranked = _substitute_index(db, current_user.id).rank(
+            reference_exercise.id, reference_exercise.primary_muscle, reference_exercise.secondary_muscle, target_tokens
+        )
+        unique_ids = _append_explicit_options(ranked, assignment.options, db, current_user.id)
+        if current_exercise_id not in unique_ids:
             unique_ids.insert(0, current_exercise_id)
         return unique_ids
 
@@ -546,16 +605,17 @@ def substitute_assignment(assignment_id: str, db: Session = Depends(get_db), cur
 
 
 @router.put("/preferences/muscle-targets", status_code=status.HTTP_204_NO_CONTENT)
-def update_muscle_targets(payload: dict[str, dict[str, int]], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def update_muscle_targets(payload: dict[str, dict[str, int]], db: Session = Depends(get_db), current_user: User = Depends(get_current_user_for_update)):
     preferences = dict(current_user.preferences_json or {})
     preferences["gym_muscle_targets"] = payload
     current_user.preferences_json = preferences
     db.add(current_user)
     db.commit()
+    invalidate_cached_user(current_user.id)
 
 
 @router.put("/preferences/day-settings", status_code=status.HTTP_204_NO_CONTENT)
-def update_day_settings(payload: GymDaySettingsUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def update_day_settings(payload: GymDaySettingsUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_for_update)):
     normalized = _default_day_settings()
     for day_key, value in (payload.day_settings or {}).items():
         if day_key not in normalized:
@@ -569,3 +629,4 @@ def update_day_settings(payload: GymDaySettingsUpdate, db: Session = Depends(get
     current_user.preferences_json = preferences
     db.add(current_user)
     db.commit()
+    invalidate_cached_user(current_user.id)
@@ -1,4 +1,13 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.database import pool_status
+from ..core.metrics import render_prometheus
+from ..core.security import session_cache
+from ..services.calendar_feed import calendar_feed_cache
+from ..services.gym_substitutes import substitute_index_cache
+from ..services.planner_cache import planner_cache
+from ..services.task_dependencies import dependency_cache
 
 router = APIRouter(tags=["health"])
 
@@ -6,3 +15,38 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/db-pool")
+async def db_pool_health():
+    return pool_status()
+
+
+@router.get("/health/auth-cache")
+async def auth_cache_health():
+    return session_cache.stats()
+
+
+@router.get("/health/planner-cache")
+async def planner_cache_health():
+    return planner_cache.stats()
+
+
+@router.get("/health/dependency-cache")
+async def dependency_cache_health():
+    return dependency_cache.stats()
+
+
+@router.get("/health/calendar-feed-cache")
+async def calendar_feed_cache_health():
+    return calendar_feed_cache.stats()
+
+
+@router.get("/health/substitute-index-cache")
+async def substitute_index_cache_health():
+    return substitute_index_cache.stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
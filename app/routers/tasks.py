@@ -1,16 +1,24 @@
+import base64
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, time, timedelta
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
-from ..core.security import get_current_user, require_api_key
+from ..core.config import get_settings
+from ..core.database import AsyncSessionLocal, get_async_db, get_db
+from ..core.security import create_calendar_token, decode_calendar_token, get_current_user, get_current_user_async, require_api_key
 from ..models.user import User
-from ..models.task import TaskHistory, TaskTemplate
+from ..models.task import TaskDailyStat, TaskHistory, TaskScheduledSlot, TaskTemplate
 from ..schemas.task import (
+    CalendarFeedLink,
     PlannerDay,
     PlannerResponse,
     PlannerTaskCard,
+    ScheduleAutoPlanResponse,
     ScheduleCommitRequest,
     ScheduleCommitResponse,
     SchedulePreviewResponse,
@@ -19,15 +27,39 @@ from ..schemas.task import (
     ScheduledTaskSlot,
     TaskActionRequest,
     TaskActionResponse,
+    TaskBulkActionRequest,
+    TaskBulkActionResponse,
+    TaskBulkActionResult,
+    TaskDownstreamItem,
+    TaskDownstreamResponse,
+    TaskStatsResponse,
     TaskHistoryCreate,
     TaskHistoryRead,
     TaskTemplateCreate,
     TaskTemplateRead,
     TaskTemplateUpdate,
 )
+from ..services.calendar_feed import (
+    calendar_feed_cache,
+    feed_etag,
+    feed_last_modified,
+    feed_today,
+    format_http_date,
+    is_not_modified,
+    render_planner_ics,
+)
+from ..services.planner_cache import planner_cache
+from ..services.task_dependencies import DependencyGraph, build_dependency_graph, dependency_cache, dependency_trigger
+from ..services.task_stats import build_task_stats, record_history_stats
+from ..services.task_scheduler import SchedulingTask, named_window, parse_windows, plan_week
 
 router = APIRouter(prefix="/tasks", tags=["tasks"], dependencies=[Depends(require_api_key)])
 
+_PLANNER_STREAM_MAX_DAYS = 366
+_PLANNER_STREAM_CHUNK_DAYS = 31
+_STATS_DEFAULT_DAYS = 90
+_STATS_MAX_DAYS = 366
+
 
 def _normalize_metadata_value(key: str, value):
     if key == "assigned_weekdays" and value is not None:
@@ -45,16 +77,60 @@ def list_tasks(include_archived: bool = False, db: Session = Depends(get_db), cu
     return query.order_by(TaskTemplate.created_at.desc()).all()
 
 
+_HISTORY_PAGE_MAX = 1000
+
+
+def _encode_history_cursor(record: TaskHistory) -> str:
+    raw = f"{record.completed_at.isoformat()}|{record.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_history_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        completed_at, record_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(completed_at), record_id
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid history cursor") from None
+
+
+def _history_page(query, cursor: str | None, start_date: date | None, end_date: date | None, limit: int) -> tuple[list, bool]:
+    # Keyset pagination on (completed_at, id) descending; callers return the next page key in X-Next-Cursor.
+    if start_date is not None:
+        query = query.filter(TaskHistory.completed_at >= datetime.combine(start_date, time.min))
+    if end_date is not None:
+        query = query.filter(TaskHistory.completed_at < datetime.combine(end_date + timedelta(days=1), time.min))
+    if cursor:
+        cursor_at, cursor_id = _decode_history_cursor(cursor)
+        query = query.filter(
+            or_(
+                TaskHistory.completed_at < cursor_at,
+                and_(TaskHistory.completed_at == cursor_at, TaskHistory.id < cursor_id),
+            )
+        )
+    page_size = max(1, min(limit, _HISTORY_PAGE_MAX))
+    rows = query.order_by(TaskHistory.completed_at.desc(), TaskHistory.id.desc()).limit(page_size + 1).all()
+    return rows[:page_size], len(rows) > page_size
+
+
 @router.get("/history", response_model=list[TaskHistoryRead])
-def list_all_history(limit: int = 250, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    records = (
+def list_all_history(
+    response: Response,
+    limit: int = 250,
+    cursor: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """History newest first, `limit` rows (250 by default) per page; X-Next-Cursor is set when older rows remain."""
+    query = (
         db.query(TaskHistory, TaskTemplate.title.label("task_title"))
         .join(TaskTemplate, TaskTemplate.id == TaskHistory.task_id)
         .filter(TaskHistory.user_id == current_user.id, TaskTemplate.user_id == current_user.id)
-        .order_by(TaskHistory.completed_at.desc())
-        .limit(limit)
-        .all()
     )
+    records, has_more = _history_page(query, cursor, start_date, end_date, limit)
+    if has_more:
+        response.headers["X-Next-Cursor"] = _encode_history_cursor(records[-1][0])
     history: list[TaskHistoryRead] = []
     for record, task_title in records:
         payload = TaskHistoryRead.model_validate(record, from_attributes=True)
@@ -94,32 +170,53 @@ def _is_dependency_scheduled(task: TaskTemplate) -> bool:
     return bool(meta.get("trigger_task_id"))
 
 
-def _task_meta(task: TaskTemplate) -> dict:
-    return dict(task.metadata_json or {})
-
-
-def _task_window(task: TaskTemplate) -> str:
-    return str(_task_meta(task).get("window") or "any")
-
-
-def _task_notes_enabled(task: TaskTemplate) -> bool:
-    return bool(_task_meta(task).get("notesEnabled", True))
-
-
-def _task_autop(task: TaskTemplate) -> bool:
-    return bool(_task_meta(task).get("autop", False))
-
-
-def _task_assigned_weekdays(task: TaskTemplate) -> list[int]:
-    value = _task_meta(task).get("assigned_weekdays") or []
-    return [int(item) for item in value]
-
-
-def _task_trigger(task: TaskTemplate) -> tuple[str | None, int]:
-    meta = _task_meta(task)
-    trigger_task_id = meta.get("trigger_task_id")
-    trigger_after_days = max(0, int(meta.get("trigger_after_days", 0) or 0))
-    return trigger_task_id, trigger_after_days
+def _dependency_graph(db: Session, user_id: str) -> DependencyGraph:
+    graph = dependency_cache.get(user_id)
+    if graph is not None:
+        return graph
+    version = dependency_cache.version(user_id)
+    rows = db.query(TaskTemplate.id, TaskTemplate.recurrence, TaskTemplate.metadata_json).filter(
+        TaskTemplate.user_id == user_id, TaskTemplate.is_archived.is_(False)
+    )
+    graph = build_dependency_graph(rows.all())
+    dependency_cache.put(user_id, graph, version)
+    return graph
+
+
+async def _dependency_graph_async(db: AsyncSession, user_id: str) -> DependencyGraph:
+    graph = dependency_cache.get(user_id)
+    if graph is not None:
+        return graph
+    version = dependency_cache.version(user_id)
+    rows = await db.execute(
+        select(TaskTemplate.id, TaskTemplate.recurrence, TaskTemplate.metadata_json).where(
+            TaskTemplate.user_id == user_id, TaskTemplate.is_archived.is_(False)
+        )
+    )
+    graph = build_dependency_graph(rows.all())
+    dependency_cache.put(user_id, graph, version)
+    return graph
+
+
+def _validate_dependency(db: Session, user_id: str, task_id: str | None, recurrence: dict | None, meta: dict) -> None:
+    trigger = dependency_trigger(recurrence, meta)
+    if trigger is None:
+        return
+    if trigger[0] == task_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A task cannot be triggered by itself")
+    # A task that does not exist yet has no dependents, so it cannot close a cycle.
+    if task_id is not None and _dependency_graph(db, user_id).creates_cycle(task_id, trigger[0]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Trigger task would create a dependency cycle")
+
+
+def _touch_task_data(db: Session, user_id: str) -> None:
+    # updated_at is pinned so task writes do not look like profile edits.
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(tasks_version=User.tasks_version + 1, tasks_changed_at=datetime.utcnow(), updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
 
 
 def _normalize_datetime(value: datetime) -> datetime:
@@ -136,9 +233,9 @@ def _parse_metadata_datetime(value: str) -> datetime | None:
     return _normalize_datetime(parsed)
 
 
-def _task_scheduled_slots(task: TaskTemplate) -> list[tuple[str, datetime]]:
+def _parse_scheduled_slots(values: list | None) -> list[tuple[str, datetime]]:
     parsed_slots: list[tuple[str, datetime]] = []
-    for raw in _task_meta(task).get("scheduled_slots") or []:
+    for raw in values or []:
         parsed = _parse_metadata_datetime(str(raw))
         if parsed is None:
             continue
@@ -147,18 +244,25 @@ def _task_scheduled_slots(task: TaskTemplate) -> list[tuple[str, datetime]]:
     return parsed_slots
 
 
-def _completion_days_by_task(history: list[TaskHistory]) -> dict[str, set[date]]:
+def _slot_rows(user_id: str, values: list | None, task_id: str | None = None) -> list[TaskScheduledSlot]:
+    return [
+        TaskScheduledSlot(user_id=user_id, task_id=task_id, slot_at=parsed, value=raw)
+        for raw, parsed in _parse_scheduled_slots(values)
+    ]
+
+
+def _completion_days_by_task(history: list[tuple[str, datetime]]) -> dict[str, set[date]]:
     completion_days: dict[str, set[date]] = {}
-    for entry in history:
-        completion_days.setdefault(entry.task_id, set()).add(_normalize_datetime(entry.completed_at).date())
+    for task_id, completed_at in history:
+        completion_days.setdefault(task_id, set()).add(_normalize_datetime(completed_at).date())
     return completion_days
 
 
-def _latest_completion_by_task(tasks: list[TaskTemplate], history: list[TaskHistory]) -> dict[str, datetime]:
+def _latest_completion_by_task(tasks: list[TaskTemplate], completions: dict[str, datetime]) -> dict[str, datetime]:
     latest: dict[str, datetime] = {}
 
     for task in tasks:
-        last_completed_at = _task_meta(task).get("lastCompletedAt")
+        last_completed_at = (task.metadata_json or {}).get("lastCompletedAt")
         if not last_completed_at:
             continue
         parsed = _parse_metadata_datetime(str(last_completed_at))
@@ -166,17 +270,88 @@ def _latest_completion_by_task(tasks: list[TaskTemplate], history: list[TaskHist
             continue
         latest[task.id] = parsed
 
-    for entry in history:
-        completed_at = _normalize_datetime(entry.completed_at)
-        existing = latest.get(entry.task_id)
+    for task_id, completed_at in completions.items():
+        completed_at = _normalize_datetime(completed_at)
+        existing = latest.get(task_id)
         if existing is None or completed_at > existing:
-            latest[entry.task_id] = completed_at
+            latest[task_id] = completed_at
 
     return latest
 
 
-def _build_task_card(
+def _note_completion(task: TaskTemplate, completed_at: datetime) -> None:
+    completed_at = _normalize_datetime(completed_at)
+    if task.last_completed_at is None or completed_at > task.last_completed_at:
+        task.last_completed_at = completed_at
+
+
+@dataclass(slots=True)
+class _TaskPlan:
+    task: TaskTemplate
+    kind: str
+    window: str
+    notes_enabled: bool
+    autop: bool
+    weekday_mask: int = 0
+    due_date: date | None = None
+    display_date: date | None = None
+    overdue_slots: list[tuple[str, datetime]] = field(default_factory=list)
+    slots_by_date: dict[date, list[tuple[str, datetime]]] = field(default_factory=dict)
+
+
+def _compile_task_plan(
     task: TaskTemplate,
+    slots: list[tuple[str, datetime]],
+    latest_done_by_task: dict[str, datetime],
+    today: date,
+) -> _TaskPlan:
+    meta = task.metadata_json or {}
+    category = task.category or "occasional"
+    plan = _TaskPlan(
+        task=task,
+        kind=category,
+        window=str(meta.get("window") or "any"),
+        notes_enabled=bool(meta.get("notesEnabled", True)),
+        autop=bool(meta.get("autop", False)),
+    )
+
+    if category == "daily":
+        return plan
+
+    if category in {"long_term_task", "long_term_goal"}:
+        plan.kind = "long_term"
+        for value in meta.get("assigned_weekdays") or []:
+            plan.weekday_mask |= 1 << ((int(value) - 1) % 7)
+        return plan
+
+    task_completed_at = latest_done_by_task.get(task.id)
+    if _is_dependency_scheduled(task):
+        plan.kind = "hidden"
+        trigger_completed_at = latest_done_by_task.get(meta.get("trigger_task_id"))
+        if trigger_completed_at is None:
+            return plan
+        trigger_after_days = max(0, int(meta.get("trigger_after_days", 0) or 0))
+        due_date = trigger_completed_at.date() + timedelta(days=trigger_after_days)
+        if task_completed_at is not None and task_completed_at.date() >= due_date:
+            return plan
+        plan.kind = "after_completion"
+        plan.due_date = due_date
+        plan.display_date = max(due_date, today)
+        return plan
+
+    plan.kind = "scheduled"
+    for raw, parsed in slots:
+        slot_date = parsed.date()
+        if task_completed_at is not None and task_completed_at.date() >= slot_date:
+            continue
+        if slot_date < today:
+            plan.overdue_slots.append((raw, parsed))
+        plan.slots_by_date.setdefault(slot_date, []).append((raw, parsed))
+    return plan
+
+
+def _build_task_card(
+    plan: _TaskPlan,
     display_date: date,
     *,
     status: str,
@@ -188,6 +363,7 @@ def _build_task_card(
     scheduled_time: str | None = None,
     part: str | None = None,
 ) -> PlannerTaskCard:
+    task = plan.task
     return PlannerTaskCard(
         id=f"{task.id}-{display_date.isoformat()}-{part or card_type}",
         task_id=task.id,
@@ -198,7 +374,7 @@ def _build_task_card(
         chunk_minutes=task.duration_minutes,
         priority="high" if status == "overdue" else task.priority,
         priority_label=priority_label,
-        autop=_task_autop(task),
+        autop=plan.autop,
         status=status,
         type=card_type,
         part=part,
@@ -206,8 +382,8 @@ def _build_task_card(
         scheduled_slot=scheduled_slot,
         scheduled_slots_to_clear=scheduled_slots_to_clear or ([] if scheduled_slot is None else [scheduled_slot]),
         scheduled_time=scheduled_time,
-        window=_task_window(task),
-        notes_enabled=_task_notes_enabled(task),
+        window=plan.window,
+        notes_enabled=plan.notes_enabled,
     )
 
 
@@ -227,90 +403,56 @@ def _sort_day_tasks(tasks: list[PlannerTaskCard]) -> list[PlannerTaskCard]:
     )
 
 
-def _build_planner(tasks: list[TaskTemplate], history: list[TaskHistory], start_date: date, days: int) -> PlannerResponse:
-    latest_done_by_task = _latest_completion_by_task(tasks, history)
-    completion_days = _completion_days_by_task(history)
-    today = date.today()
-    planner_days: list[PlannerDay] = []
+def _plan_cards(plan: _TaskPlan, dates: list[date], handled_days: set[date], today: date) -> list[tuple[int, PlannerTaskCard]]:
+    cards: list[tuple[int, PlannerTaskCard]] = []
+    start_date = dates[0]
 
-    for offset in range(days):
-        current_date = start_date + timedelta(days=offset)
-        day_tasks: list[PlannerTaskCard] = []
+    def _offset(value: date) -> int | None:
+        offset = (value - start_date).days
+        return offset if 0 <= offset < len(dates) else None
 
-        for task in tasks:
-            task_category = task.category or "occasional"
-            handled_days = completion_days.get(task.id, set())
+    if plan.kind == "daily":
+        for offset, current_date in enumerate(dates):
+            if current_date not in handled_days:
+                cards.append((offset, _build_task_card(plan, current_date, status="due", card_type="daily", priority_label="Daily task")))
 
-            if task_category == "daily":
-                if current_date not in handled_days:
-                    day_tasks.append(
-                        _build_task_card(
-                            task,
-                            current_date,
-                            status="due",
-                            card_type="daily",
-                            priority_label="Daily task",
-                        )
-                    )
+    elif plan.kind == "long_term":
+        card_type = plan.task.category
+        priority_label = "Long-term goal" if card_type == "long_term_goal" else "Long-term task"
+        for offset, current_date in enumerate(dates):
+            if not (plan.weekday_mask >> current_date.weekday()) & 1 or current_date in handled_days:
                 continue
-
-            if task_category in {"long_term_task", "long_term_goal"}:
-                if current_date.weekday() not in [((value - 1) % 7) for value in _task_assigned_weekdays(task)]:
-                    continue
-                if current_date in handled_days:
-                    continue
-                day_tasks.append(
+            cards.append((offset, _build_task_card(plan, current_date, status="due", card_type=card_type, priority_label=priority_label)))
+
+    elif plan.kind == "after_completion":
+        offset = _offset(plan.display_date)
+        if offset is not None:
+            cards.append(
+                (
+                    offset,
                     _build_task_card(
-                        task,
-                        current_date,
-                        status="due",
-                        card_type=task_category,
-                        priority_label="Long-term goal" if task_category == "long_term_goal" else "Long-term task",
-                    )
-                )
-                continue
-
-            trigger_task_id, trigger_after_days = _task_trigger(task)
-            if _is_dependency_scheduled(task) and trigger_task_id:
-                trigger_completed_at = latest_done_by_task.get(trigger_task_id)
-                if trigger_completed_at is None:
-                    continue
-                due_date = trigger_completed_at.date() + timedelta(days=trigger_after_days)
-                task_completed_at = latest_done_by_task.get(task.id)
-                if task_completed_at is not None and task_completed_at.date() >= due_date:
-                    continue
-                display_date = max(due_date, today)
-                if current_date != display_date:
-                    continue
-                day_tasks.append(
-                    _build_task_card(
-                        task,
-                        current_date,
-                        status="overdue" if current_date > due_date else "due",
+                        plan,
+                        plan.display_date,
+                        status="overdue" if plan.display_date > plan.due_date else "due",
                         card_type="after_completion",
                         priority_label="After completion",
-                        due_date=due_date,
-                    )
+                        due_date=plan.due_date,
+                    ),
                 )
-                continue
+            )
 
-            slots = [
-                (raw, parsed)
-                for raw, parsed in _task_scheduled_slots(task)
-                if latest_done_by_task.get(task.id) is None or latest_done_by_task[task.id].date() < parsed.date()
-            ]
-            overdue_slots = [(raw, parsed) for raw, parsed in slots if parsed.date() < today]
-            current_day_slots = [(raw, parsed) for raw, parsed in slots if parsed.date() == current_date]
-
-            if current_date == today and overdue_slots:
-                primary_raw, primary_parsed = overdue_slots[0]
-                merged_slots = [raw for raw, _ in overdue_slots]
-                if current_day_slots:
-                    merged_slots.extend(raw for raw, _ in current_day_slots)
-                day_tasks.append(
+    elif plan.kind == "scheduled":
+        today_offset = _offset(today)
+        if plan.overdue_slots and today_offset is not None:
+            primary_raw, primary_parsed = plan.overdue_slots[0]
+            merged_slots = [raw for raw, _ in plan.overdue_slots]
+            merged_slots.extend(raw for raw, _ in plan.slots_by_date.get(today, []))
+            cards.append(
+                (
+                    today_offset,
                     _build_task_card(
-                        task,
-                        current_date,
+                        plan,
+                        today,
                         status="overdue",
                         card_type="scheduled",
                         priority_label="Scheduled slot",
@@ -319,30 +461,57 @@ def _build_planner(tasks: list[TaskTemplate], history: list[TaskHistory], start_
                         scheduled_slots_to_clear=merged_slots,
                         scheduled_time=primary_parsed.strftime("%H:%M"),
                         part="carryover",
-                    )
+                    ),
                 )
+            )
+        for slot_date, day_slots in plan.slots_by_date.items():
+            offset = _offset(slot_date)
+            if offset is None or slot_date < today or (slot_date == today and plan.overdue_slots):
                 continue
-
-            if current_date < today:
-                continue
-
-            for slot_index, (raw, parsed) in enumerate(current_day_slots):
-                day_tasks.append(
-                    _build_task_card(
-                        task,
-                        current_date,
-                        status="due",
-                        card_type="scheduled",
-                        priority_label="Scheduled slot",
-                        due_date=current_date,
-                        scheduled_slot=raw,
-                        scheduled_slots_to_clear=[raw],
-                        scheduled_time=parsed.strftime("%H:%M"),
-                        part=f"Slot {slot_index + 1}" if len(current_day_slots) > 1 else None,
+            for slot_index, (raw, parsed) in enumerate(day_slots):
+                cards.append(
+                    (
+                        offset,
+                        _build_task_card(
+                            plan,
+                            slot_date,
+                            status="due",
+                            card_type="scheduled",
+                            priority_label="Scheduled slot",
+                            due_date=slot_date,
+                            scheduled_slot=raw,
+                            scheduled_slots_to_clear=[raw],
+                            scheduled_time=parsed.strftime("%H:%M"),
+                            part=f"Slot {slot_index + 1}" if len(day_slots) > 1 else None,
+                        ),
                     )
                 )
 
-        sorted_tasks = _sort_day_tasks(day_tasks)
+    return cards
+
+
+def _compile_task_plans(
+    tasks: list[TaskTemplate],
+    slots_by_task: dict[str, list[tuple[str, datetime]]],
+    completions: dict[str, datetime],
+    today: date,
+) -> list[_TaskPlan]:
+    latest_done_by_task = _latest_completion_by_task(tasks, completions)
+    return [_compile_task_plan(task, slots_by_task.get(task.id, []), latest_done_by_task, today) for task in tasks]
+
+
+def _planner_days(plans: list[_TaskPlan], history: list[tuple[str, datetime]], dates: list[date], today: date) -> list[PlannerDay]:
+    completion_days = _completion_days_by_task(history)
+    day_cards: list[list[PlannerTaskCard]] = [[] for _ in dates]
+
+    # Cards are appended in task order, so each day keeps the same tie order as a per-day scan would.
+    for plan in plans:
+        for offset, card in _plan_cards(plan, dates, completion_days.get(plan.task.id, set()), today):
+            day_cards[offset].append(card)
+
+    planner_days: list[PlannerDay] = []
+    for current_date, cards in zip(dates, day_cards):
+        sorted_tasks = _sort_day_tasks(cards)
         planner_days.append(
             PlannerDay(
                 date=current_date,
@@ -352,16 +521,34 @@ def _build_planner(tasks: list[TaskTemplate], history: list[TaskHistory], start_
                 total_minutes=sum(task.duration for task in sorted_tasks),
             )
         )
+    return planner_days
+
 
+def _build_planner(
+    tasks: list[TaskTemplate],
+    slots_by_task: dict[str, list[tuple[str, datetime]]],
+    completions: dict[str, datetime],
+    history: list[tuple[str, datetime]],
+    start_date: date,
+    days: int,
+) -> PlannerResponse:
+    today = date.today()
+    plans = _compile_task_plans(tasks, slots_by_task, completions, today)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
     end_date = start_date + timedelta(days=max(days - 1, 0))
-    return PlannerResponse(start=start_date, end=end_date, days=planner_days)
+    return PlannerResponse(start=start_date, end=end_date, days=_planner_days(plans, history, dates, today))
 
 
-def _clear_task_slots(meta: dict, action_date: date, scheduled_slot: str | None, scheduled_slots_to_clear: list[str]) -> dict:
-    slots = [str(value) for value in meta.get("scheduled_slots") or []]
+def _slots_to_clear(scheduled_slot: str | None, scheduled_slots_to_clear: list[str]) -> set[str]:
     to_clear = {str(value) for value in scheduled_slots_to_clear if value}
     if scheduled_slot:
         to_clear.add(str(scheduled_slot))
+    return to_clear
+
+
+def _clear_task_slots(meta: dict, action_date: date, scheduled_slot: str | None, scheduled_slots_to_clear: list[str]) -> dict:
+    slots = [str(value) for value in meta.get("scheduled_slots") or []]
+    to_clear = _slots_to_clear(scheduled_slot, scheduled_slots_to_clear)
 
     if to_clear:
         remaining = [value for value in slots if value not in to_clear]
@@ -381,7 +568,20 @@ def _clear_task_slots(meta: dict, action_date: date, scheduled_slot: str | None,
     return meta
 
 
-def _record_task_action(task: TaskTemplate, payload: TaskActionRequest, user_id: str) -> tuple[TaskTemplate, TaskHistory | None]:
+def _delete_slot_rows(db: Session, task_id: str, action_date: date, scheduled_slot: str | None, scheduled_slots_to_clear: list[str]) -> None:
+    query = db.query(TaskScheduledSlot).filter(TaskScheduledSlot.task_id == task_id)
+    to_clear = _slots_to_clear(scheduled_slot, scheduled_slots_to_clear)
+    if to_clear:
+        query = query.filter(TaskScheduledSlot.value.in_(to_clear))
+    else:
+        day_start = datetime.combine(action_date, time.min)
+        query = query.filter(TaskScheduledSlot.slot_at >= day_start, TaskScheduledSlot.slot_at < day_start + timedelta(days=1))
+    # Sessions do not autoflush; a slot an earlier action of the same batch added must exist before it can be deleted.
+    db.flush()
+    query.delete(synchronize_session=False)
+
+
+def _record_task_action(db: Session, task: TaskTemplate, payload: TaskActionRequest, user_id: str) -> tuple[TaskTemplate, TaskHistory | None]:
     meta = dict(task.metadata_json or {})
     history_record: TaskHistory | None = None
     action_at = _normalize_datetime(payload.action_date)
@@ -390,6 +590,7 @@ def _record_task_action(task: TaskTemplate, payload: TaskActionRequest, user_id:
     if payload.action in {"complete", "skip"}:
         if (task.category or "occasional") == "occasional":
             meta = _clear_task_slots(meta, action_day, payload.scheduled_slot, payload.scheduled_slots_to_clear)
+            _delete_slot_rows(db, task.id, action_day, payload.scheduled_slot, payload.scheduled_slots_to_clear)
 
         if payload.status in {"completed", "progress"}:
             meta["lastCompletedAt"] = action_at.isoformat()
@@ -402,12 +603,14 @@ def _record_task_action(task: TaskTemplate, payload: TaskActionRequest, user_id:
             note=payload.note,
             status=payload.status,
         )
+        _note_completion(task, action_at)
 
     elif payload.action in {"snooze", "reschedule"}:
         if (task.category or "occasional") != "occasional":
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only occasional tasks can be moved")
         target_date = payload.target_date or (action_day + timedelta(days=1))
         meta = _clear_task_slots(meta, action_day, payload.scheduled_slot, payload.scheduled_slots_to_clear)
+        _delete_slot_rows(db, task.id, action_day, payload.scheduled_slot, payload.scheduled_slots_to_clear)
         source_dt = None
         if payload.scheduled_slot:
             source_dt = _parse_metadata_datetime(payload.scheduled_slot)
@@ -416,6 +619,7 @@ def _record_task_action(task: TaskTemplate, payload: TaskActionRequest, user_id:
         next_slot = datetime.combine(target_date, source_dt.timetz().replace(tzinfo=None))
         scheduled_slots = [str(value) for value in meta.get("scheduled_slots") or []]
         scheduled_slots.append(next_slot.isoformat())
+        db.add(TaskScheduledSlot(user_id=user_id, task_id=task.id, slot_at=next_slot, value=next_slot.isoformat()))
         scheduled_slots.sort()
         meta["scheduled_slots"] = scheduled_slots
         meta["nextDueDate"] = target_date.isoformat()
@@ -424,23 +628,256 @@ def _record_task_action(task: TaskTemplate, payload: TaskActionRequest, user_id:
     return task, history_record
 
 
+async def _load_planner_inputs(
+    db: AsyncSession,
+    user_id: str,
+    start_date: date,
+    days: int,
+    today: date,
+) -> tuple[list[TaskTemplate], dict[str, list[tuple[str, datetime]]], dict[str, datetime]]:
+    tasks = (
+        await db.scalars(
+            select(TaskTemplate)
+            .where(TaskTemplate.user_id == user_id, TaskTemplate.is_archived.is_(False))
+            .order_by(TaskTemplate.created_at.desc())
+        )
+    ).all()
+    completions = await db.execute(
+        select(TaskTemplate.id, TaskTemplate.last_completed_at).where(
+            TaskTemplate.user_id == user_id,
+            TaskTemplate.last_completed_at.is_not(None),
+        )
+    )
+    range_start = datetime.combine(start_date, time.min)
+    range_end = range_start + timedelta(days=days)
+    slots_by_task: dict[str, list[tuple[str, datetime]]] = {}
+    # Slots only surface from today onwards; earlier pending slots matter only as today's carryover.
+    if range_end > datetime.combine(today, time.min):
+        slot_query = select(TaskScheduledSlot.task_id, TaskScheduledSlot.value, TaskScheduledSlot.slot_at).where(
+            TaskScheduledSlot.user_id == user_id,
+            TaskScheduledSlot.slot_at < range_end,
+        )
+        if start_date > today:
+            slot_query = slot_query.where(TaskScheduledSlot.slot_at >= range_start)
+        for task_id, value, slot_at in await db.execute(slot_query.order_by(TaskScheduledSlot.slot_at, TaskScheduledSlot.value)):
+            slots_by_task.setdefault(task_id, []).append((value, slot_at))
+    return list(tasks), slots_by_task, dict(completions.all())
+
+
+async def _load_history_range(db: AsyncSession, user_id: str, start_date: date, days: int) -> list[tuple[str, datetime]]:
+    range_start = datetime.combine(start_date, time.min)
+    history = await db.execute(
+        select(TaskHistory.task_id, TaskHistory.completed_at).where(
+            TaskHistory.user_id == user_id,
+            TaskHistory.completed_at >= range_start,
+            TaskHistory.completed_at < range_start + timedelta(days=days),
+        )
+    )
+    return [tuple(row) for row in history.all()]
+
+
 @router.get("/planner", response_model=PlannerResponse)
-def get_planner(start_date: date | None = None, days: int = 7, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_planner(
+    start_date: date | None = None,
+    days: int = 7,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
     safe_days = max(1, min(days, 31))
-    resolved_start = start_date or date.today()
-    tasks = (
-        db.query(TaskTemplate)
-        .filter(TaskTemplate.user_id == current_user.id, TaskTemplate.is_archived.is_(False))
-        .order_by(TaskTemplate.created_at.desc())
-        .all()
+    today = date.today()
+    resolved_start = start_date or today
+    cache_enabled = get_settings().planner_cache_enabled
+    cache_key = (current_user.id, resolved_start, safe_days, today)
+    if cache_enabled:
+        cached = planner_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        version = planner_cache.version(current_user.id)
+
+    tasks, slots_by_task, completions = await _load_planner_inputs(db, current_user.id, resolved_start, safe_days, today)
+    history = await _load_history_range(db, current_user.id, resolved_start, safe_days)
+    response = _build_planner(tasks, slots_by_task, completions, history, resolved_start, safe_days)
+    if cache_enabled:
+        planner_cache.put(cache_key, response, version, owner=current_user.id)
+    return response
+
+
+@router.get("/planner/stream")
+async def stream_planner(
+    start_date: date | None = None,
+    days: int = 90,
+    current_user: User = Depends(get_current_user_async),
+):
+    safe_days = max(1, min(days, _PLANNER_STREAM_MAX_DAYS))
+    today = date.today()
+    resolved_start = start_date or today
+    user_id = current_user.id
+
+    async def _lines():
+        # The stream outlives the request-scoped session, so it owns one; history is read per chunk to bound memory.
+        async with AsyncSessionLocal() as db:
+            tasks, slots_by_task, completions = await _load_planner_inputs(db, user_id, resolved_start, safe_days, today)
+            plans = _compile_task_plans(tasks, slots_by_task, completions, today)
+            for chunk_offset in range(0, safe_days, _PLANNER_STREAM_CHUNK_DAYS):
+                chunk_start = resolved_start + timedelta(days=chunk_offset)
+                chunk_days = min(_PLANNER_STREAM_CHUNK_DAYS, safe_days - chunk_offset)
+                history = await _load_history_range(db, user_id, chunk_start, chunk_days)
+                dates = [chunk_start + timedelta(days=offset) for offset in range(chunk_days)]
+                for planner_day in _planner_days(plans, history, dates, today):
+                    yield planner_day.model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def get_task_stats(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    today = date.today()
+    resolved_end = end_date or today
+    resolved_start = start_date or resolved_end - timedelta(days=_STATS_DEFAULT_DAYS - 1)
+    if resolved_start > resolved_end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    resolved_start = max(resolved_start, resolved_end - timedelta(days=_STATS_MAX_DAYS - 1))
+
+    task_query = select(TaskTemplate).where(TaskTemplate.user_id == current_user.id)
+    if not include_archived:
+        task_query = task_query.where(TaskTemplate.is_archived.is_(False))
+    tasks = (await db.scalars(task_query.order_by(TaskTemplate.created_at.desc()))).all()
+    rows = await db.execute(
+        select(
+            TaskDailyStat.task_id,
+            TaskDailyStat.day,
+            TaskDailyStat.completed_count,
+            TaskDailyStat.progress_count,
+            TaskDailyStat.skipped_count,
+            TaskDailyStat.minutes,
+        ).where(
+            TaskDailyStat.user_id == current_user.id,
+            TaskDailyStat.day >= resolved_start,
+            TaskDailyStat.day <= resolved_end,
+        )
     )
-    history = (
-        db.query(TaskHistory)
-        .filter(TaskHistory.user_id == current_user.id)
-        .order_by(TaskHistory.completed_at.desc())
-        .all()
+    slots = await db.execute(
+        select(TaskScheduledSlot.task_id, TaskScheduledSlot.slot_at).where(
+            TaskScheduledSlot.user_id == current_user.id,
+            TaskScheduledSlot.slot_at >= datetime.combine(resolved_start, time.min),
+            TaskScheduledSlot.slot_at < datetime.combine(resolved_end + timedelta(days=1), time.min),
+        )
     )
-    return _build_planner(tasks, history, resolved_start, safe_days)
+    scheduled = [(task_id, slot_at.date()) for task_id, slot_at in slots]
+    return build_task_stats(list(tasks), rows.all(), resolved_start, resolved_end, today, scheduled)
+
+
+def _calendar_feed_link(user_id: str, feed_version: int) -> CalendarFeedLink:
+    settings = get_settings()
+    token = create_calendar_token(user_id, feed_version)
+    return CalendarFeedLink(url=f"{settings.public_base_url.rstrip('/')}{settings.api_prefix}/tasks/calendar/{token}.ics")
+
+
+@router.get("/calendar/feed", response_model=CalendarFeedLink)
+def get_calendar_feed_link(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    # Read from the row: the cached session user may predate a rotation made through another worker.
+    feed_version = db.scalar(select(User.calendar_feed_version).where(User.id == current_user.id))
+    return _calendar_feed_link(current_user.id, feed_version or 0)
+
+
+@router.post("/calendar/feed/rotate", response_model=CalendarFeedLink)
+def rotate_calendar_feed_link(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Issue a new feed link; every link handed out before stops working."""
+    db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(calendar_feed_version=User.calendar_feed_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    feed_version = db.scalar(select(User.calendar_feed_version).where(User.id == current_user.id))
+    db.commit()
+    return _calendar_feed_link(current_user.id, feed_version)
+
+
+@router.get("/calendar/{token}.ics")
+async def get_calendar_feed(
+    token: str,
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = await decode_calendar_token(token, db)
+    user_id = user.id
+
+    days = max(1, min(get_settings().calendar_feed_days, _PLANNER_STREAM_MAX_DAYS))
+    today = feed_today()
+    etag = feed_etag(user_id, user.tasks_version, today, days)
+    last_modified = feed_last_modified(user.tasks_changed_at, today)
+    headers = {"ETag": etag, "Last-Modified": format_http_date(last_modified), "Cache-Control": "private, no-cache"}
+    if is_not_modified(if_none_match, if_modified_since, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = calendar_feed_cache.get(user_id, etag)
+    if body is None:
+        tasks, slots_by_task, completions = await _load_planner_inputs(db, user_id, today, days, today)
+        history = await _load_history_range(db, user_id, today, days)
+        plans = _compile_task_plans(tasks, slots_by_task, completions, today)
+        dates = [today + timedelta(days=offset) for offset in range(days)]
+        body = render_planner_ics(_planner_days(plans, history, dates, today), last_modified)
+        calendar_feed_cache.put(user_id, etag, body)
+    return Response(content=body, media_type="text/calendar; charset=utf-8", headers=headers)
+
+
+@router.post("/actions", response_model=TaskBulkActionResponse)
+def apply_task_actions(payload: TaskBulkActionRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    task_ids = {item.task_id for item in payload.actions}
+    tasks_by_id: dict[str, TaskTemplate] = {}
+    if task_ids:
+        tasks = db.query(TaskTemplate).filter(TaskTemplate.user_id == current_user.id, TaskTemplate.id.in_(task_ids)).all()
+        tasks_by_id = {task.id: task for task in tasks}
+
+    outcomes: list[tuple[str, TaskTemplate | None, TaskHistory | None, str | None]] = []
+    history_records: list[TaskHistory] = []
+    for item in payload.actions:
+        task = tasks_by_id.get(item.task_id)
+        if task is None:
+            outcomes.append((item.task_id, None, None, "Task not found"))
+            continue
+        try:
+            task, history_record = _record_task_action(db, task, item, current_user.id)
+        except HTTPException as exc:
+            outcomes.append((item.task_id, None, None, str(exc.detail)))
+            continue
+        if history_record is not None:
+            history_records.append(history_record)
+        outcomes.append((item.task_id, task, history_record, None))
+
+    if any(task is not None for _, task, _, _ in outcomes):
+        db.add_all(history_records)
+        record_history_stats(db, current_user.id, history_records)
+        _touch_task_data(db, current_user.id)
+        db.commit()
+        planner_cache.invalidate(current_user.id)
+
+    results: list[TaskBulkActionResult] = []
+    for task_id, task, history_record, error in outcomes:
+        if task is None:
+            results.append(TaskBulkActionResult(task_id=task_id, ok=False, error=error))
+            continue
+        history_payload = None
+        if history_record is not None:
+            history_payload = TaskHistoryRead.model_validate(history_record, from_attributes=True)
+            history_payload.task_title = task.title
+        results.append(
+            TaskBulkActionResult(
+                task_id=task_id,
+                ok=True,
+                task=TaskTemplateRead.model_validate(task, from_attributes=True),
+                history=history_payload,
+            )
+        )
+    return TaskBulkActionResponse(results=results)
 
 
 @router.post("/{task_id}/action", response_model=TaskActionResponse)
@@ -449,11 +886,14 @@ def apply_task_action(task_id: str, payload: TaskActionRequest, db: Session = De
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
-    task, history_record = _record_task_action(task, payload, current_user.id)
+    task, history_record = _record_task_action(db, task, payload, current_user.id)
     if history_record is not None:
         db.add(history_record)
+        record_history_stats(db, current_user.id, [history_record])
     db.add(task)
+    _touch_task_data(db, current_user.id)
     db.commit()
+    planner_cache.invalidate(current_user.id)
     db.refresh(task)
     if history_record is not None:
         db.refresh(history_record)
@@ -479,8 +919,13 @@ def create_task(payload: TaskTemplateCreate = Body(..., embed=False), db: Sessio
         recurrence=payload.recurrence.model_dump(),
         metadata_json=_merge_metadata(payload, payload.metadata_json),
     )
+    _validate_dependency(db, current_user.id, None, task.recurrence, task.metadata_json)
+    task.slots = _slot_rows(current_user.id, task.metadata_json.get("scheduled_slots"))
     db.add(task)
+    _touch_task_data(db, current_user.id)
     db.commit()
+    planner_cache.invalidate(current_user.id)
+    dependency_cache.invalidate(current_user.id)
     db.refresh(task)
     return task
 
@@ -493,6 +938,7 @@ def update_task(task_id: str, payload: TaskTemplateUpdate = Body(..., embed=Fals
 
     updates = payload.model_dump(exclude_unset=True)
     metadata_patch = _merge_metadata(payload, updates.pop("metadata_json", task.metadata_json))
+    _validate_dependency(db, current_user.id, task.id, updates.get("recurrence", task.recurrence), metadata_patch)
 
     for key in ["title", "description", "duration_minutes", "priority", "recurrence", "is_archived"]:
         if key in updates:
@@ -501,9 +947,15 @@ def update_task(task_id: str, payload: TaskTemplateUpdate = Body(..., embed=Fals
     if "category" in updates:
         task.category = updates["category"]
 
+    if metadata_patch.get("scheduled_slots") != (task.metadata_json or {}).get("scheduled_slots"):
+        task.slots = _slot_rows(current_user.id, metadata_patch.get("scheduled_slots"))
     task.metadata_json = metadata_patch
 
+    _touch_task_data(db, current_user.id)
+
     db.commit()
+    planner_cache.invalidate(current_user.id)
+    dependency_cache.invalidate(current_user.id)
     db.refresh(task)
     return task
 
@@ -514,26 +966,76 @@ def delete_task(task_id: str, db: Session = Depends(get_db), current_user: User
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     db.delete(task)
+    _touch_task_data(db, current_user.id)
     db.commit()
+    planner_cache.invalidate(current_user.id)
+    dependency_cache.invalidate(current_user.id)
 
 
 @router.get("/{task_id}/history", response_model=list[TaskHistoryRead])
-def list_history(task_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_history(
+    task_id: str,
+    response: Response,
+    limit: int = 250,
+    cursor: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """One task's history newest first, `limit` rows (250 by default) per page; X-Next-Cursor is set when older rows remain."""
     task = db.query(TaskTemplate).filter(TaskTemplate.id == task_id, TaskTemplate.user_id == current_user.id).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    records = (
-        db.query(TaskHistory)
-        .filter(TaskHistory.task_id == task_id, TaskHistory.user_id == current_user.id)
-        .order_by(TaskHistory.completed_at.desc())
-        .all()
-    )
-    response: list[TaskHistoryRead] = []
+    query = db.query(TaskHistory).filter(TaskHistory.user_id == current_user.id, TaskHistory.task_id == task_id)
+    records, has_more = _history_page(query, cursor, start_date, end_date, limit)
+    if has_more:
+        response.headers["X-Next-Cursor"] = _encode_history_cursor(records[-1])
+    response_items: list[TaskHistoryRead] = []
     for record in records:
         payload = TaskHistoryRead.model_validate(record, from_attributes=True)
         payload.task_title = task.title
-        response.append(payload)
-    return response
+        response_items.append(payload)
+    return response_items
+
+
+@router.get("/{task_id}/downstream", response_model=TaskDownstreamResponse)
+async def get_downstream_tasks(
+    task_id: str,
+    completed_on: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    graph = await _dependency_graph_async(db, current_user.id)
+    downstream = graph.downstream(task_id)
+    related_ids = {task_id, *graph.upstream(task_id), *(dependent for dependent, _ in downstream)}
+    tasks = {
+        task.id: task
+        for task in await db.scalars(select(TaskTemplate).where(TaskTemplate.user_id == current_user.id, TaskTemplate.id.in_(related_ids)))
+    }
+    if task_id not in tasks:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    today = date.today()
+    resolved_completed_on = completed_on or today
+    due_dates = graph.project_unlocks(task_id, resolved_completed_on)
+    completions = {related.id: related.last_completed_at for related in tasks.values() if related.last_completed_at is not None}
+    current_due = graph.project_due_dates(_latest_completion_by_task(list(tasks.values()), completions), today)
+    items = [
+        TaskDownstreamItem(
+            task_id=dependent,
+            title=tasks[dependent].title,
+            trigger_task_id=graph.triggers[dependent][0],
+            trigger_after_days=graph.triggers[dependent][1],
+            depth=depth,
+            due_date=due_dates.get(dependent),
+            current_due_date=current_due[dependent][0] if dependent in current_due else None,
+            current_due_projected=current_due[dependent][1] if dependent in current_due else False,
+        )
+        for dependent, depth in downstream
+        if dependent in tasks
+    ]
+    return TaskDownstreamResponse(task_id=task_id, completed_on=resolved_completed_on, in_cycle=task_id in graph.cyclic, tasks=items)
 
 
 @router.post("/{task_id}/history", response_model=TaskHistoryRead, status_code=status.HTTP_201_CREATED)
@@ -542,24 +1044,18 @@ def add_history(task_id: str, record: TaskHistoryCreate, db: Session = Depends(g
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     history = TaskHistory(task_id=task_id, user_id=current_user.id, **record.model_dump())
+    _note_completion(task, history.completed_at)
     db.add(history)
+    record_history_stats(db, current_user.id, [history])
+    _touch_task_data(db, current_user.id)
     db.commit()
+    planner_cache.invalidate(current_user.id)
     db.refresh(history)
     payload = TaskHistoryRead.model_validate(history, from_attributes=True)
     payload.task_title = task.title
     return payload
 
 
-def _get_last_completed_at(db: Session, task_id: str, user_id: str) -> date | None:
-    record = (
-        db.query(TaskHistory.completed_at)
-        .filter(TaskHistory.task_id == task_id, TaskHistory.user_id == user_id)
-        .order_by(TaskHistory.completed_at.desc())
-        .first()
-    )
-    return record[0].date() if record else None
-
-
 def _resolve_week(request: ScheduleRequest) -> tuple[date, date]:
     today = date.today()
     week_start = request.week_start or today + timedelta(days=(5 - today.weekday()) % 7)
@@ -578,7 +1074,7 @@ def _extract_recurrence(task: TaskTemplate) -> tuple[str, int, int]:
     return mode, start_after, end_before
 
 
-def _classify_task(task: TaskTemplate, last_done: date | None, week_start: date, week_end: date) -> str:
+def _recurrence_bounds(task: TaskTemplate, last_done: date | None) -> tuple[date, date]:
     mode, start_after, end_before = _extract_recurrence(task)
     today = date.today()
 
@@ -587,31 +1083,33 @@ def _classify_task(task: TaskTemplate, last_done: date | None, week_start: date,
     else:
         base = today
 
-    earliest = base + timedelta(days=start_after)
-    latest = base + timedelta(days=end_before)
+    return base + timedelta(days=start_after), base + timedelta(days=end_before)
 
+
+def _classify_task(task: TaskTemplate, last_done: date | None, week_start: date, week_end: date) -> str:
+    earliest, latest = _recurrence_bounds(task, last_done)
     if week_end >= earliest and week_start <= latest:
         return "must"
     return "skip"
 
 
-@router.post("/schedule/preview", response_model=SchedulePreviewResponse)
-def preview_schedule(request: ScheduleRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    week_start, week_end = _resolve_week(request)
-    tasks = (
+def _schedule_candidates(db: Session, user_id: str, week_start: date, week_end: date) -> list[tuple[TaskTemplate, ScheduledTaskCandidate]]:
+    # _note_completion keeps last_completed_at current, so the user's history is not aggregated per preview.
+    rows = (
         db.query(TaskTemplate)
         .filter(
-            TaskTemplate.user_id == current_user.id,
+            TaskTemplate.user_id == user_id,
             TaskTemplate.is_archived.is_(False),
             TaskTemplate.category == "occasional",
         )
         .all()
     )
-    tasks = [task for task in tasks if not _is_dependency_scheduled(task)]
 
-    candidates: list[ScheduledTaskCandidate] = []
-    for task in tasks:
-        last_done = _get_last_completed_at(db, task.id, current_user.id)
+    candidates: list[tuple[TaskTemplate, ScheduledTaskCandidate]] = []
+    for task in rows:
+        if _is_dependency_scheduled(task):
+            continue
+        last_done = task.last_completed_at.date() if task.last_completed_at else None
         classification = _classify_task(task, last_done, week_start, week_end)
         meta = task.metadata_json or {}
         mode, start_after, end_before = _extract_recurrence(task)
@@ -630,9 +1128,59 @@ def preview_schedule(request: ScheduleRequest, db: Session = Depends(get_db), cu
             description=task.description,
             preferred_window=meta.get("window") or meta.get("preferred_window"),
         )
-        candidates.append(candidate)
+        candidates.append((task, candidate))
+    return candidates
 
-    return SchedulePreviewResponse(week_start=week_start, week_end=week_end, tasks=candidates)
+
+@router.post("/schedule/preview", response_model=SchedulePreviewResponse)
+def preview_schedule(request: ScheduleRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    week_start, week_end = _resolve_week(request)
+    candidates = _schedule_candidates(db, current_user.id, week_start, week_end)
+    return SchedulePreviewResponse(week_start=week_start, week_end=week_end, tasks=[candidate for _, candidate in candidates])
+
+
+@router.post("/schedule/auto", response_model=ScheduleAutoPlanResponse)
+def auto_schedule(request: ScheduleRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    week_start, week_end = _resolve_week(request)
+    today = date.today()
+    scheduling_tasks: list[SchedulingTask] = []
+    for task, candidate in _schedule_candidates(db, current_user.id, week_start, week_end):
+        if candidate.classification == "skip":
+            continue
+        earliest, latest = _recurrence_bounds(task, candidate.last_completed_at.date() if candidate.last_completed_at else None)
+        meta = task.metadata_json or {}
+        preferred = parse_windows(meta.get("preferred_windows"))
+        named = named_window(candidate.preferred_window)
+        if not preferred and named is not None:
+            preferred = [named]
+        scheduling_tasks.append(
+            SchedulingTask(
+                task_id=task.id,
+                duration_minutes=max(1, task.duration_minutes),
+                priority=task.priority,
+                earliest=max(earliest, week_start, today),
+                latest=min(latest, week_end),
+                preferred=preferred,
+                busy=parse_windows(meta.get("busy_windows")),
+            )
+        )
+
+    placements, unscheduled = plan_week(
+        scheduling_tasks,
+        week_start,
+        week_end,
+        user_busy=parse_windows(window.model_dump() for window in request.user_busy),
+        user_preferences=parse_windows(window.model_dump() for window in request.user_preferences),
+    )
+    plan = [
+        ScheduledTaskSlot(
+            task_id=placement.task_id,
+            scheduled_date=placement.day,
+            scheduled_time=time(placement.start_minute // 60, placement.start_minute % 60),
+        )
+        for placement in placements
+    ]
+    return ScheduleAutoPlanResponse(week_start=week_start, week_end=week_end, plan=plan, unscheduled=unscheduled)
 
 
 @router.post("/schedule/commit", response_model=ScheduleCommitResponse)
@@ -640,6 +1188,7 @@ def commit_schedule(request: ScheduleCommitRequest, db: Session = Depends(get_db
     task_ids = [slot.task_id for slot in request.plan]
     unique_task_ids = set(task_ids)
 
+    known: list[TaskTemplate] = []
     if unique_task_ids:
         known = (
             db.query(TaskTemplate)
@@ -666,43 +1215,50 @@ def commit_schedule(request: ScheduleCommitRequest, db: Session = Depends(get_db
         values.sort()
 
     # Apply week-scoped overwrite: remove only slots in [week_start, week_end], preserve other weeks.
-    tasks = (
-        db.query(TaskTemplate)
+    week_start_at = datetime.combine(request.week_start, time.min)
+    week_end_at = datetime.combine(request.week_end + timedelta(days=1), time.min)
+    existing = (
+        db.query(TaskScheduledSlot)
+        .join(TaskTemplate, TaskTemplate.id == TaskScheduledSlot.task_id)
         .filter(
-            TaskTemplate.user_id == current_user.id,
+            TaskScheduledSlot.user_id == current_user.id,
+            TaskScheduledSlot.slot_at >= week_start_at,
+            TaskScheduledSlot.slot_at < week_end_at,
             TaskTemplate.is_archived.is_(False),
             TaskTemplate.category == "occasional",
         )
         .all()
     )
-    changed = False
-
-    for task in tasks:
-        meta = dict(task.metadata_json or {})
-        slots = meta.get("scheduled_slots") or []
-
-        keep_outside_week: list[str] = []
-        for value in slots:
-            parsed = _parse_metadata_datetime(value)
-            if parsed is None:
-                # Preserve malformed values instead of dropping user data unexpectedly.
-                keep_outside_week.append(value)
-                continue
-
-            if request.week_start <= parsed.date() <= request.week_end:
-                continue
-            keep_outside_week.append(value)
-
-        merged = [*keep_outside_week, *(slots_by_task.get(task.id, []))]
-        merged.sort()
-
-        if merged != slots:
-            meta["scheduled_slots"] = merged
+    existing_by_task: dict[str, list[str]] = {}
+    for row in existing:
+        existing_by_task.setdefault(row.task_id, []).append(row.value)
+
+    active_plan_ids = {task.id for task in known if not task.is_archived}
+    changed_ids = {
+        task_id
+        for task_id in existing_by_task.keys() | active_plan_ids
+        if sorted(existing_by_task.get(task_id, [])) != slots_by_task.get(task_id, [])
+    }
+
+    if changed_ids:
+        stale_ids = [row.id for row in existing if row.task_id in changed_ids]
+        if stale_ids:
+            db.query(TaskScheduledSlot).filter(TaskScheduledSlot.id.in_(stale_ids)).delete(synchronize_session=False)
+        for task in db.query(TaskTemplate).filter(TaskTemplate.id.in_(changed_ids)).all():
+            incoming = slots_by_task.get(task.id, [])
+            db.add_all(_slot_rows(current_user.id, incoming, task.id))
+            meta = dict(task.metadata_json or {})
+            keep_outside_week: list[str] = []
+            for value in meta.get("scheduled_slots") or []:
+                parsed = _parse_metadata_datetime(value)
+                # Malformed values are preserved instead of dropping user data unexpectedly.
+                if parsed is None or not request.week_start <= parsed.date() <= request.week_end:
+                    keep_outside_week.append(value)
+            meta["scheduled_slots"] = sorted([*keep_outside_week, *incoming])
             task.metadata_json = meta
-            changed = True
-
-    if changed:
+        _touch_task_data(db, current_user.id)
         db.commit()
+        planner_cache.invalidate(current_user.id)
 
     return ScheduleCommitResponse(
         message="Plan cleared" if not request.plan else "Plan stored",
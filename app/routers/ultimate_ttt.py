@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import copy
 from datetime import datetime, timedelta
 import random
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
-from ..core.security import get_current_user, require_api_key
+from ..core.database import get_async_db, get_db
+from ..core.security import get_current_user, get_current_user_async, require_api_key
 from ..models.ultimate_ttt import UltimateTicTacToeGame, UltimateTicTacToeInvite, UltimateTicTacToeMove, UltimateTicTacToePresence
 from ..models.user import User
 from ..schemas.ultimate_ttt import ActivePlayerRead, GameCreateBot, GamePoint, GameRead, InviteCreate, InviteRead, MoveCreate, PresenceAck
@@ -65,6 +68,16 @@ def _serialize_invite(db: Session, request: Request, invite: UltimateTicTacToeIn
 def _serialize_game(db: Session, game: UltimateTicTacToeGame, current_user_id: str) -> GameRead:
     player_x = db.get(User, game.player_x_user_id) if game.player_x_user_id else None
     player_o = db.get(User, game.player_o_user_id) if game.player_o_user_id else None
+    return _build_game_read(game, current_user_id, player_x, player_o)
+
+
+async def _serialize_game_async(db: AsyncSession, game: UltimateTicTacToeGame, current_user_id: str) -> GameRead:
+    player_x = await db.get(User, game.player_x_user_id) if game.player_x_user_id else None
+    player_o = await db.get(User, game.player_o_user_id) if game.player_o_user_id else None
+    return _build_game_read(game, current_user_id, player_x, player_o)
+
+
+def _build_game_read(game: UltimateTicTacToeGame, current_user_id: str, player_x: User | None, player_o: User | None) -> GameRead:
     moves = legal_moves(game.board_state, game.subgrid_state, game.next_board_row, game.next_board_col) if game.status == "active" else []
     return GameRead(
         id=game.id,
@@ -102,7 +115,7 @@ def _ensure_game_access(game: UltimateTicTacToeGame | None, user_id: str) -> Ult
 
 
 def _apply_recorded_move(
-    db: Session,
+    db: Session | AsyncSession,
     game: UltimateTicTacToeGame,
     symbol: str,
     user_id: str | None,
@@ -150,27 +163,38 @@ def _apply_recorded_move(
     )
 
 
-def _execute_bot_turn_if_needed(db: Session, game: UltimateTicTacToeGame) -> None:
+def _bot_move_request(game: UltimateTicTacToeGame) -> dict | None:
+    """choose_bot_move arguments when the bot is to move, as plain copies that are safe to hand to a worker thread.
+
+    A bot with no legal move ends the game as a draw here.
+    """
     if game.mode != "bot" or game.status != "active" or not game.bot_symbol:
-        return
+        return None
     if game.current_player != game.bot_symbol:
-        return
+        return None
 
     valid_moves = legal_moves(game.board_state, game.subgrid_state, game.next_board_row, game.next_board_col)
     if not valid_moves:
         game.status = "finished"
         game.winner = "D"
         game.finished_at = datetime.utcnow()
-        return
+        return None
 
-    chosen = choose_bot_move(
-        board_state=game.board_state,
-        subgrid_state=game.subgrid_state,
-        current_player=game.current_player,
-        next_board_row=game.next_board_row,
-        next_board_col=game.next_board_col,
-        model_version=game.bot_model_version,
-    )
+    return {
+        "board_state": copy.deepcopy(game.board_state),
+        "subgrid_state": copy.deepcopy(game.subgrid_state),
+        "current_player": game.current_player,
+        "next_board_row": game.next_board_row,
+        "next_board_col": game.next_board_col,
+        "model_version": game.bot_model_version,
+    }
+
+
+def _apply_bot_move(
+    db: Session | AsyncSession,
+    game: UltimateTicTacToeGame,
+    chosen: tuple[tuple[int, int, int, int], int, str] | None,
+) -> None:
     if chosen is None:
         game.status = "finished"
         game.winner = "D"
@@ -181,6 +205,12 @@ def _execute_bot_turn_if_needed(db: Session, game: UltimateTicTacToeGame) -> Non
     _apply_recorded_move(db, game, game.bot_symbol, None, chosen_move, chosen_value, move_source=chosen_source)
 
 
+def _execute_bot_turn_if_needed(db: Session, game: UltimateTicTacToeGame) -> None:
+    request = _bot_move_request(game)
+    if request is not None:
+        _apply_bot_move(db, game, choose_bot_move(**request))
+
+
 def _generate_invite_code() -> str:
     return secrets.token_urlsafe(9).replace("-", "").replace("_", "")[:12]
 
@@ -421,8 +451,13 @@ def get_game(game_id: str, db: Session = Depends(get_db), current_user: User = D
 
 
 @router.post("/games/{game_id}/moves", response_model=GameRead)
-def make_move(game_id: str, payload: MoveCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    game = db.get(UltimateTicTacToeGame, game_id)
+async def make_move(
+    game_id: str,
+    payload: MoveCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    game = await db.get(UltimateTicTacToeGame, game_id)
     game = _ensure_game_access(game, current_user.id)
     if game.status != "active":
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Game is not active")
@@ -444,9 +479,13 @@ def make_move(game_id: str, payload: MoveCreate, db: Session = Depends(get_db),
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Value already used in this subgrid")
 
     _apply_recorded_move(db, game, symbol, current_user.id, candidate_move, payload.value)
-    _execute_bot_turn_if_needed(db, game)
+    request = _bot_move_request(game)
+    if request is not None:
+        # Only the CPU-bound policy call leaves the event loop; the session and game stay on it.
+        chosen = await run_in_threadpool(choose_bot_move, **request)
+        _apply_bot_move(db, game, chosen)
 
     db.add(game)
-    db.commit()
-    db.refresh(game)
-    return _serialize_game(db, game, current_user.id)
+    await db.commit()
+    await db.refresh(game)
+    return await _serialize_game_async(db, game, current_user.id)
@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -121,3 +121,67 @@ class GymBootstrapResponse(BaseModel):
     history: list[GymExerciseHistoryRead]
     muscle_targets: dict[str, dict[str, int]]
     day_settings: dict[str, str] = Field(default_factory=dict)
+
+
+class GymVolumeMuscle(BaseModel):
+    muscle: str
+    direct_sets: int = 0
+    indirect_sets: int = 0
+    effective_sets: float = 0.0
+    target_low: int | None = None
+    target_high: int | None = None
+    status: Literal["below", "within", "above"] | None = None
+
+
+class GymVolumeWeek(BaseModel):
+    week_start: date
+    muscles: list[GymVolumeMuscle] = Field(default_factory=list)
+
+
+class GymVolumeTarget(BaseModel):
+    muscle: str
+    labels: list[str] = Field(default_factory=list)
+    low: int = 0
+    high: int = 0
+    average_sets: float = 0.0
+    weeks_on_target: int = 0
+
+
+class GymVolumeResponse(BaseModel):
+    start: date
+    end: date
+    weeks: list[GymVolumeWeek] = Field(default_factory=list)
+    targets: list[GymVolumeTarget] = Field(default_factory=list)
+
+
+class GymExerciseRecords(BaseModel):
+    sessions: int = 0
+    first_on: date | None = None
+    last_on: date | None = None
+    best_e1rm: float | None = None
+    best_e1rm_on: date | None = None
+    best_weight: float | None = None
+    best_weight_reps: int | None = None
+    best_weight_on: date | None = None
+    max_reps: int = 0
+    max_reps_on: date | None = None
+    max_volume: float = 0.0
+    max_volume_on: date | None = None
+
+
+class GymTrendPoint(BaseModel):
+    period_start: date
+    sessions: int = 0
+    sets: int = 0
+    volume: float = 0.0
+    max_reps: int = 0
+    best_weight: float | None = None
+    best_e1rm: float | None = None
+    e1rm_pr: bool = False
+
+
+class GymExerciseTrendResponse(BaseModel):
+    exercise_id: str
+    resolution: Literal["day", "week", "month"]
+    records: GymExerciseRecords
+    points: list[GymTrendPoint] = Field(default_factory=list)
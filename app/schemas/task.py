@@ -169,6 +169,10 @@ class ScheduleCommitRequest(BaseModel):
     plan: list[ScheduledTaskSlot]
 
 
+class ScheduleAutoPlanResponse(ScheduleCommitRequest):
+    unscheduled: list[str] = Field(default_factory=list)
+
+
 class ScheduleCommitResponse(BaseModel):
     message: str
     stored: bool = False
@@ -225,3 +229,84 @@ class TaskActionRequest(BaseModel):
 class TaskActionResponse(BaseModel):
     task: TaskTemplateRead
     history: TaskHistoryRead | None = None
+
+
+class TaskBulkActionItem(TaskActionRequest):
+    task_id: str
+
+
+class TaskBulkActionRequest(BaseModel):
+    actions: list[TaskBulkActionItem] = Field(default_factory=list, max_length=500)
+
+
+class TaskBulkActionResult(BaseModel):
+    task_id: str
+    ok: bool
+    error: str | None = None
+    task: TaskTemplateRead | None = None
+    history: TaskHistoryRead | None = None
+
+
+class TaskBulkActionResponse(BaseModel):
+    results: list[TaskBulkActionResult] = Field(default_factory=list)
+
+
+class TaskStatsSummary(BaseModel):
+    completed: int = 0
+    progress: int = 0
+    skipped: int = 0
+    minutes: int = 0
+    active_days: int = 0
+    eligible_days: int = 0
+    completion_rate: float = 0.0
+    current_streak: int = 0
+    longest_streak: int = 0
+
+
+class TaskStatsEntry(TaskStatsSummary):
+    task_id: str
+    title: str
+    category: TaskCategory
+
+
+class TaskCategoryStats(TaskStatsSummary):
+    category: TaskCategory
+
+
+class TaskWeeklyRollup(BaseModel):
+    week_start: date
+    completed: int = 0
+    progress: int = 0
+    skipped: int = 0
+    minutes: int = 0
+    active_days: int = 0
+
+
+class TaskStatsResponse(BaseModel):
+    start: date
+    end: date
+    tasks: list[TaskStatsEntry] = Field(default_factory=list)
+    categories: list[TaskCategoryStats] = Field(default_factory=list)
+    weeks: list[TaskWeeklyRollup] = Field(default_factory=list)
+
+
+class TaskDownstreamItem(BaseModel):
+    task_id: str
+    title: str
+    trigger_task_id: str
+    trigger_after_days: int = 0
+    depth: int
+    due_date: date | None = None
+    current_due_date: date | None = None
+    current_due_projected: bool = False
+
+
+class TaskDownstreamResponse(BaseModel):
+    task_id: str
+    completed_on: date
+    in_cycle: bool = False
+    tasks: list[TaskDownstreamItem] = Field(default_factory=list)
+
+
+class CalendarFeedLink(BaseModel):
+    url: str
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+
+from ..core.config import get_settings
+from ..core.metrics import register_collector
+from ..core.ttl_cache import VersionedTTLCache, cache_collector
+from ..schemas.task import PlannerDay, PlannerTaskCard
+
+_PRODID = "-//ayux//common-backend tasks//EN"
+
+
+def feed_etag(user_id: str, version: int, start_date: date, days: int) -> str:
+    # The body is a pure function of the task data version and the rolling horizon, so this tag is strong.
+    digest = hashlib.sha1(f"{user_id}:{version}:{start_date.isoformat()}:{days}".encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def feed_today() -> date:
+    # Slots and tasks_changed_at are stored as naive UTC, so the feed's horizon starts on the UTC date too.
+    return datetime.now(UTC).date()
+
+
+def feed_last_modified(changed_at: datetime | None, start_date: date) -> datetime:
+    """Later of the last task write (naive UTC) and UTC midnight of start_date, as an aware UTC datetime."""
+    # The horizon rolls forward at midnight, which changes the feed even without a write.
+    rolled_at = datetime.combine(start_date, datetime.min.time(), tzinfo=UTC)
+    if changed_at is None:
+        return rolled_at
+    changed_at = changed_at.replace(tzinfo=UTC) if changed_at.tzinfo is None else changed_at.astimezone(UTC)
+    return max(changed_at, rolled_at).replace(microsecond=0)
+
+
+def format_http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def is_not_modified(if_none_match: str | None, if_modified_since: str | None, etag: str, last_modified: datetime) -> bool:
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return last_modified <= since
+    return False
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    # RFC 5545 limits content lines to 75 octets; continuation lines start with a single space.
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts: list[str] = []
+    current = b""
+    for char in line:
+        piece = char.encode("utf-8")
+        if len(current) + len(piece) > (75 if not parts else 74):
+            parts.append(current.decode("utf-8"))
+            current = b""
+        current += piece
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def _event_lines(card: PlannerTaskCard, day: date, stamp: str) -> list[str]:
+    lines = ["BEGIN:VEVENT", f"UID:{card.id}@common-backend", f"DTSTAMP:{stamp}"]
+    if card.scheduled_time:
+        hours, minutes = (int(part) for part in card.scheduled_time.split(":")[:2])
+        start = datetime.combine(day, datetime.min.time()).replace(hour=hours, minute=minutes)
+        end = start + timedelta(minutes=max(card.duration, 1))
+        # Slot times are UTC; a floating time would be read in each client's own zone.
+        lines.append(f"DTSTART:{start.strftime('%Y%m%dT%H%M%SZ')}")
+        lines.append(f"DTEND:{end.strftime('%Y%m%dT%H%M%SZ')}")
+    else:
+        lines.append(f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}")
+        lines.append(f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}")
+    summary = card.title if card.status != "overdue" else f"{card.title} (overdue)"
+    lines.append(f"SUMMARY:{_escape(summary)}")
+    details = [card.priority_label, f"{card.duration} min"]
+    if card.description:
+        details.append(card.description)
+    lines.append(f"DESCRIPTION:{_escape(chr(10).join(details))}")
+    lines.append(f"CATEGORIES:{_escape(card.category)}")
+    lines.append("TRANSP:TRANSPARENT")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_planner_ics(days: Iterable[PlannerDay], last_modified: datetime) -> str:
+    stamp = last_modified.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Tasks",
+    ]
+    for day in days:
+        for card in day.tasks:
+            lines.extend(_event_lines(card, day.date, stamp))
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+class CalendarFeedCache(VersionedTTLCache[str, tuple[str, str]]):
+    """Last rendered (etag, body) per user; entries do not expire since the ETag already tracks the data."""
+
+    def get(self, user_id: str, etag: str) -> str | None:
+        # The ETag covers the data version and horizon, so a matching tag means the body is still current.
+        entry = super().get(user_id, match=lambda cached: cached[0] == etag)
+        return None if entry is None else entry[1]
+
+    def put(self, user_id: str, etag: str, body: str) -> None:
+        super().put(user_id, (etag, body))
+
+
+calendar_feed_cache = CalendarFeedCache(get_settings().calendar_feed_cache_max_entries)
+
+register_collector(
+    cache_collector(
+        calendar_feed_cache,
+        "tasks_calendar_feed_cache",
+        "Calendar feeds served from cache.",
+        "Calendar feeds rendered from the database.",
+        "Rendered calendar feeds currently cached.",
+    )
+)
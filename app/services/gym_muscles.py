@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+
+MUSCLE_SYNONYMS = {
+    "shoulders": ("delt", "shoulder"),
+    "chest": ("pec", "chest"),
+    "quads": ("quad",),
+    "hamstrings": ("hamstring",),
+    "glutes": ("glute",),
+    "abs": ("ab", "core"),
+    "lats": ("lat",),
+    "traps": ("trap",),
+    "biceps": ("bicep", "biceps", "bi"),
+    "triceps": ("tricep", "triceps", "tri"),
+    "calves": ("calf", "gastrocnemius", "soleus"),
+    "forearms": ("forearm", "brach", "wrist flexor", "wrist extensor"),
+    "upper back": ("upper back", "upperback", "mid back", "midback"),
+    "lower back": ("lower back", "lowerback", "lumbar"),
+    "full body": ("full body", "fullbody", "total body"),
+}
+
+
+@lru_cache(maxsize=4096)
+def _normalize_text(text: str) -> str:
+    for canonical, tokens in MUSCLE_SYNONYMS.items():
+        if any(token in text for token in tokens):
+            return canonical
+    return text
+
+
+def normalize_muscle(value: str | None) -> str:
+    if not value:
+        return ""
+    text = value.strip().lower()
+    if not text:
+        return ""
+    return _normalize_text(text)
+
+
+def muscle_tokens(primary_muscle: str | None, secondary_muscle: str | None, muscle_groups: Iterable[str] | None) -> list[str]:
+    """Normalized muscle tokens for an exercise, stored on GymExercise.muscle_tokens at write time."""
+    tokens: set[str] = set()
+    for source in [primary_muscle, secondary_muscle, *(muscle_groups or [])]:
+        normalized = normalize_muscle(source)
+        if normalized:
+            tokens.add(normalized)
+    return sorted(tokens)
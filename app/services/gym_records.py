@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+import re
+import uuid
+
+from sqlalchemy import Numeric, and_, case, cast, delete, func, or_
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert_insert
+from ..models.gym import GymExerciseDailyRecord, GymExerciseHistory
+from ..schemas.gym import GymExerciseRecords, GymExerciseTrendResponse, GymTrendPoint
+
+_WEIGHT_RE = re.compile(r"-?\d+(?:[.,]\d+)?")
+
+
+def parse_weight(value) -> float | None:
+    """Numeric load of a set; strings like "60kg" or "22.5 lb" use their leading number, "BW" and blanks have none."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    match = _WEIGHT_RE.search(str(value))
+    if not match:
+        return None
+    weight = float(match.group(0).replace(",", "."))
+    return weight if weight > 0 else None
+
+
+def estimate_1rm(weight: float, reps: int) -> float:
+    # Epley; a single is its own 1RM.
+    if reps <= 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def record_day(recorded_at: datetime) -> date:
+    if recorded_at.tzinfo is not None:
+        recorded_at = recorded_at.astimezone(UTC)
+    return recorded_at.date()
+
+
+class DayRecord:
+    """Bests and totals of one exercise on one day; merging two is max/sum, so sessions fold in one at a time."""
+
+    __slots__ = ("sessions", "sets", "volume", "max_reps", "best_weight", "best_weight_reps", "best_e1rm")
+
+    def __init__(self) -> None:
+        self.sessions = self.sets = self.max_reps = 0
+        self.volume = 0.0
+        self.best_weight: float | None = None
+        self.best_weight_reps: int | None = None
+        self.best_e1rm: float | None = None
+
+    def add_session(self, sets: Iterable | None) -> None:
+        self.sessions += 1
+        for entry in sets or []:
+            raw_reps = entry.get("reps") if isinstance(entry, dict) else getattr(entry, "reps", None)
+            raw_weight = entry.get("weight") if isinstance(entry, dict) else getattr(entry, "weight", None)
+            try:
+                reps = int(raw_reps)
+            except (TypeError, ValueError):
+                continue
+            if reps <= 0:
+                continue
+            self.sets += 1
+            self.max_reps = max(self.max_reps, reps)
+            weight = parse_weight(raw_weight)
+            if weight is None:
+                continue
+            self.volume += weight * reps
+            if self.best_weight is None or (weight, reps) > (self.best_weight, self.best_weight_reps or 0):
+                self.best_weight, self.best_weight_reps = weight, reps
+            e1rm = estimate_1rm(weight, reps)
+            if self.best_e1rm is None or e1rm > self.best_e1rm:
+                self.best_e1rm = e1rm
+
+    def as_row(self, user_id: str, exercise_id: str, day: date) -> dict:
+        return {
+            "user_id": user_id,
+            "exercise_id": exercise_id,
+            "day": day,
+            "sessions": self.sessions,
+            "sets": self.sets,
+            "volume": round(self.volume, 2),
+            "max_reps": self.max_reps,
+            "best_weight": self.best_weight,
+            "best_weight_reps": self.best_weight_reps,
+            "best_e1rm": round(self.best_e1rm, 2) if self.best_e1rm is not None else None,
+        }
+
+
+def summarize_days(entries: Iterable[tuple[datetime, Iterable | None]]) -> dict[date, DayRecord]:
+    days: dict[date, DayRecord] = {}
+    for recorded_at, sets in entries:
+        days.setdefault(record_day(recorded_at), DayRecord()).add_session(sets)
+    return days
+
+
+def _merge_days(db: Session, user_id: str, exercise_id: str, days: dict[date, DayRecord]) -> None:
+    """Insert day records, merging into rows already stored for the same day: totals add up and bests keep the max.
+
+    The merge runs in SQL under the (exercise_id, day) key, so concurrent writes to one day both land instead of
+    one failing on the unique constraint.
+    """
+    if not days:
+        return
+    statement = upsert_insert(db, GymExerciseDailyRecord).values(
+        [{"id": str(uuid.uuid4()), **summary.as_row(user_id, exercise_id, day)} for day, summary in days.items()]
+    )
+    row, new = GymExerciseDailyRecord, statement.excluded
+    heavier = and_(
+        new.best_weight.is_not(None),
+        or_(
+            row.best_weight.is_(None),
+            new.best_weight > row.best_weight,
+            and_(new.best_weight == row.best_weight, func.coalesce(new.best_weight_reps, 0) > func.coalesce(row.best_weight_reps, 0)),
+        ),
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[row.exercise_id, row.day],
+            set_={
+                "sessions": row.sessions + new.sessions,
+                "sets": row.sets + new.sets,
+                "volume": func.round(cast(row.volume + new.volume, Numeric), 2),
+                "max_reps": case((new.max_reps > row.max_reps, new.max_reps), else_=row.max_reps),
+                "best_weight": case((heavier, new.best_weight), else_=row.best_weight),
+                "best_weight_reps": case((heavier, new.best_weight_reps), else_=row.best_weight_reps),
+                "best_e1rm": case(
+                    (and_(new.best_e1rm.is_not(None), or_(row.best_e1rm.is_(None), new.best_e1rm > row.best_e1rm)), new.best_e1rm),
+                    else_=row.best_e1rm,
+                ),
+            },
+        )
+    )
+
+
+def add_record_entries(db: Session, user_id: str, exercise_id: str, entries: Iterable[GymExerciseHistory]) -> None:
+    """Fold new history entries of one exercise into its daily records; the caller commits."""
+    _merge_days(db, user_id, exercise_id, summarize_days((entry.recorded_at, entry.sets) for entry in entries))
+
+
+def remove_record_entries(db: Session, user_id: str, exercise_id: str, entries: Iterable[GymExerciseHistory]) -> None:
+    """Recompute the days of removed history entries from what is left of them; the caller commits.
+
+    Bests cannot be subtracted, so each touched day is rebuilt from its remaining sessions, which the
+    (user_id, exercise_id, recorded_at) index serves directly.
+    """
+    removed = list(entries)
+    touched = {record_day(entry.recorded_at) for entry in removed}
+    if not touched:
+        return
+    db.flush()
+    removed_ids = {entry.id for entry in removed}
+    remaining = (
+        db.query(GymExerciseHistory.id, GymExerciseHistory.recorded_at, GymExerciseHistory.sets)
+        .filter(
+            GymExerciseHistory.user_id == user_id,
+            GymExerciseHistory.exercise_id == exercise_id,
+            GymExerciseHistory.recorded_at >= datetime.combine(min(touched), datetime.min.time()) - timedelta(days=1),
+            GymExerciseHistory.recorded_at < datetime.combine(max(touched), datetime.min.time()) + timedelta(days=2),
+        )
+        .all()
+    )
+    days = summarize_days(
+        (recorded_at, sets)
+        for history_id, recorded_at, sets in remaining
+        if history_id not in removed_ids and record_day(recorded_at) in touched
+    )
+    db.execute(
+        delete(GymExerciseDailyRecord).where(
+            GymExerciseDailyRecord.exercise_id == exercise_id,
+            GymExerciseDailyRecord.day.in_(list(touched)),
+        )
+    )
+    # A concurrent write may have logged to one of these days since; merging keeps its session too.
+    _merge_days(db, user_id, exercise_id, days)
+
+
+def _period_start(day: date, resolution: str) -> date:
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    return day
+
+
+def build_trend(
+    exercise_id: str,
+    rows: Iterable[GymExerciseDailyRecord],
+    resolution: str,
+    start_date: date | None,
+    end_date: date | None,
+) -> GymExerciseTrendResponse:
+    """All-time records plus one point per period between start_date and end_date from daily record rows."""
+    records = GymExerciseRecords()
+    points: dict[date, GymTrendPoint] = {}
+    running_best: float | None = None
+    for row in sorted(rows, key=lambda item: item.day):
+        records.sessions += row.sessions
+        records.first_on = records.first_on or row.day
+        records.last_on = row.day
+        is_e1rm_pr = row.best_e1rm is not None and (running_best is None or row.best_e1rm > running_best)
+        if is_e1rm_pr:
+            running_best = records.best_e1rm = row.best_e1rm
+            records.best_e1rm_on = row.day
+        if row.best_weight is not None and (records.best_weight is None or row.best_weight > records.best_weight):
+            records.best_weight, records.best_weight_reps, records.best_weight_on = row.best_weight, row.best_weight_reps, row.day
+        if row.max_reps > records.max_reps:
+            records.max_reps, records.max_reps_on = row.max_reps, row.day
+        if row.volume > records.max_volume:
+            records.max_volume, records.max_volume_on = row.volume, row.day
+
+        if (start_date and row.day < start_date) or (end_date and row.day > end_date):
+            continue
+        period = _period_start(row.day, resolution)
+        point = points.get(period)
+        if point is None:
+            point = points[period] = GymTrendPoint(period_start=period)
+        point.sessions += row.sessions
+        point.sets += row.sets
+        point.volume = round(point.volume + row.volume, 2)
+        point.max_reps = max(point.max_reps, row.max_reps)
+        if row.best_weight is not None and (point.best_weight is None or row.best_weight > point.best_weight):
+            point.best_weight = row.best_weight
+        if row.best_e1rm is not None and (point.best_e1rm is None or row.best_e1rm > point.best_e1rm):
+            point.best_e1rm = row.best_e1rm
+        point.e1rm_pr = point.e1rm_pr or is_e1rm_pr
+
+    return GymExerciseTrendResponse(
+        exercise_id=exercise_id,
+        resolution=resolution,
+        records=records,
+        points=[points[period] for period in sorted(points)],
+    )
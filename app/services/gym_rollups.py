@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models.gym import GymExercise, GymExerciseDailyRecord, GymExerciseHistory, GymWeeklyVolume
+from ..models.user import User
+from .gym_muscles import muscle_tokens, normalize_muscle
+from .gym_records import add_record_entries, remove_record_entries, summarize_days
+from .gym_volume import add_volume_deltas, apply_volume_deltas
+
+# Bump when a rollup table is added or its derivation changes; each user's rollups are then rebuilt once.
+GYM_ROLLUP_VERSION = 2
+
+
+def exercise_muscles(exercise: GymExercise) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """(direct, indirect) muscles an exercise's sets count toward."""
+    tokens = exercise.muscle_tokens
+    if tokens is None:
+        tokens = muscle_tokens(exercise.primary_muscle, exercise.secondary_muscle, exercise.muscle_groups)
+    primary = normalize_muscle(exercise.primary_muscle)
+    if not primary:
+        return tuple(tokens), ()
+    return (primary,), tuple(token for token in tokens if token != primary)
+
+
+def add_history_rollups(db: Session, user_id: str, exercise: GymExercise, entries: Iterable[GymExerciseHistory]) -> None:
+    """Fold new history entries of one exercise into every rollup; the caller commits."""
+    entries = list(entries)
+    deltas = add_volume_deltas({}, ((entry.recorded_at, entry.sets) for entry in entries), exercise_muscles(exercise))
+    apply_volume_deltas(db, user_id, deltas)
+    add_record_entries(db, user_id, exercise.id, entries)
+
+
+def remove_history_rollups(db: Session, user_id: str, exercise: GymExercise, entries: Iterable[GymExerciseHistory]) -> None:
+    """Take history entries of one exercise that are about to be deleted out of every rollup; the caller commits."""
+    entries = list(entries)
+    deltas = add_volume_deltas({}, ((entry.recorded_at, entry.sets) for entry in entries), exercise_muscles(exercise), sign=-1)
+    apply_volume_deltas(db, user_id, deltas)
+    remove_record_entries(db, user_id, exercise.id, entries)
+
+
+def move_history_volume(
+    db: Session,
+    user_id: str,
+    entries: Iterable[GymExerciseHistory],
+    previous: tuple[tuple[str, ...], tuple[str, ...]],
+    current: tuple[tuple[str, ...], tuple[str, ...]],
+) -> None:
+    """Re-attribute an exercise's logged sets after its muscles changed; per-exercise records are unaffected."""
+    pairs = [(entry.recorded_at, entry.sets) for entry in entries]
+    deltas = add_volume_deltas({}, pairs, previous, sign=-1)
+    apply_volume_deltas(db, user_id, add_volume_deltas(deltas, pairs, current))
+
+
+def rebuild_gym_rollups(db: Session, user_id: str) -> None:
+    """Recompute every rollup of one user from history and record the rollup version; the caller commits."""
+    exercises = db.query(
+        GymExercise.id,
+        GymExercise.primary_muscle,
+        GymExercise.secondary_muscle,
+        GymExercise.muscle_groups,
+        GymExercise.muscle_tokens,
+    ).filter(GymExercise.user_id == user_id)
+    muscles: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+    for exercise in exercises:
+        muscles[exercise.id] = exercise_muscles(exercise)
+
+    entries: dict[str, list] = {}
+    history = db.query(GymExerciseHistory.exercise_id, GymExerciseHistory.recorded_at, GymExerciseHistory.sets).filter(
+        GymExerciseHistory.user_id == user_id
+    )
+    for exercise_id, recorded_at, sets in history:
+        entries.setdefault(exercise_id, []).append((recorded_at, sets))
+
+    deltas: dict = {}
+    record_rows: list[dict] = []
+    for exercise_id, exercise_entries in entries.items():
+        if exercise_id not in muscles:
+            continue
+        add_volume_deltas(deltas, exercise_entries, muscles[exercise_id])
+        record_rows.extend(summary.as_row(user_id, exercise_id, day) for day, summary in summarize_days(exercise_entries).items())
+
+    db.execute(delete(GymWeeklyVolume).where(GymWeeklyVolume.user_id == user_id))
+    volume_rows = [
+        {"user_id": user_id, "week_start": week, "muscle": muscle, "direct_sets": direct_sets, "indirect_sets": indirect_sets}
+        for (week, muscle), (direct_sets, indirect_sets) in deltas.items()
+        if direct_sets or indirect_sets
+    ]
+    if volume_rows:
+        db.execute(insert(GymWeeklyVolume), volume_rows)
+    db.execute(delete(GymExerciseDailyRecord).where(GymExerciseDailyRecord.user_id == user_id))
+    if record_rows:
+        db.execute(insert(GymExerciseDailyRecord), record_rows)
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(gym_rollup_version=GYM_ROLLUP_VERSION, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def ensure_gym_rollups(db: Session, user_id: str) -> None:
+    """Rebuild and commit a user's rollups when they predate GYM_ROLLUP_VERSION, so read endpoints may write."""
+    # Checked on the row: a cached session user can still carry the version from before a rebuild.
+    is_current = db.query(User.id).filter(User.id == user_id, User.gym_rollup_version >= GYM_ROLLUP_VERSION).first()
+    if is_current:
+        return
+    # Concurrent first reads queue on the users row; whoever gets it second finds the rebuild done.
+    version = db.query(User.gym_rollup_version).filter(User.id == user_id).with_for_update().scalar()
+    if version is not None and version >= GYM_ROLLUP_VERSION:
+        db.commit()
+        return
+    rebuild_gym_rollups(db, user_id)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild materialized gym rollups from history.")
+    parser.add_argument("--user-id", action="append", help="Only rebuild these users; repeatable. Defaults to every user.")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        user_ids = args.user_id or [user_id for (user_id,) in db.query(User.id).order_by(User.id)]
+        for user_id in user_ids:
+            rebuild_gym_rollups(db, user_id)
+            db.commit()
+            print(f"rebuilt gym rollups for {user_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime
 import hashlib
 
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from ..core.database import SessionLocal
 from ..data.gym_defaults import DEFAULT_EXERCISES, DEFAULT_MUSCLE_TARGETS, DEFAULT_NOTES, WEEK_TEMPLATE
 from ..models.gym import GymExercise, GymExerciseHistory
+from ..models.user import User
+from .gym_muscles import muscle_tokens
+from .gym_rollups import remove_history_rollups
+from .gym_substitutes import substitute_index_cache
+
+# Bump when the seeded library or the seed cleanup changes; each user then reruns the work once.
+GYM_SEED_VERSION = 1
 
 
 def _build_assignment_metadata(day_key: str, config: dict) -> dict:
@@ -31,6 +40,44 @@ def _scoped_exercise_id(user_id: str, exercise_id: str) -> str:
     return f"u{digest}_{exercise_id}"[:64]
 
 
+def _template_exercise_row(exercise_id: str, payload: dict) -> dict:
+    return {
+        "name": payload["name"],
+        "equipment": payload.get("equipment"),
+        "primary_muscle": payload.get("primary_muscle"),
+        "secondary_muscle": payload.get("secondary_muscle"),
+        "muscle_groups": payload.get("muscle_groups", []),
+        "muscle_tokens": muscle_tokens(payload.get("primary_muscle"), payload.get("secondary_muscle"), payload.get("muscle_groups")),
+        "rest_seconds": payload.get("rest_seconds"),
+        "target_notes": payload.get("target_notes"),
+        "cues": payload.get("cues", []),
+        "mistakes": payload.get("mistakes", []),
+        "swap_suggestions": payload.get("swap_suggestions", []),
+        "extra_metadata": {
+            "notes": DEFAULT_NOTES.get(exercise_id, ""),
+            "last_performed_on": None,
+            "cardio": payload.get("metadata", {}).get("cardio", False),
+            "day_key": payload.get("metadata", {}).get("day_key"),
+            "template_key": exercise_id,
+        },
+        "is_active": True,
+    }
+
+
+# Built once at import; seeding a user only fills in the scoped id, user_id and timestamps.
+_TEMPLATE_ROWS: tuple[tuple[str, dict], ...] = tuple(
+    (exercise_id, _template_exercise_row(exercise_id, payload)) for exercise_id, payload in DEFAULT_EXERCISES.items()
+)
+
+
+def _seed_rows(user_id: str) -> list[dict]:
+    now = datetime.utcnow()
+    return [
+        {**row, "id": _scoped_exercise_id(user_id, exercise_id), "user_id": user_id, "created_at": now, "updated_at": now}
+        for exercise_id, row in _TEMPLATE_ROWS
+    ]
+
+
 def _cleanup_seeded_gym_history(db: Session, user_id: str) -> None:
     history_entries = (
         db.query(GymExerciseHistory)
@@ -41,6 +88,7 @@ def _cleanup_seeded_gym_history(db: Session, user_id: str) -> None:
 
     if seeded_entries:
         for entry in seeded_entries:
+            remove_history_rollups(db, user_id, entry.exercise, [entry])
             db.delete(entry)
         db.flush()
 
@@ -67,41 +115,30 @@ def _cleanup_seeded_gym_history(db: Session, user_id: str) -> None:
         db.commit()
 
 
+def _mark_seeded(db: Session, user_id: str) -> None:
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(gym_seed_version=GYM_SEED_VERSION, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
 def ensure_user_gym_defaults(db: Session, user_id: str) -> None:
+    is_current = db.query(User.id).filter(User.id == user_id, User.gym_seed_version >= GYM_SEED_VERSION).first()
+    if is_current:
+        return
+
     has_exercises = db.query(GymExercise.id).filter(GymExercise.user_id == user_id).first()
     if has_exercises:
         _cleanup_seeded_gym_history(db, user_id)
+        _mark_seeded(db, user_id)
         return
 
-    scoped_ids: dict[str, str] = {}
-    for exercise_id, payload in DEFAULT_EXERCISES.items():
-        scoped_id = _scoped_exercise_id(user_id, exercise_id)
-        scoped_ids[exercise_id] = scoped_id
-        exercise = GymExercise(
-            id=scoped_id,
-            user_id=user_id,
-            name=payload["name"],
-            equipment=payload.get("equipment"),
-            primary_muscle=payload.get("primary_muscle"),
-            secondary_muscle=payload.get("secondary_muscle"),
-            muscle_groups=payload.get("muscle_groups", []),
-            rest_seconds=payload.get("rest_seconds"),
-            target_notes=payload.get("target_notes"),
-            cues=payload.get("cues", []),
-            mistakes=payload.get("mistakes", []),
-            swap_suggestions=payload.get("swap_suggestions", []),
-            extra_metadata={
-                "notes": DEFAULT_NOTES.get(exercise_id, ""),
-                "last_performed_on": None,
-                "cardio": payload.get("metadata", {}).get("cardio", False),
-                "day_key": payload.get("metadata", {}).get("day_key"),
-                "template_key": exercise_id,
-            },
-        )
-        db.add(exercise)
-    db.flush()
-
-    db.commit()
+    db.execute(insert(GymExercise), _seed_rows(user_id))
+    _mark_seeded(db, user_id)
+    substitute_index_cache.invalidate(user_id)
 
 
 def _seed_exercises(db: Session) -> None:
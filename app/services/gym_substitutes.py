@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from ..core.config import get_settings
+from ..core.metrics import register_collector
+from ..core.ttl_cache import VersionedTTLCache, cache_collector
+from .gym_muscles import muscle_tokens, normalize_muscle
+
+
+@dataclass(frozen=True, slots=True)
+class SubstituteCandidate:
+    id: str
+    sort_name: str
+    primary: str
+    secondary: str
+    position: int
+
+
+@dataclass(frozen=True, slots=True)
+class SubstituteIndex:
+    # Active exercises only, keyed by id; `position` keeps the library's name order for ties.
+    candidates: dict[str, SubstituteCandidate]
+    # Normalized muscle token -> ids of the active exercises that work it.
+    by_token: dict[str, tuple[str, ...]]
+
+    def rank(self, reference_id: str, reference_primary: str | None, reference_secondary: str | None, target_tokens: set[str]) -> list[str]:
+        """Active exercises sharing a target token with the slot, closest muscle match first.
+
+        Only the posting lists of the target tokens are visited, so the cost follows the number of
+        matching exercises rather than the size of the library.
+        """
+        if target_tokens:
+            matched: set[str] = set()
+            for token in target_tokens:
+                matched.update(self.by_token.get(token, ()))
+            if reference_id in self.candidates:
+                matched.add(reference_id)
+            pool: Iterable[SubstituteCandidate] = (self.candidates[candidate_id] for candidate_id in matched)
+        else:
+            pool = self.candidates.values()
+
+        ref_primary = normalize_muscle(reference_primary)
+        ref_secondary = normalize_muscle(reference_secondary)
+        ranked: list[tuple[float, str, int, str]] = []
+        for candidate in pool:
+            if candidate.id == reference_id:
+                score = 0.0
+            elif candidate.primary == ref_primary:
+                score = 1.0
+            elif candidate.secondary == ref_primary:
+                score = 1.5
+            elif ref_secondary and (candidate.primary == ref_secondary or candidate.secondary == ref_secondary):
+                score = 2.0
+            else:
+                score = 3.0
+            ranked.append((score, candidate.sort_name, candidate.position, candidate.id))
+        ranked.sort()
+        return [item[3] for item in ranked]
+
+
+def build_substitute_index(
+    exercises: Iterable[tuple[str, str, str | None, str | None, list[str] | None, list[str] | None]],
+) -> SubstituteIndex:
+    """Build the index from (id, name, primary_muscle, secondary_muscle, muscle_groups, muscle_tokens)
+    rows of one user's active exercises, in name order."""
+    candidates: dict[str, SubstituteCandidate] = {}
+    by_token: dict[str, list[str]] = {}
+    for position, (exercise_id, name, primary, secondary, groups, tokens) in enumerate(exercises):
+        candidates[exercise_id] = SubstituteCandidate(
+            id=exercise_id,
+            sort_name=(name or "").lower(),
+            primary=normalize_muscle(primary),
+            secondary=normalize_muscle(secondary),
+            position=position,
+        )
+        # Rows from before muscle_tokens existed are tokenized here without writing them back.
+        for token in tokens if tokens is not None else muscle_tokens(primary, secondary, groups):
+            by_token.setdefault(token, []).append(exercise_id)
+    return SubstituteIndex(
+        candidates=candidates,
+        by_token={token: tuple(ids) for token, ids in by_token.items()},
+    )
+
+
+_settings = get_settings()
+# One index per user, dropped by substitute_index_cache.invalidate(user_id) on every exercise write.
+substitute_index_cache: VersionedTTLCache[str, SubstituteIndex] = VersionedTTLCache(
+    _settings.substitute_index_max_entries, _settings.substitute_index_ttl_seconds
+)
+
+register_collector(
+    cache_collector(
+        substitute_index_cache,
+        "gym_substitute_index_cache",
+        "Substitute indexes served from cache.",
+        "Substitute indexes built from the database.",
+        "Substitute indexes currently cached.",
+    )
+)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+import uuid
+
+from sqlalchemy import and_, case, delete, or_, update
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert_insert
+from ..models.gym import GymWeeklyVolume
+from ..schemas.gym import GymVolumeMuscle, GymVolumeResponse, GymVolumeTarget, GymVolumeWeek
+from .gym_muscles import normalize_muscle
+
+# Sets that only hit a muscle as a secondary or listed group count half toward its weekly target.
+INDIRECT_SET_WEIGHT = 0.5
+
+
+def count_sets(sets: Iterable | None) -> int:
+    """Working sets in a history entry's `sets` JSON; entries without positive reps are not counted."""
+    count = 0
+    for entry in sets or []:
+        reps = entry.get("reps") if isinstance(entry, dict) else getattr(entry, "reps", None)
+        try:
+            if int(reps) > 0:
+                count += 1
+        except (TypeError, ValueError):
+            continue
+    return count
+
+
+def week_start(recorded_at: datetime) -> date:
+    if recorded_at.tzinfo is not None:
+        recorded_at = recorded_at.astimezone(UTC)
+    day = recorded_at.date()
+    return day - timedelta(days=day.weekday())
+
+
+def add_volume_deltas(
+    deltas: dict[tuple[date, str], list[int]],
+    entries: Iterable[tuple[datetime, Iterable | None]],
+    muscles: tuple[tuple[str, ...], tuple[str, ...]],
+    sign: int = 1,
+) -> dict[tuple[date, str], list[int]]:
+    """Accumulate (recorded_at, sets) entries of one exercise into per (week, muscle) [direct, indirect] deltas."""
+    direct, indirect = muscles
+    if not direct and not indirect:
+        return deltas
+    for recorded_at, sets in entries:
+        count = count_sets(sets) * sign
+        if not count:
+            continue
+        week = week_start(recorded_at)
+        for muscle in direct:
+            deltas.setdefault((week, muscle), [0, 0])[0] += count
+        for muscle in indirect:
+            deltas.setdefault((week, muscle), [0, 0])[1] += count
+    return deltas
+
+
+def _clamped(count):
+    return case((count < 0, 0), else_=count)
+
+
+def apply_volume_deltas(db: Session, user_id: str, deltas: dict[tuple[date, str], list[int]]) -> None:
+    """Fold deltas into gym_weekly_volume; the caller commits them with the history write.
+
+    The sums happen in SQL under the (user_id, week_start, muscle) key, so concurrent writes to the same
+    week add up instead of one failing on the unique constraint. Counts never drop below zero and rows
+    left with no sets are deleted.
+    """
+    deltas = {key: counts for key, counts in deltas.items() if counts[0] or counts[1]}
+    if not deltas:
+        return
+    statement = upsert_insert(db, GymWeeklyVolume).values(
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "week_start": week,
+                "muscle": muscle,
+                "direct_sets": direct_sets,
+                "indirect_sets": indirect_sets,
+            }
+            for (week, muscle), (direct_sets, indirect_sets) in deltas.items()
+        ]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[GymWeeklyVolume.user_id, GymWeeklyVolume.week_start, GymWeeklyVolume.muscle],
+            set_={
+                name: _clamped(getattr(GymWeeklyVolume, name) + getattr(statement.excluded, name))
+                for name in ("direct_sets", "indirect_sets")
+            },
+        )
+    )
+    if all(direct_sets >= 0 and indirect_sets >= 0 for direct_sets, indirect_sets in deltas.values()):
+        return
+    # Updated rows are clamped above; a freshly inserted row can still hold a negative count when a
+    # removal had nothing to remove (the rollup predates the entry, and the next rebuild settles it).
+    weeks = [week for week, _ in deltas]
+    touched = and_(
+        GymWeeklyVolume.user_id == user_id,
+        GymWeeklyVolume.muscle.in_({muscle for _, muscle in deltas}),
+        GymWeeklyVolume.week_start >= min(weeks),
+        GymWeeklyVolume.week_start <= max(weeks),
+    )
+    db.execute(
+        delete(GymWeeklyVolume)
+        .where(touched, GymWeeklyVolume.direct_sets <= 0, GymWeeklyVolume.indirect_sets <= 0)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(GymWeeklyVolume)
+        .where(touched, or_(GymWeeklyVolume.direct_sets < 0, GymWeeklyVolume.indirect_sets < 0))
+        .values(direct_sets=_clamped(GymWeeklyVolume.direct_sets), indirect_sets=_clamped(GymWeeklyVolume.indirect_sets))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _resolve_targets(targets: dict[str, dict[str, int]] | None) -> dict[str, tuple[list[str], int, int]]:
+    # Labels that normalize to the same muscle (Shoulders, Side Delts, Rear Delts) share its volume, so their ranges add up.
+    resolved: dict[str, tuple[list[str], int, int]] = {}
+    for label, bounds in (targets or {}).items():
+        muscle = normalize_muscle(label)
+        if not muscle or not isinstance(bounds, dict):
+            continue
+        labels, low, high = resolved.get(muscle, ([], 0, 0))
+        resolved[muscle] = (
+            [*labels, label],
+            low + int(bounds.get("low") or 0),
+            high + int(bounds.get("high") or 0),
+        )
+    return resolved
+
+
+def _status(effective_sets: float, low: int | None, high: int | None) -> str | None:
+    if low is None:
+        return None
+    if effective_sets < low:
+        return "below"
+    if high and effective_sets > high:
+        return "above"
+    return "within"
+
+
+def build_volume_report(
+    rows: Iterable[tuple[date, str, int, int]],
+    targets: dict[str, dict[str, int]] | None,
+    first_week: date,
+    last_week: date,
+) -> GymVolumeResponse:
+    """Lay (week_start, muscle, direct_sets, indirect_sets) rollup rows out per week and compare them with targets."""
+    resolved = _resolve_targets(targets)
+    week_starts = [first_week + timedelta(weeks=offset) for offset in range((last_week - first_week).days // 7 + 1)]
+    volume: dict[date, dict[str, tuple[int, int]]] = {week: {} for week in week_starts}
+    for week, muscle, direct_sets, indirect_sets in rows:
+        if week in volume:
+            volume[week][muscle] = (direct_sets, indirect_sets)
+
+    muscles = sorted(set(resolved).union(*(week.keys() for week in volume.values())))
+    weeks: list[GymVolumeWeek] = []
+    totals = {muscle: 0.0 for muscle in resolved}
+    on_target = {muscle: 0 for muscle in resolved}
+    for week in week_starts:
+        entries: list[GymVolumeMuscle] = []
+        for muscle in muscles:
+            direct_sets, indirect_sets = volume[week].get(muscle, (0, 0))
+            target = resolved.get(muscle)
+            if target is None and not direct_sets and not indirect_sets:
+                continue
+            effective = direct_sets + indirect_sets * INDIRECT_SET_WEIGHT
+            low, high = (target[1], target[2]) if target else (None, None)
+            status = _status(effective, low, high)
+            if target:
+                totals[muscle] += effective
+                on_target[muscle] += status == "within"
+            entries.append(
+                GymVolumeMuscle(
+                    muscle=muscle,
+                    direct_sets=direct_sets,
+                    indirect_sets=indirect_sets,
+                    effective_sets=effective,
+                    target_low=low,
+                    target_high=high,
+                    status=status,
+                )
+            )
+        weeks.append(GymVolumeWeek(week_start=week, muscles=entries))
+
+    return GymVolumeResponse(
+        start=first_week,
+        end=last_week,
+        weeks=weeks,
+        targets=[
+            GymVolumeTarget(
+                muscle=muscle,
+                labels=labels,
+                low=low,
+                high=high,
+                average_sets=round(totals[muscle] / len(week_starts), 2),
+                weeks_on_target=on_target[muscle],
+            )
+            for muscle, (labels, low, high) in sorted(resolved.items())
+        ],
+    )
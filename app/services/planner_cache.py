@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import date
+
+from ..core.config import get_settings
+from ..core.metrics import register_collector
+from ..core.ttl_cache import VersionedTTLCache, cache_collector
+from ..schemas.task import PlannerResponse
+
+# Keyed by (user_id, start_date, days, today) and owned by the user, so one write drops all of their planners.
+_settings = get_settings()
+planner_cache: VersionedTTLCache[tuple[str, date, int, date], PlannerResponse] = VersionedTTLCache(
+    _settings.planner_cache_max_entries, _settings.planner_cache_ttl_seconds
+)
+
+register_collector(
+    cache_collector(
+        planner_cache,
+        "tasks_planner_cache",
+        "Planner responses served from cache.",
+        "Planner responses built from the database.",
+        "Planner responses currently cached.",
+    )
+)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from ..core.config import get_settings
+from ..core.metrics import register_collector
+from ..core.ttl_cache import VersionedTTLCache, cache_collector
+
+
+@dataclass(frozen=True, slots=True)
+class DependencyGraph:
+    # task_id -> (trigger_task_id, trigger_after_days) for every after_completion task with a trigger.
+    triggers: dict[str, tuple[str, int]]
+    dependents: dict[str, tuple[str, ...]]
+    # Chained tasks in trigger-before-dependent order; tasks on or behind a cycle are left out and listed in `cyclic`.
+    order: tuple[str, ...]
+    cyclic: frozenset[str]
+
+    def creates_cycle(self, task_id: str, trigger_task_id: str) -> bool:
+        current: str | None = trigger_task_id
+        seen: set[str] = set()
+        while current is not None and current not in seen:
+            if current == task_id:
+                return True
+            seen.add(current)
+            current = self.triggers.get(current, (None, 0))[0]
+        return False
+
+    def upstream(self, task_id: str) -> list[str]:
+        """The trigger chain above `task_id`, nearest first."""
+        chain: list[str] = []
+        current = self.triggers.get(task_id, (None, 0))[0]
+        while current is not None and current != task_id and current not in chain:
+            chain.append(current)
+            current = self.triggers.get(current, (None, 0))[0]
+        return chain
+
+    def downstream(self, task_id: str) -> list[tuple[str, int]]:
+        """Tasks unlocked by `task_id`, directly or through a chain, with their depth, breadth-first."""
+        found: list[tuple[str, int]] = []
+        seen = {task_id}
+        queue = deque([(task_id, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            for dependent in self.dependents.get(current, ()):
+                if dependent in seen:
+                    continue
+                seen.add(dependent)
+                found.append((dependent, depth + 1))
+                queue.append((dependent, depth + 1))
+        return found
+
+    def project_unlocks(self, task_id: str, completed_on: date) -> dict[str, date]:
+        """Due dates of the downstream chain if `task_id` is completed on `completed_on` and each
+        dependent is then done on its own due date."""
+        due: dict[str, date] = {task_id: completed_on}
+        for dependent, _ in self.downstream(task_id):
+            trigger_id, after_days = self.triggers[dependent]
+            if trigger_id in due:
+                due[dependent] = due[trigger_id] + timedelta(days=after_days)
+        del due[task_id]
+        return due
+
+    def project_due_dates(self, latest_done: dict[str, datetime], today: date) -> dict[str, tuple[date, bool]]:
+        """Due date per chained task as (date, projected).
+
+        A task whose trigger was completed after its own last completion is due for real, exactly
+        as the planner shows it. Otherwise, when its trigger is itself pending, the due date is
+        projected from the trigger's due date, level by level in topological order.
+        """
+        result: dict[str, tuple[date, bool]] = {}
+        next_done: dict[str, date] = {}
+        for task_id in self.order:
+            trigger_id, after_days = self.triggers[task_id]
+            task_done = latest_done.get(task_id)
+            trigger_done = latest_done.get(trigger_id)
+            if trigger_done is not None:
+                due_date = trigger_done.date() + timedelta(days=after_days)
+                if task_done is None or task_done.date() < due_date:
+                    result[task_id] = (due_date, False)
+                    next_done[task_id] = max(due_date, today)
+                    continue
+            trigger_next = next_done.get(trigger_id)
+            if trigger_next is not None:
+                due_date = trigger_next + timedelta(days=after_days)
+                result[task_id] = (due_date, True)
+                next_done[task_id] = max(due_date, today)
+        return result
+
+
+def dependency_trigger(recurrence: dict | None, metadata: dict | None) -> tuple[str, int] | None:
+    if ((recurrence or {}).get("mode") or "repeat") != "after_completion":
+        return None
+    meta = metadata or {}
+    trigger_task_id = meta.get("trigger_task_id")
+    if not trigger_task_id:
+        return None
+    return str(trigger_task_id), max(0, int(meta.get("trigger_after_days", 0) or 0))
+
+
+def build_dependency_graph(tasks: Iterable[tuple[str, dict | None, dict | None]]) -> DependencyGraph:
+    """Build the graph from (task_id, recurrence, metadata_json) rows of one user's templates."""
+    rows = list(tasks)
+    known = {task_id for task_id, _, _ in rows}
+    triggers: dict[str, tuple[str, int]] = {}
+    dependents: dict[str, list[str]] = {}
+    for task_id, recurrence, metadata in rows:
+        trigger = dependency_trigger(recurrence, metadata)
+        # Triggers pointing at deleted or archived templates can never fire.
+        if trigger is None or trigger[0] not in known:
+            continue
+        triggers[task_id] = trigger
+        dependents.setdefault(trigger[0], []).append(task_id)
+
+    # Kahn's algorithm over the chained tasks; whatever never reaches in-degree zero sits on or behind a cycle.
+    in_degree = {task_id: 1 for task_id in triggers}
+    queue = deque(trigger_id for trigger_id in dependents if trigger_id not in triggers)
+    order: list[str] = []
+    while queue:
+        current = queue.popleft()
+        for dependent in dependents.get(current, ()):
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                order.append(dependent)
+                queue.append(dependent)
+
+    return DependencyGraph(
+        triggers=triggers,
+        dependents={task_id: tuple(children) for task_id, children in dependents.items()},
+        order=tuple(order),
+        cyclic=frozenset(task_id for task_id, degree in in_degree.items() if degree > 0),
+    )
+
+
+_settings = get_settings()
+# One graph per user, dropped by dependency_cache.invalidate(user_id) on every template create, update or delete.
+dependency_cache: VersionedTTLCache[str, DependencyGraph] = VersionedTTLCache(
+    _settings.dependency_cache_max_entries, _settings.dependency_cache_ttl_seconds
+)
+
+register_collector(
+    cache_collector(
+        dependency_cache,
+        "tasks_dependency_cache",
+        "Dependency graphs served from cache.",
+        "Dependency graphs built from the database.",
+        "Dependency graphs currently cached.",
+    )
+)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+DAY_START_MINUTE = 7 * 60
+DAY_END_MINUTE = 22 * 60
+SLOT_STEP_MINUTES = 15
+
+_NAMED_WINDOWS = {"morning": (6 * 60, 12 * 60), "afternoon": (12 * 60, 17 * 60), "evening": (17 * 60, 22 * 60)}
+_WEEKDAY_PREFIXES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+@dataclass(frozen=True, slots=True)
+class WindowRule:
+    start: int
+    end: int
+    weekdays: frozenset[int] | None = None
+    on_date: date | None = None
+
+    def applies(self, day: date) -> bool:
+        if self.on_date is not None:
+            return self.on_date == day
+        return self.weekdays is None or day.weekday() in self.weekdays
+
+
+@dataclass(slots=True)
+class SchedulingTask:
+    task_id: str
+    duration_minutes: int
+    priority: str
+    earliest: date
+    latest: date
+    preferred: list[WindowRule] = field(default_factory=list)
+    busy: list[WindowRule] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    task_id: str
+    day: date
+    start_minute: int
+
+
+def _parse_clock(value) -> int | None:
+    if not value:
+        return None
+    try:
+        parts = [int(part) for part in str(value).split(":")[:2]]
+    except ValueError:
+        return None
+    hours, minutes = (parts + [0])[:2]
+    if not (0 <= hours <= 24 and 0 <= minutes < 60):
+        return None
+    return min(hours * 60 + minutes, 24 * 60)
+
+
+def _parse_days(value) -> tuple[frozenset[int] | None, date | None] | None:
+    text = str(value or "").strip().lower()
+    if text in {"", "any", "all", "daily", "everyday", "every day"}:
+        return None, None
+    if text in {"weekday", "weekdays"}:
+        return frozenset(range(5)), None
+    if text in {"weekend", "weekends"}:
+        return frozenset({5, 6}), None
+    if text[:3] in _WEEKDAY_PREFIXES:
+        return frozenset({_WEEKDAY_PREFIXES.index(text[:3])}), None
+    try:
+        return None, date.fromisoformat(text[:10])
+    except ValueError:
+        return None
+
+
+def parse_window(window: Mapping | None) -> WindowRule | None:
+    if not window:
+        return None
+    days = _parse_days(window.get("day"))
+    if days is None:
+        return None
+    named = _NAMED_WINDOWS.get(str(window.get("kind") or "").lower(), (0, 24 * 60))
+    start = _parse_clock(window.get("start_time"))
+    end = _parse_clock(window.get("end_time"))
+    start = named[0] if start is None else start
+    end = named[1] if end is None else end
+    if end <= start:
+        return None
+    return WindowRule(start=start, end=end, weekdays=days[0], on_date=days[1])
+
+
+def parse_windows(windows: Iterable[Mapping] | None) -> list[WindowRule]:
+    return [rule for rule in (parse_window(window) for window in windows or []) if rule is not None]
+
+
+def named_window(name: str | None) -> WindowRule | None:
+    bounds = _NAMED_WINDOWS.get(str(name or "").lower())
+    return WindowRule(start=bounds[0], end=bounds[1]) if bounds else None
+
+
+def _align(minute: int) -> int:
+    return -(-minute // SLOT_STEP_MINUTES) * SLOT_STEP_MINUTES
+
+
+class _DayCalendar:
+    # Disjoint busy intervals kept sorted by start, so ends are sorted too and conflicts are a bisect away.
+    __slots__ = ("starts", "ends", "booked_minutes")
+
+    def __init__(self, busy: Iterable[tuple[int, int]] = ()):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.booked_minutes = 0
+        for start, end in sorted(busy):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+                continue
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def conflict_end(self, start: int, end: int) -> int | None:
+        index = bisect.bisect_right(self.ends, start)
+        if index < len(self.starts) and self.starts[index] < end:
+            return self.ends[index]
+        return None
+
+    def first_fit(self, duration: int, lower: int, upper: int, blocked: list[tuple[int, int]]) -> int | None:
+        start = _align(lower)
+        while start + duration <= upper:
+            conflict = self.conflict_end(start, start + duration)
+            if conflict is None:
+                conflict = max((end for block_start, end in blocked if block_start < start + duration and end > start), default=None)
+            if conflict is None:
+                return start
+            start = _align(conflict)
+        return None
+
+    def reserve(self, start: int, end: int) -> None:
+        index = bisect.bisect_left(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.booked_minutes += end - start
+
+
+def plan_week(
+    tasks: Iterable[SchedulingTask],
+    week_start: date,
+    week_end: date,
+    user_busy: list[WindowRule] | None = None,
+    user_preferences: list[WindowRule] | None = None,
+) -> tuple[list[Placement], list[str]]:
+    days = [week_start + timedelta(days=offset) for offset in range((week_end - week_start).days + 1)]
+    calendars = {day: _DayCalendar((rule.start, rule.end) for rule in user_busy or [] if rule.applies(day)) for day in days}
+    placements: list[Placement] = []
+    unscheduled: list[str] = []
+
+    # Greedy: the most constrained tasks (high priority, few eligible days, long) claim time first.
+    ordered = sorted(
+        tasks,
+        key=lambda task: (
+            _PRIORITY_RANK.get(task.priority, 3),
+            (min(task.latest, week_end) - max(task.earliest, week_start)).days,
+            -task.duration_minutes,
+            task.task_id,
+        ),
+    )
+    for task in ordered:
+        best: tuple[tuple[int, int, int, int], date, int] | None = None
+        for day_index, day in enumerate(days):
+            if not task.earliest <= day <= task.latest:
+                continue
+            calendar = calendars[day]
+            blocked = [(rule.start, rule.end) for rule in task.busy if rule.applies(day)]
+            preferred = [rule for rule in task.preferred if rule.applies(day)] or [
+                rule for rule in user_preferences or [] if rule.applies(day)
+            ]
+            windows = [(0, rule.start, rule.end) for rule in preferred]
+            windows.append((1, DAY_START_MINUTE, DAY_END_MINUTE))
+            for penalty, lower, upper in windows:
+                start = calendar.first_fit(task.duration_minutes, lower, upper, blocked)
+                if start is None:
+                    continue
+                score = (penalty, calendar.booked_minutes, day_index, start)
+                if best is None or score < best[0]:
+                    best = (score, day, start)
+                break
+        if best is None:
+            unscheduled.append(task.task_id)
+            continue
+        _, day, start = best
+        calendars[day].reserve(start, start + task.duration_minutes)
+        placements.append(Placement(task_id=task.task_id, day=day, start_minute=start))
+
+    placements.sort(key=lambda placement: (placement.day, placement.start_minute, placement.task_id))
+    return placements, unscheduled
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+import uuid
+
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert_insert
+from ..models.task import TaskDailyStat, TaskHistory, TaskTemplate
+from ..schemas.task import TaskCategoryStats, TaskStatsEntry, TaskStatsResponse, TaskWeeklyRollup
+
+_CATEGORY_ORDER = ("daily", "occasional", "long_term_task", "long_term_goal")
+
+
+def _bucket(status: str | None) -> str:
+    if status in {"progress", "skipped"}:
+        return status
+    return "completed"
+
+
+def history_day(completed_at: datetime) -> date:
+    """Day a history row counts towards: its UTC date, with naive timestamps already taken as UTC."""
+    if completed_at.tzinfo is not None:
+        completed_at = completed_at.astimezone(UTC)
+    return completed_at.date()
+
+
+def tally_history(
+    rows: Iterable[tuple[str, str, datetime, str | None, int | None]],
+) -> dict[tuple[str, str, date], list[int]]:
+    """Sum (user_id, task_id, completed_at, status, duration_minutes) rows into
+    (user_id, task_id, day) -> [completed, progress, skipped, minutes].
+
+    Shared by the write path and the task_daily_stats backfill so both bucket days the same way.
+    """
+    tallies: dict[tuple[str, str, date], list[int]] = {}
+    for user_id, task_id, completed_at, status, duration_minutes in rows:
+        counts = tallies.setdefault((user_id, task_id, history_day(completed_at)), [0, 0, 0, 0])
+        bucket = _bucket(status)
+        counts[("completed", "progress", "skipped").index(bucket)] += 1
+        if bucket != "skipped":
+            counts[3] += duration_minutes or 0
+    return tallies
+
+
+def daily_stat_rows(tallies: dict[tuple[str, str, date], list[int]]) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "task_id": task_id,
+            "day": day,
+            "completed_count": completed,
+            "progress_count": progress,
+            "skipped_count": skipped,
+            "minutes": minutes,
+        }
+        for (user_id, task_id, day), (completed, progress, skipped, minutes) in tallies.items()
+    ]
+
+
+def record_history_stats(db: Session, user_id: str, records: Iterable[TaskHistory]) -> None:
+    """Fold new history rows into task_daily_stats; the caller commits them together.
+
+    The counters are added in SQL under the (task_id, day) key, so two requests landing on the same
+    day both count instead of one failing on the unique constraint.
+    """
+    tallies = tally_history(
+        (user_id, record.task_id, record.completed_at, record.status, record.duration_minutes) for record in records
+    )
+    if not tallies:
+        return
+    statement = upsert_insert(db, TaskDailyStat).values(daily_stat_rows(tallies))
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[TaskDailyStat.task_id, TaskDailyStat.day],
+            set_={
+                name: getattr(TaskDailyStat, name) + getattr(statement.excluded, name)
+                for name in ("completed_count", "progress_count", "skipped_count", "minutes")
+            },
+        )
+    )
+
+
+def _longest_run(bits: int) -> int:
+    # Each step shortens every run of set bits by one, so the step count is the longest run.
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def _trailing_run(bits: int, width: int) -> int:
+    gaps = ~bits & ((1 << width) - 1)
+    return width - gaps.bit_length()
+
+
+class _Tally:
+    __slots__ = ("completed", "progress", "skipped", "minutes", "bits", "due", "hits", "eligible")
+
+    def __init__(self) -> None:
+        self.completed = self.progress = self.skipped = self.minutes = 0
+        # `due` marks days the task was scheduled or acted on, skips included.
+        self.bits = self.due = self.hits = self.eligible = 0
+
+    def summary(self, width: int, end_is_today: bool) -> dict:
+        # An unfinished today does not break the streak yet.
+        if end_is_today and width > 1 and not (self.bits >> (width - 1)) & 1:
+            current = _trailing_run(self.bits, width - 1)
+        else:
+            current = _trailing_run(self.bits, width)
+        return {
+            "completed": self.completed,
+            "progress": self.progress,
+            "skipped": self.skipped,
+            "minutes": self.minutes,
+            "active_days": self.bits.bit_count(),
+            "eligible_days": self.eligible,
+            "completion_rate": round(self.hits / self.eligible, 4) if self.eligible else 0.0,
+            "current_streak": current,
+            "longest_streak": _longest_run(self.bits),
+        }
+
+
+def build_task_stats(
+    tasks: list[TaskTemplate],
+    rows: Iterable[tuple[str, date, int, int, int, int]],
+    start_date: date,
+    end_date: date,
+    today: date,
+    scheduled: Iterable[tuple[str, date]] = (),
+) -> TaskStatsResponse:
+    """Roll daily aggregate rows up per task, per category and per ISO week.
+
+    Each task's active days are a bitmask over the range (bit 0 is start_date), so rates and
+    streaks are a few integer operations per task instead of a walk over its history.
+    Occasional tasks are only due when scheduled, so their rate counts the days of `scheduled`
+    (task_id, day) slots and of their own history rather than every day since creation.
+    """
+    width = (end_date - start_date).days + 1
+    full_mask = (1 << width) - 1
+    weekday_bits = [0] * 7
+    for offset in range(width):
+        weekday_bits[(start_date + timedelta(days=offset)).weekday()] |= 1 << offset
+
+    tallies: dict[str, _Tally] = {task.id: _Tally() for task in tasks}
+    weeks: dict[date, TaskWeeklyRollup] = {}
+    week_days: dict[date, int] = {}
+    for task_id, day, completed, progress, skipped, minutes in rows:
+        tally = tallies.get(task_id)
+        if tally is None:
+            continue
+        offset = (day - start_date).days
+        tally.due |= 1 << offset
+        tally.completed += completed
+        tally.progress += progress
+        tally.skipped += skipped
+        tally.minutes += minutes
+        week_start = day - timedelta(days=day.weekday())
+        week = weeks.get(week_start)
+        if week is None:
+            week = weeks[week_start] = TaskWeeklyRollup(week_start=week_start)
+        week.completed += completed
+        week.progress += progress
+        week.skipped += skipped
+        week.minutes += minutes
+        if completed or progress:
+            tally.bits |= 1 << offset
+            week_days[week_start] = week_days.get(week_start, 0) | 1 << offset
+
+    for task_id, day in scheduled:
+        tally = tallies.get(task_id)
+        if tally is not None and start_date <= day <= end_date:
+            tally.due |= 1 << (day - start_date).days
+
+    end_is_today = end_date == today
+    categories: dict[str, _Tally] = {}
+    entries: list[TaskStatsEntry] = []
+    for task in tasks:
+        tally = tallies[task.id]
+        first_offset = max(0, (task.created_at.date() - start_date).days) if task.created_at else 0
+        if tally.bits:
+            # History can predate the template (imports, restored tasks); count from whichever came first.
+            first_offset = min(first_offset, (tally.bits & -tally.bits).bit_length() - 1)
+        eligible = full_mask & ~((1 << first_offset) - 1)
+        if task.category == "occasional":
+            eligible &= tally.due
+        elif task.category in {"long_term_task", "long_term_goal"}:
+            weekdays = 0
+            for value in (task.metadata_json or {}).get("assigned_weekdays") or []:
+                weekdays |= weekday_bits[(int(value) - 1) % 7]
+            eligible &= weekdays
+        tally.eligible = eligible.bit_count()
+        tally.hits = (tally.bits & eligible).bit_count()
+        entries.append(
+            TaskStatsEntry(task_id=task.id, title=task.title, category=task.category, **tally.summary(width, end_is_today))
+        )
+
+        category = categories.setdefault(task.category, _Tally())
+        category.completed += tally.completed
+        category.progress += tally.progress
+        category.skipped += tally.skipped
+        category.minutes += tally.minutes
+        category.bits |= tally.bits
+        category.hits += tally.hits
+        category.eligible += tally.eligible
+
+    for week_start, bits in week_days.items():
+        weeks[week_start].active_days = bits.bit_count()
+
+    return TaskStatsResponse(
+        start=start_date,
+        end=end_date,
+        tasks=entries,
+        categories=[
+            TaskCategoryStats(category=name, **categories[name].summary(width, end_is_today))
+            for name in _CATEGORY_ORDER
+            if name in categories
+        ],
+        weeks=[weeks[week_start] for week_start in sorted(weeks)],
+    )
+
@@ -7,7 +7,9 @@ import random
 import re
 import threading
 import tempfile
+import time
 
+from ..core.metrics import UTTT_BOT_INFERENCE_SECONDS
 from .ultimate_ttt_logic import legal_moves, legal_values_for_subgrid
 
 logger = logging.getLogger(__name__)
@@ -254,8 +256,10 @@ def choose_bot_move(
         encoded = _encode_state(board_state, subgrid_state, current_player, next_board_row, next_board_col)
         x = torch.tensor(encoded, dtype=torch.float32).unsqueeze(0)
 
+        started = time.perf_counter()
         with torch.no_grad():
             logits = model(x).squeeze(0)
+        UTTT_BOT_INFERENCE_SECONDS.observe(time.perf_counter() - started, model_version=_normalize_model_version(model_version))
 
         indices = torch.tensor([idx for _, _, idx in options], dtype=torch.long)
         option_logits = logits[indices]
@@ -0,0 +1,84 @@
+"""CPU benchmark for the weekly auto-scheduler packing engine.
+
+    python -m benchmarks.auto_scheduler --tasks 300 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+import json
+import random
+import statistics
+import time
+
+from .harness import _configure_environment, _git_revision
+
+_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _window(rng: random.Random, day: str | None, earliest_hour: int, latest_hour: int) -> dict:
+    start = rng.randint(earliest_hour, latest_hour - 1)
+    return {"day": day, "start_time": f"{start:02d}:00", "end_time": f"{rng.randint(start + 1, latest_hour):02d}:00"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time plan_week over synthetic occasional tasks.")
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    _configure_environment(None)
+    from app.services.task_scheduler import SchedulingTask, parse_windows, plan_week
+
+    rng = random.Random(args.seed)
+    week_start = date.today()
+    week_end = week_start + timedelta(days=6)
+    user_busy = parse_windows(
+        [{"day": "weekdays", "start_time": "09:00", "end_time": "17:00"}, {"day": None, "start_time": "12:30", "end_time": "13:15"}]
+    )
+    tasks = []
+    for index in range(args.tasks):
+        earliest = week_start + timedelta(days=rng.randint(0, 4))
+        tasks.append(
+            SchedulingTask(
+                task_id=f"task-{index}",
+                duration_minutes=rng.choice([10, 15, 30, 45, 60, 90]),
+                priority=rng.choice(["low", "medium", "high"]),
+                earliest=earliest,
+                latest=earliest + timedelta(days=rng.randint(0, 6)),
+                preferred=parse_windows([_window(rng, rng.choice([None, *_DAYS]), 6, 22) for _ in range(rng.randint(0, 2))]),
+                busy=parse_windows([_window(rng, rng.choice(_DAYS), 7, 22) for _ in range(rng.randint(0, 2))]),
+            )
+        )
+
+    timings: list[float] = []
+    placements: list = []
+    unscheduled: list = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        placements, unscheduled = plan_week(tasks, week_start, week_end, user_busy=user_busy)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    print(
+        json.dumps(
+            {
+                "git_revision": _git_revision(),
+                "tasks": args.tasks,
+                "placed": len(placements),
+                "unscheduled": len(unscheduled),
+                "placed_minutes": sum(task.duration_minutes for task in tasks if task.task_id not in set(unscheduled)),
+                "repeat": args.repeat,
+                "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+                "min_ms": round(timings[0] * 1000, 3),
+                "max_ms": round(timings[-1] * 1000, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare two benchmark result files written by benchmarks.harness.
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+_METRICS = ("p50_ms", "p99_ms", "throughput_rps", "queries_per_request")
+
+
+def _load(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+
+
+def _change(before: float | None, after: float | None) -> str:
+    if before in (None, 0) or after is None:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    before, after = _load(args.before), _load(args.after)
+    print(f"{'case':<28}" + "".join(f"{metric:>28}" for metric in _METRICS))
+    for name in sorted(set(before) & set(after)):
+        cells = []
+        for metric in _METRICS:
+            old, new = before[name].get(metric), after[name].get(metric)
+            cells.append(f"{old} -> {new} ({_change(old, new)})")
+        print(f"{name:<28}" + "".join(f"{cell:>28}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
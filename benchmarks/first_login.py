@@ -0,0 +1,69 @@
+"""First-login latency: seeding the default gym library for brand-new users.
+
+    python -m benchmarks.first_login --users 50
+    python -m benchmarks.first_login --users 50 --orm   # per-object unit-of-work seeding, for comparison
+
+Without --database-url a throwaway SQLite file is used; pass an empty PostgreSQL database for production-like numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+from .harness import _configure_environment, _git_revision
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time ensure_user_gym_defaults for users with no gym data.")
+    parser.add_argument("--database-url", help="Empty database to use; defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--orm", action="store_true", help="Seed through one ORM object per exercise instead of a bulk insert")
+    args = parser.parse_args()
+
+    database_url = _configure_environment(args.database_url)
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.gym import GymExercise
+    from app.models.user import User
+    from app.services import gym_seed
+
+    def _seed_with_orm(db, user_id: str) -> None:
+        db.add_all(GymExercise(**row) for row in gym_seed._seed_rows(user_id))
+        db.flush()
+        gym_seed._mark_seeded(db, user_id)
+
+    seed = _seed_with_orm if args.orm else gym_seed.ensure_user_gym_defaults
+    Base.metadata.create_all(engine)
+    timings: list[float] = []
+    with SessionLocal() as db:
+        for index in range(args.users):
+            user = User(email=f"first-login-{time.time_ns()}-{index}@example.com")
+            db.add(user)
+            db.commit()
+            started = time.perf_counter()
+            seed(db, user.id)
+            timings.append(time.perf_counter() - started)
+    engine.dispose()
+
+    timings.sort()
+    print(
+        json.dumps(
+            {
+                "git_revision": _git_revision(),
+                "database": database_url.split("://", 1)[0],
+                "mode": "orm" if args.orm else "bulk",
+                "users": args.users,
+                "exercises_per_user": len(gym_seed._TEMPLATE_ROWS),
+                "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+                "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+                "max_ms": round(timings[-1] * 1000, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
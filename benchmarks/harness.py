@@ -0,0 +1,199 @@
+"""Latency and throughput benchmarks for the hot endpoints.
+
+Runs the app in-process against a local database filled with synthetic data and writes JSON results:
+
+    python -m benchmarks.harness --users 3 --iterations 200 --concurrency 8 --output bench.json
+
+Without --database-url a throwaway SQLite file is used; pass an empty PostgreSQL database for production-like numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+
+_QUERY_COUNT_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def _configure_environment(database_url: str | None) -> str:
+    if database_url is None:
+        database_url = f"sqlite:///{Path(tempfile.mkdtemp(prefix='bench-')) / 'bench.db'}"
+    os.environ["APP_DATABASE_URL"] = database_url
+    os.environ.setdefault("APP_ALLOWED_ORIGINS", "http://localhost")
+    os.environ.setdefault("APP_MEDIA_ROOT", tempfile.mkdtemp(prefix="bench-media-"))
+    os.environ.setdefault("APP_SQL_REPEAT_WARNING_THRESHOLD", "0")
+    return database_url
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+async def _measure(request: Callable[[], Awaitable], iterations: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    query_counts: list[int] = []
+    errors = 0
+
+    async def _one() -> None:
+        nonlocal errors
+        async with semaphore:
+            send = await request()
+            started = time.perf_counter()
+            response = await send()
+            latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors += 1
+        match = _QUERY_COUNT_RE.search(response.headers.get("server-timing", ""))
+        if match:
+            query_counts.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(iterations)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(iterations / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "queries_per_request": round(statistics.fmean(query_counts), 2) if query_counts else None,
+    }
+
+
+async def _run(args: argparse.Namespace, database_url: str) -> dict:
+    import httpx
+
+    from app.core.database import Base, SessionLocal, async_engine, engine
+    from app.core.security import create_session_token
+    from app.main import app
+    from app.services.ultimate_ttt_logic import legal_values_for_subgrid
+
+    from .synthetic import DatasetSpec, populate
+
+    spec = DatasetSpec(
+        users=args.users,
+        task_history_per_user=args.task_history,
+        gym_sessions_per_user=args.gym_sessions,
+        seed=args.seed,
+    )
+    Base.metadata.create_all(engine)
+    populate_started = time.perf_counter()
+    with SessionLocal() as db:
+        users = populate(db, spec)
+        tokens = [create_session_token(user) for user in users]
+    populate_seconds = time.perf_counter() - populate_started
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = {"value": 0}
+
+        def _headers() -> dict:
+            counter["value"] += 1
+            return {"Authorization": f"Bearer {tokens[counter['value'] % len(tokens)]}"}
+
+        def _get(path: str) -> Callable[[], Awaitable]:
+            async def _prepare():
+                headers = _headers()
+                return lambda: client.get(path, headers=headers)
+
+            return _prepare
+
+        def _post(path: str, body: dict) -> Callable[[], Awaitable]:
+            async def _prepare():
+                headers = _headers()
+                return lambda: client.post(path, json=body, headers=headers)
+
+            return _prepare
+
+        async def _prepare_bot_move():
+            headers = _headers()
+            game = (await client.post("/api/ultimate-ttt/games/bot", json={"human_symbol": "X"}, headers=headers)).json()
+            move = game["legal_moves"][0]
+            value = legal_values_for_subgrid(game["board_state"], move["board_row"], move["board_col"])[0]
+            return lambda: client.post(f"/api/ultimate-ttt/games/{game['id']}/moves", json={**move, "value": value}, headers=headers)
+
+        cases: dict[str, Callable[[], Awaitable]] = {
+            "tasks_planner": _get("/api/tasks/planner?days=7"),
+            "tasks_stats": _get("/api/tasks/stats"),
+            "tasks_schedule_preview": _post("/api/tasks/schedule/preview", {}),
+            "gym_bootstrap": _get("/api/gym/bootstrap"),
+            "gym_bootstrap_windowed": _get("/api/gym/bootstrap?history_limit=100"),
+            "gym_volume": _get("/api/gym/volume?weeks=12"),
+            "food_meals": _get("/api/food/meals"),
+            "budget_entries": _get("/api/budget/entries"),
+            "ultimate_ttt_games": _get("/api/ultimate-ttt/games?state=finished"),
+            "ultimate_ttt_bot_move": _prepare_bot_move,
+        }
+        selected = args.case or list(cases)
+        results: dict[str, dict] = {}
+        for name in selected:
+            await _measure(cases[name], min(args.warmup, args.iterations), args.concurrency)
+            results[name] = await _measure(cases[name], args.iterations, args.concurrency)
+
+    await async_engine.dispose()
+    engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "database": database_url.split("://", 1)[0],
+            "dataset": spec.as_dict(),
+            "populate_seconds": round(populate_seconds, 2),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the hot API endpoints against synthetic data.")
+    parser.add_argument("--database-url", help="Empty database to populate; defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--task-history", type=int, default=3000, help="TaskHistory rows per user")
+    parser.add_argument("--gym-sessions", type=int, default=600, help="GymExerciseHistory rows per user")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--case", action="append", help="Only run the named case (repeatable)")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    database_url = _configure_environment(args.database_url)
+    report = asyncio.run(_run(args, database_url))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
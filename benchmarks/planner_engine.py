@@ -0,0 +1,72 @@
+"""CPU benchmark for the task planner engine, without HTTP or database round-trips.
+
+    python -m benchmarks.planner_engine --tasks 500 --days 31 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timedelta
+import json
+import random
+import statistics
+import time
+
+from .harness import _configure_environment, _git_revision
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time _build_planner over synthetic in-memory tasks.")
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--history", type=int, default=5000, help="Completions inside and before the planner range")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    _configure_environment(None)
+    from app.routers.tasks import _build_planner
+
+    from .synthetic import _make_tasks, _random_moment
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    start_date = date.today() - timedelta(days=3)
+    tasks = _make_tasks(rng, "bench-user", args.tasks, now.date())
+    slots_by_task = {task.id: [(slot.value, slot.slot_at) for slot in task.slots] for task in tasks}
+    history = [(rng.choice(tasks).id, _random_moment(rng, now, 60)) for _ in range(args.history)]
+    completions: dict[str, datetime] = {}
+    for task_id, completed_at in history:
+        if task_id not in completions or completed_at > completions[task_id]:
+            completions[task_id] = completed_at
+
+    _build_planner(tasks, slots_by_task, completions, history, start_date, args.days)
+    timings: list[float] = []
+    cards = 0
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        response = _build_planner(tasks, slots_by_task, completions, history, start_date, args.days)
+        timings.append(time.perf_counter() - started)
+        cards = sum(len(day.tasks) for day in response.days)
+
+    timings.sort()
+    print(
+        json.dumps(
+            {
+                "git_revision": _git_revision(),
+                "tasks": args.tasks,
+                "days": args.days,
+                "history": args.history,
+                "cards": cards,
+                "repeat": args.repeat,
+                "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+                "min_ms": round(timings[0] * 1000, 3),
+                "max_ms": round(timings[-1] * 1000, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Substitute latency against growing exercise libraries.
+
+    python -m benchmarks.substitute --library-sizes 40,1000 --iterations 200
+    python -m benchmarks.substitute --library-sizes 1000 --cold   # rebuild the per-user index on every tap
+
+Each tap starts from an assignment whose rotation is reset to its current exercise, so every request ranks
+candidates instead of cycling a stored rotation. Without --database-url a throwaway SQLite file is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+
+from .harness import _configure_environment, _git_revision, _measure
+
+_MUSCLES = ("Chest", "Lats", "Quads", "Hamstrings", "Glutes", "Shoulders", "Biceps", "Triceps", "Calves", "Abs", "Traps", "Forearms")
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    import httpx
+    from sqlalchemy import insert, update
+
+    from app.core.database import Base, SessionLocal, async_engine, engine
+    from app.core.security import create_session_token
+    from app.main import app
+    from app.models.gym import GymDayAssignment, GymExercise
+    from app.models.user import User
+    from app.services.gym_muscles import muscle_tokens
+    from app.services.gym_seed import ensure_user_gym_defaults
+    from app.services.gym_substitutes import substitute_index_cache
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(args.seed)
+    results: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in args.library_sizes:
+            with SessionLocal() as db:
+                user = User(email=f"substitute-{size}-{rng.getrandbits(32)}@example.com")
+                db.add(user)
+                db.commit()
+                ensure_user_gym_defaults(db, user.id)
+                seeded = db.query(GymExercise).filter(GymExercise.user_id == user.id).count()
+                rows = []
+                for index in range(max(0, size - seeded)):
+                    primary, secondary = rng.sample(_MUSCLES, 2)
+                    rows.append(
+                        {
+                            "id": f"bench-{user.id[:8]}-{index}",
+                            "user_id": user.id,
+                            "name": f"{primary} variation {index}",
+                            "primary_muscle": primary,
+                            "secondary_muscle": secondary,
+                            "muscle_groups": [primary, secondary],
+                            "muscle_tokens": muscle_tokens(primary, secondary, [primary, secondary]),
+                        }
+                    )
+                if rows:
+                    db.execute(insert(GymExercise), rows)
+                    db.commit()
+                library = db.query(GymExercise).filter(GymExercise.user_id == user.id).count()
+                token = create_session_token(user)
+            headers = {"Authorization": f"Bearer {token}"}
+
+            exercises = (await client.get("/api/gym/exercises", headers=headers)).json()
+            chest = next(exercise for exercise in exercises if exercise["primary_muscle"] == "Chest")
+            assignment = (
+                await client.post("/api/gym/assignments", json={"day_key": "monday", "selected_exercise_id": chest["id"]}, headers=headers)
+            ).json()
+
+            async def _prepare():
+                with SessionLocal() as db:
+                    current = db.get(GymDayAssignment, assignment["id"]).selected_exercise_id
+                    db.execute(update(GymDayAssignment).where(GymDayAssignment.id == assignment["id"]).values(options=[current]))
+                    db.commit()
+                if args.cold:
+                    substitute_index_cache.invalidate(user.id)
+                return lambda: client.post(f"/api/gym/assignments/{assignment['id']}/substitute", headers=headers)
+
+            await _measure(_prepare, min(args.warmup, args.iterations), 1)
+            results[str(library)] = await _measure(_prepare, args.iterations, 1)
+
+    await async_engine.dispose()
+    engine.dispose()
+    return {"cold": args.cold, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time /gym/assignments/{id}/substitute for different library sizes.")
+    parser.add_argument("--database-url", help="Empty database to use; defaults to a temporary SQLite file")
+    parser.add_argument("--library-sizes", type=lambda value: [int(part) for part in value.split(",")], default=[40, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cold", action="store_true", help="Invalidate the substitute index before every tap")
+    args = parser.parse_args()
+
+    database_url = _configure_environment(args.database_url)
+    report = asyncio.run(_run(args))
+    report = {"git_revision": _git_revision(), "database": database_url.split("://", 1)[0], **report}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta
+import random
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.models.budget import BudgetCategory, BudgetEntry
+from app.models.food import FoodImage, MealEntry
+from app.models.gym import GymExercise, GymExerciseHistory
+from app.models.task import TaskHistory, TaskScheduledSlot, TaskTemplate
+from app.models.ultimate_ttt import UltimateTicTacToeGame, UltimateTicTacToeMove
+from app.models.user import User
+from app.services.gym_seed import ensure_user_gym_defaults
+from app.services.task_stats import record_history_stats
+from app.services.ultimate_ttt_logic import apply_move, initial_board_state, initial_subgrid_state, legal_moves, legal_values_for_subgrid
+
+_BUDGET_CATEGORIES = ["Groceries", "Rent", "Transport", "Dining", "Utilities", "Fun"]
+_MEAL_SLOTS = ["Breakfast", "Lunch", "Dinner", "Snack"]
+_WINDOWS = ["morning", "afternoon", "evening", "any"]
+
+
+@dataclass
+class DatasetSpec:
+    users: int = 3
+    tasks_per_user: int = 60
+    task_history_per_user: int = 3000
+    gym_sessions_per_user: int = 600
+    meals_per_user: int = 200
+    photos_per_meal: int = 2
+    budget_entries_per_user: int = 900
+    finished_games_per_user: int = 40
+    history_days: int = 365
+    seed: int = 7
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _random_moment(rng: random.Random, now: datetime, days: int) -> datetime:
+    return now - timedelta(days=rng.randint(0, days), minutes=rng.randint(0, 24 * 60 - 1))
+
+
+def _make_tasks(rng: random.Random, user_id: str, count: int, today: date) -> list[TaskTemplate]:
+    tasks: list[TaskTemplate] = []
+    for index in range(count):
+        roll = rng.random()
+        if roll < 0.25:
+            category = "daily"
+        elif roll < 0.4:
+            category = rng.choice(["long_term_task", "long_term_goal"])
+        else:
+            category = "occasional"
+        meta: dict = {"window": rng.choice(_WINDOWS), "autop": rng.random() < 0.2}
+        if category.startswith("long_term"):
+            meta["assigned_weekdays"] = sorted(rng.sample(range(1, 8), rng.randint(1, 4)))
+        if category == "occasional":
+            meta["scheduled_slots"] = sorted(
+                datetime.combine(today + timedelta(days=rng.randint(-7, 21)), time(rng.randint(6, 21), 0)).isoformat()
+                for _ in range(rng.randint(0, 4))
+            )
+        tasks.append(
+            TaskTemplate(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                category=category,
+                title=f"Task {index}",
+                duration_minutes=rng.choice([10, 15, 30, 45, 60]),
+                priority=rng.choice(["low", "medium", "high"]),
+                recurrence={"mode": "repeat", "config": {"start_after_days": rng.randint(0, 7), "end_before_days": rng.randint(7, 21)}},
+                metadata_json=meta,
+                slots=[
+                    TaskScheduledSlot(user_id=user_id, slot_at=datetime.fromisoformat(value), value=value)
+                    for value in meta.get("scheduled_slots", [])
+                ],
+            )
+        )
+    occasional = [task for task in tasks if task.category == "occasional"]
+    # Chain a few occasional tasks behind another task to exercise after_completion planning.
+    for task in occasional[: max(1, len(occasional) // 10)]:
+        trigger = rng.choice(tasks)
+        if trigger is task:
+            continue
+        task.recurrence = {"mode": "after_completion", "config": {"start_after_days": 0, "end_before_days": 0}}
+        task.metadata_json = {**task.metadata_json, "trigger_task_id": trigger.id, "trigger_after_days": rng.randint(0, 5)}
+    return tasks
+
+
+def _finished_game(rng: random.Random, user_id: str, now: datetime) -> tuple[UltimateTicTacToeGame, list[UltimateTicTacToeMove]]:
+    board, subgrid = initial_board_state(), initial_subgrid_state()
+    next_row = next_col = None
+    symbol = "X"
+    winner = "D"
+    game = UltimateTicTacToeGame(
+        created_by_user_id=user_id,
+        player_x_user_id=user_id,
+        mode="bot",
+        bot_symbol="O",
+        status="finished",
+        started_at=_random_moment(rng, now, 180),
+    )
+    moves: list[UltimateTicTacToeMove] = []
+    while True:
+        options = legal_moves(board, subgrid, next_row, next_col)
+        if not options:
+            break
+        move = rng.choice(options)
+        values = legal_values_for_subgrid(board, move[0], move[1])
+        value = rng.choice(values)
+        result = apply_move(board, subgrid, move, symbol, value)
+        moves.append(
+            UltimateTicTacToeMove(
+                user_id=user_id if symbol == "X" else None,
+                symbol=symbol,
+                board_row=move[0],
+                board_col=move[1],
+                cell_row=move[2],
+                cell_col=move[3],
+                value=value,
+                move_index=len(moves) + 1,
+            )
+        )
+        board, subgrid = result["board_state"], result["subgrid_state"]
+        next_row, next_col = result["next_board_row"], result["next_board_col"]
+        if result["is_finished"]:
+            winner = result["winner"]
+            break
+        symbol = "O" if symbol == "X" else "X"
+
+    game.board_state = board
+    game.subgrid_state = subgrid
+    game.winner = winner
+    game.current_player = symbol
+    game.move_count = len(moves)
+    game.finished_at = game.started_at + timedelta(minutes=len(moves))
+    return game, moves
+
+
+def populate_user(db: Session, rng: random.Random, spec: DatasetSpec, email: str) -> User:
+    now = datetime.utcnow()
+    today = now.date()
+    user = User(email=email, full_name=email.split("@", 1)[0])
+    db.add(user)
+    db.commit()
+    ensure_user_gym_defaults(db, user.id)
+
+    tasks = _make_tasks(rng, user.id, spec.tasks_per_user, today)
+    db.add_all(tasks)
+    history: list[TaskHistory] = []
+    for _ in range(spec.task_history_per_user):
+        task = rng.choice(tasks)
+        completed_at = _random_moment(rng, now, spec.history_days)
+        history.append(
+            TaskHistory(
+                user_id=user.id,
+                task_id=task.id,
+                completed_at=completed_at,
+                duration_minutes=rng.choice([10, 20, 30]),
+                status=rng.choice(["completed", "completed", "completed", "skipped", "progress"]),
+            )
+        )
+        if task.last_completed_at is None or completed_at > task.last_completed_at:
+            task.last_completed_at = completed_at
+    db.add_all(history)
+    record_history_stats(db, user.id, history)
+
+    exercise_ids = [row[0] for row in db.query(GymExercise.id).filter(GymExercise.user_id == user.id).all()]
+    db.add_all(
+        GymExerciseHistory(
+            user_id=user.id,
+            exercise_id=rng.choice(exercise_ids),
+            recorded_at=_random_moment(rng, now, spec.history_days),
+            sets=[
+                {"set": set_index + 1, "weight": round(rng.uniform(10, 120), 1), "reps": rng.randint(5, 15)}
+                for set_index in range(rng.randint(2, 5))
+            ],
+        )
+        for _ in range(spec.gym_sessions_per_user)
+    )
+
+    for index in range(spec.meals_per_user):
+        consumed_at = _random_moment(rng, now, spec.history_days)
+        meal = MealEntry(
+            user_id=user.id,
+            title=f"Meal {index}",
+            meal_slot=rng.choice(_MEAL_SLOTS),
+            consumed_at=consumed_at,
+            ingredients=[{"id": str(i), "name": f"Ingredient {i}", "amount": "1 cup"} for i in range(rng.randint(1, 6))],
+            tags=[],
+        )
+        meal.images = [
+            FoodImage(
+                user_id=user.id,
+                file_path=f"food/synthetic-{index}-{photo}.jpg",
+                recorded_at=consumed_at.date(),
+            )
+            for photo in range(spec.photos_per_meal)
+        ]
+        db.add(meal)
+
+    db.add_all(BudgetCategory(user_id=user.id, name=name) for name in _BUDGET_CATEGORIES)
+    db.add_all(
+        BudgetEntry(
+            user_id=user.id,
+            category=rng.choice(_BUDGET_CATEGORIES),
+            title="Synthetic spend",
+            amount=round(rng.uniform(1, 200), 2),
+            spent_on=today - timedelta(days=rng.randint(0, spec.history_days)),
+        )
+        for _ in range(spec.budget_entries_per_user)
+    )
+
+    for _ in range(spec.finished_games_per_user):
+        game, moves = _finished_game(rng, user.id, now)
+        db.add(game)
+        db.flush()
+        for move in moves:
+            move.game_id = game.id
+        db.add_all(moves)
+
+    db.commit()
+    return user
+
+
+def populate(db: Session, spec: DatasetSpec) -> list[User]:
+    rng = random.Random(spec.seed)
+    return [populate_user(db, rng, spec, f"bench-user-{index}@example.com") for index in range(spec.users)]
@@ -0,0 +1,75 @@
+"""Measure requests/sec for the hot endpoints at a fixed concurrency.
+
+Run it against a deployment before and after a change and compare the output:
+
+    python scripts/bench_throughput.py --base-url http://localhost:8007 --token "$SESSION_TOKEN" --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_PATHS = [
+    "/api/tasks/planner?days=7",
+    "/api/gym/bootstrap",
+    "/api/budget/entries",
+]
+
+
+def _run_path(session: requests.Session, url: str, headers: dict, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+
+    def _one(_: int) -> tuple[float, bool]:
+        started = time.perf_counter()
+        response = session.get(url, headers=headers, timeout=60)
+        return time.perf_counter() - started, response.ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, ok in pool.map(_one, range(total)):
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "requests_per_second": round(total / wall, 2) if wall else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8007")
+    parser.add_argument("--token", required=True, help="Session token sent as a Bearer header")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint path to hit (repeatable)")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=args.concurrency, pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    results = {}
+    for path in args.paths or DEFAULT_PATHS:
+        results[path] = _run_path(session, f"{args.base_url.rstrip('/')}{path}", headers, args.requests, args.concurrency)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
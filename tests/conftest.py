@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import tempfile
+import uuid
+
+_tmp = Path(tempfile.mkdtemp(prefix="tests-"))
+os.environ["APP_DATABASE_URL"] = f"sqlite:///{_tmp / 'test.db'}"
+os.environ.setdefault("APP_ALLOWED_ORIGINS", "http://localhost")
+os.environ.setdefault("APP_MEDIA_ROOT", str(_tmp / "media"))
+os.environ.setdefault("APP_SQL_REPEAT_WARNING_THRESHOLD", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.models  # noqa: F401  registers every table on Base.metadata
+from app.core.database import Base, SessionLocal, engine
+from app.core.instrumentation import RequestStats, _request_stats
+from app.core.security import create_session_token
+from app.main import app as fastapi_app
+from app.models.user import User
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    Base.metadata.create_all(engine)
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def user(db) -> User:
+    # Every test gets its own user, so the shared database needs no cleanup between tests.
+    user = User(email=f"test-{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client() -> TestClient:
+    with TestClient(fastapi_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(user) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_session_token(user)}"}
+
+
+@contextmanager
+def count_statements():
+    """Count the SQL statements executed inside the block the way MetricsMiddleware does per request."""
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
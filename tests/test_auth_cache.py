@@ -0,0 +1,38 @@
+from sqlalchemy import update
+
+from app.core.security import session_cache
+from app.models.user import User
+
+
+def test_put_after_a_concurrent_invalidation_is_ignored(user):
+    version = session_cache.version(user.id)
+    session_cache.invalidate_user(user.id)
+
+    session_cache.put("token-loaded-before-invalidation", user, None, version)
+
+    assert session_cache.get("token-loaded-before-invalidation") is None
+
+
+def test_preference_update_merges_into_the_current_row(client, auth_headers, db, user):
+    # Prime the session cache with the user as it is now.
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    # Another worker changes the row; this process's cached snapshot does not see it.
+    db.execute(update(User).where(User.id == user.id).values(preferences_json={"theme": "dark"}))
+    db.commit()
+
+    response = client.patch("/api/auth/me/preferences", json={"preferences_json": {"units": "kg"}}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["preferences_json"] == {"theme": "dark", "units": "kg"}
+
+
+def test_gym_targets_update_keeps_concurrent_preferences(client, auth_headers, db, user):
+    assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+    db.execute(update(User).where(User.id == user.id).values(preferences_json={"theme": "dark"}))
+    db.commit()
+
+    response = client.put("/api/gym/preferences/muscle-targets", json={"Chest": {"low": 10, "high": 20}}, headers=auth_headers)
+
+    assert response.status_code == 204
+    db.expire_all()
+    assert db.get(User, user.id).preferences_json == {"theme": "dark", "gym_muscle_targets": {"Chest": {"low": 10, "high": 20}}}
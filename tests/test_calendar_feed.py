@@ -0,0 +1,65 @@
+from datetime import UTC, date, datetime
+
+from app.schemas.task import PlannerDay, PlannerTaskCard
+from app.services.calendar_feed import CalendarFeedCache, feed_last_modified, render_planner_ics
+
+
+def _feed_path(url: str) -> str:
+    return url[url.index("/api/"):]
+
+
+def test_rotating_the_feed_link_revokes_older_links(client, auth_headers):
+    original = client.get("/api/tasks/calendar/feed", headers=auth_headers).json()["url"]
+    assert client.get(_feed_path(original)).status_code == 200
+
+    rotated = client.post("/api/tasks/calendar/feed/rotate", headers=auth_headers)
+
+    assert rotated.status_code == 200
+    current = rotated.json()["url"]
+    assert current != original
+    assert client.get(_feed_path(original)).status_code == 404
+    assert client.get(_feed_path(current)).status_code == 200
+    refetched = client.get("/api/tasks/calendar/feed", headers=auth_headers).json()["url"]
+    assert client.get(_feed_path(refetched)).status_code == 200
+
+
+def test_feed_rejects_unknown_tokens(client):
+    assert client.get("/api/tasks/calendar/not-a-token.ics").status_code == 404
+
+
+def test_feed_cache_only_serves_the_matching_etag():
+    cache = CalendarFeedCache(8)
+    cache.put("user", '"v1"', "BEGIN:VCALENDAR")
+
+    assert cache.get("user", '"v2"') is None
+    assert cache.get("user", '"v1"') is None
+    cache.put("user", '"v2"', "BEGIN:VCALENDAR")
+    assert cache.get("user", '"v2"') == "BEGIN:VCALENDAR"
+
+
+def test_timed_events_are_utc_and_last_modified_is_utc_midnight_or_later():
+    card = PlannerTaskCard(
+        id="task-2026-03-02-slot",
+        task_id="task",
+        category="occasional",
+        title="Dentist",
+        duration=30,
+        chunk_minutes=30,
+        priority="medium",
+        priority_label="Scheduled",
+        autop=False,
+        status="scheduled",
+        type="scheduled",
+        due_date=date(2026, 3, 2),
+        scheduled_time="09:30",
+        window="any",
+        notes_enabled=True,
+    )
+    last_modified = feed_last_modified(datetime(2026, 3, 1, 23, 15), date(2026, 3, 2))
+
+    body = render_planner_ics([PlannerDay(date=date(2026, 3, 2), label="Monday", short_label="Mon", tasks=[card])], last_modified)
+
+    assert last_modified == datetime(2026, 3, 2, tzinfo=UTC)
+    assert feed_last_modified(datetime(2026, 3, 2, 8, 0, 5, 120), date(2026, 3, 2)) == datetime(2026, 3, 2, 8, 0, 5, tzinfo=UTC)
+    assert "DTSTART:20260302T093000Z" in body
+    assert "DTEND:20260302T100000Z" in body
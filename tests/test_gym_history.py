@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from app.models.gym import GymExercise, GymExerciseHistory
+from app.routers.gym import _latest_history_statement
+
+
+def test_latest_history_breaks_recorded_at_ties_by_write_order(db, user):
+    exercise = GymExercise(id=f"bench-{user.id}", user_id=user.id, name="Bench press")
+    recorded_at = datetime(2026, 3, 2, 18, 0)
+    db.add_all(
+        [
+            exercise,
+            # The later write gets the lower id, so an id tie-break would pick the earlier one.
+            GymExerciseHistory(
+                id="f" * 36,
+                user_id=user.id,
+                exercise_id=exercise.id,
+                recorded_at=recorded_at,
+                created_at=recorded_at,
+                sets=[{"reps": 5}],
+            ),
+            GymExerciseHistory(
+                id="0" * 36,
+                user_id=user.id,
+                exercise_id=exercise.id,
+                recorded_at=recorded_at,
+                created_at=recorded_at + timedelta(minutes=1),
+                sets=[{"reps": 8}],
+            ),
+        ]
+    )
+    db.commit()
+
+    latest = db.scalars(_latest_history_statement(user.id)).all()
+
+    assert [entry.id for entry in latest] == ["0" * 36]
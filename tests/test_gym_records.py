@@ -0,0 +1,127 @@
+from datetime import date
+
+from sqlalchemy import update
+
+from app.models.gym import GymExerciseDailyRecord, GymWeeklyVolume
+from app.models.user import User
+from app.services.gym_records import build_trend
+from app.services.gym_rollups import GYM_ROLLUP_VERSION, rebuild_gym_rollups
+
+
+def _rollups(db, user_id: str) -> tuple[set, set]:
+    db.expire_all()
+    volume = {
+        (row.week_start, row.muscle, row.direct_sets, row.indirect_sets)
+        for row in db.query(GymWeeklyVolume).filter(GymWeeklyVolume.user_id == user_id)
+    }
+    records = {
+        (
+            row.exercise_id,
+            row.day,
+            row.sessions,
+            row.sets,
+            row.volume,
+            row.max_reps,
+            row.best_weight,
+            row.best_weight_reps,
+            row.best_e1rm,
+        )
+        for row in db.query(GymExerciseDailyRecord).filter(GymExerciseDailyRecord.user_id == user_id)
+    }
+    return volume, records
+
+
+def test_incremental_rollups_match_a_rebuild(client, auth_headers, db, user):
+    # Current rollups, so every endpoint below maintains them incrementally instead of rebuilding.
+    db.execute(update(User).where(User.id == user.id).values(gym_rollup_version=GYM_ROLLUP_VERSION))
+    db.commit()
+    for payload in [
+        {"id": f"bench-{user.id}", "name": "Bench press", "primary_muscle": "Chest", "secondary_muscle": "Triceps"},
+        {"id": f"squat-{user.id}", "name": "Squat", "primary_muscle": "Quads", "muscle_groups": ["Glutes"]},
+    ]:
+        assert client.post("/api/gym/exercises", json=payload, headers=auth_headers).status_code == 201
+
+    def log(exercise: str, recorded_at: str, *sets: tuple) -> str:
+        payload = {
+            "exercise_id": f"{exercise}-{user.id}",
+            "recorded_at": recorded_at,
+            "sets": [{"set": index, "weight": weight, "reps": reps} for index, (weight, reps) in enumerate(sets, 1)],
+        }
+        response = client.post("/api/gym/history", json=payload, headers=auth_headers)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    log("bench", "2026-03-02T08:00:00", (60, 5), (60, 5))
+    heavy = log("bench", "2026-03-02T18:00:00", (70, 3), ("BW", 8))
+    log("bench", "2026-03-10T18:00:00", (65, 5))
+    log("squat", "2026-03-03T18:00:00", (100, 5), (100, 5), (100, 4))
+    log("squat", "2026-03-03T19:00:00", (105, 3))
+
+    assert client.delete(f"/api/gym/history/{heavy}", headers=auth_headers).status_code == 204
+    response = client.patch(
+        f"/api/gym/exercises/bench-{user.id}", json={"primary_muscle": "Shoulders"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    log("bench", "2026-03-10T19:00:00", (62.5, 4), (50, 10))
+    log("squat", "2026-03-11T18:00:00", (110, 2))
+    assert client.delete(f"/api/gym/exercises/squat-{user.id}", headers=auth_headers).status_code == 204
+
+    incremental = _rollups(db, user.id)
+    rebuild_gym_rollups(db, user.id)
+    db.commit()
+
+    assert incremental == _rollups(db, user.id)
+    volume, records = incremental
+    assert (date(2026, 3, 9), "shoulders", 3, 0) in volume
+    assert not any(row[0] == f"squat-{user.id}" for row in records)
+
+
+def _day(day: date, sessions: int = 1, volume: float = 500.0, best_weight: float = 60.0, best_e1rm: float | None = None):
+    return GymExerciseDailyRecord(
+        day=day,
+        sessions=sessions,
+        sets=3,
+        volume=volume,
+        max_reps=5,
+        best_weight=best_weight,
+        best_weight_reps=5,
+        best_e1rm=best_e1rm,
+    )
+
+
+def test_build_trend_flags_prs_per_period():
+    rows = [
+        _day(date(2026, 4, 1), best_e1rm=72.0),
+        _day(date(2026, 3, 2), best_e1rm=70.0),
+        _day(date(2026, 3, 4), sessions=2, volume=900.0, best_weight=65.0, best_e1rm=68.0),
+        _day(date(2026, 3, 10), best_e1rm=75.0),
+        _day(date(2026, 3, 11), best_e1rm=None),
+    ]
+
+    weekly = build_trend("bench", rows, "week", None, None)
+    assert [(point.period_start, point.sessions, point.e1rm_pr) for point in weekly.points] == [
+        (date(2026, 3, 2), 3, True),
+        (date(2026, 3, 9), 2, True),
+        (date(2026, 3, 30), 1, False),
+    ]
+    assert weekly.points[0].volume == 1400.0
+    assert weekly.points[0].best_e1rm == 70.0
+    records = weekly.records
+    assert (records.sessions, records.first_on, records.last_on) == (6, date(2026, 3, 2), date(2026, 4, 1))
+    assert (records.best_e1rm, records.best_e1rm_on) == (75.0, date(2026, 3, 10))
+    assert (records.best_weight, records.best_weight_on) == (65.0, date(2026, 3, 4))
+    assert (records.max_volume, records.max_volume_on) == (900.0, date(2026, 3, 4))
+
+    monthly = build_trend("bench", rows, "month", None, None)
+    assert [(point.period_start, point.e1rm_pr) for point in monthly.points] == [
+        (date(2026, 3, 1), True),
+        (date(2026, 4, 1), False),
+    ]
+
+    # A window keeps all-time records and judges PRs against every earlier day, not just the visible ones.
+    daily = build_trend("bench", rows, "day", date(2026, 3, 4), date(2026, 3, 10))
+    assert [(point.period_start, point.e1rm_pr) for point in daily.points] == [
+        (date(2026, 3, 4), False),
+        (date(2026, 3, 10), True),
+    ]
+    assert daily.records == records
@@ -0,0 +1,70 @@
+from datetime import date, datetime
+
+from app.core.database import SessionLocal
+from app.models.gym import GymExercise, GymExerciseHistory, GymWeeklyVolume
+from app.models.user import User
+from app.services.gym_rollups import GYM_ROLLUP_VERSION, ensure_gym_rollups
+from app.services.gym_volume import apply_volume_deltas
+
+from .conftest import count_statements
+
+
+def test_volume_read_rebuilds_stale_rollups_once(client, auth_headers, db, user):
+    exercise = GymExercise(id=f"squat-{user.id}", user_id=user.id, name="Squat", primary_muscle="Quads")
+    db.add(exercise)
+    db.flush()
+    # Logged without going through the API, as if it predated the rollup tables.
+    db.add(
+        GymExerciseHistory(
+            user_id=user.id,
+            exercise_id=exercise.id,
+            recorded_at=datetime(2026, 3, 4, 18, 0),
+            sets=[{"reps": 5}, {"reps": 5}],
+        )
+    )
+    db.commit()
+
+    response = client.get("/api/gym/volume", params={"weeks": 1, "end_date": "2026-03-04"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    muscles = {entry["muscle"]: entry["direct_sets"] for entry in response.json()["weeks"][0]["muscles"]}
+    assert muscles["quads"] == 2
+    db.expire_all()
+    assert db.get(User, user.id).gym_rollup_version == GYM_ROLLUP_VERSION
+    assert db.query(GymWeeklyVolume).filter(GymWeeklyVolume.user_id == user.id).count() == 1
+
+    # Current rollups cost a single version lookup on the users row.
+    with count_statements() as stats:
+        ensure_gym_rollups(db, user.id)
+    assert stats.db_statements == 1
+
+
+def _volume(db, user_id: str) -> dict:
+    db.expire_all()
+    rows = db.query(GymWeeklyVolume).filter(GymWeeklyVolume.user_id == user_id)
+    return {(row.week_start, row.muscle): (row.direct_sets, row.indirect_sets) for row in rows}
+
+
+def test_volume_deltas_add_up_across_sessions_and_clamp(db, user):
+    week = date(2026, 3, 2)
+    apply_volume_deltas(db, user.id, {(week, "quads"): [3, 0], (week, "glutes"): [0, 3]})
+    db.commit()
+    # A concurrent request only sees its own deltas; the sums happen in SQL.
+    with SessionLocal() as other:
+        apply_volume_deltas(other, user.id, {(week, "quads"): [2, 1]})
+        other.commit()
+    assert _volume(db, user.id) == {(week, "quads"): (5, 1), (week, "glutes"): (0, 3)}
+
+    apply_volume_deltas(
+        db,
+        user.id,
+        {
+            (week, "quads"): [-9, 0],
+            (week, "glutes"): [0, -3],
+            # Removals the rollup never counted neither create rows nor go negative.
+            (week, "hamstrings"): [-2, 0],
+            (week, "calves"): [-1, 2],
+        },
+    )
+    db.commit()
+    assert _volume(db, user.id) == {(week, "quads"): (0, 1), (week, "calves"): (0, 2)}
@@ -0,0 +1,94 @@
+from app.models.gym import GymDayAssignment, GymExercise
+from app.services.gym_muscles import muscle_tokens, normalize_muscle
+from app.services.gym_substitutes import build_substitute_index
+
+# (id, name, primary, secondary, groups), in the name order the router loads them.
+LIBRARY = [
+    ("fly", "Cable fly", "Chest", None, []),
+    ("bench", "Bench press", "Chest", "Triceps", ["Shoulders"]),
+    ("dips", "Dips", "Triceps", "Chest", []),
+    ("incline", "Incline press", "Chest", "Shoulders", []),
+    ("raise", "Lateral raise", "Shoulders", None, ["Delts"]),
+    ("ohp", "Overhead press", "Shoulders", "Triceps", []),
+    ("squat", "Squat", "Quads", "Glutes", []),
+    ("pushdown", "Triceps pushdown", "Triceps", None, []),
+]
+
+
+def _legacy_rank(reference: tuple, library: list[tuple], target_tokens: set[str]) -> list[str]:
+    # The scoring the substitute endpoint used before the index: a full scan with a stable sort.
+    ref_primary, ref_secondary = normalize_muscle(reference[2]), normalize_muscle(reference[3])
+    ranked = []
+    for exercise_id, name, primary, secondary, groups in library:
+        if target_tokens and exercise_id != reference[0] and not target_tokens & set(muscle_tokens(primary, secondary, groups)):
+            continue
+        primary, secondary = normalize_muscle(primary), normalize_muscle(secondary)
+        if exercise_id == reference[0]:
+            score = 0.0
+        elif primary == ref_primary:
+            score = 1.0
+        elif secondary == ref_primary:
+            score = 1.5
+        elif ref_secondary and (primary == ref_secondary or secondary == ref_secondary):
+            score = 2.0
+        else:
+            score = 3.0
+        ranked.append((score, name.lower(), exercise_id))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+    return [exercise_id for _, _, exercise_id in ranked]
+
+
+def test_rank_matches_the_legacy_scoring_order():
+    library = sorted(LIBRARY, key=lambda row: row[1])
+    # Half the rows carry stored tokens and half are tokenized by the index, as after the backfill.
+    index = build_substitute_index(
+        (exercise_id, name, primary, secondary, groups, muscle_tokens(primary, secondary, groups) if position % 2 else None)
+        for position, (exercise_id, name, primary, secondary, groups) in enumerate(library)
+    )
+    by_id = {row[0]: row for row in library}
+
+    for reference_id, target_tokens in [
+        ("bench", {"chest", "triceps", "shoulders"}),
+        ("bench", {"triceps"}),
+        ("pushdown", {"triceps"}),
+        ("ohp", set()),
+        ("squat", {"chest"}),
+    ]:
+        reference = by_id[reference_id]
+        ranked = index.rank(reference_id, reference[2], reference[3], target_tokens)
+        assert ranked == _legacy_rank(reference, library, target_tokens), reference_id
+
+    assert index.rank("bench", "Chest", "Triceps", {"chest", "triceps"}) == ["bench", "fly", "incline", "dips", "ohp", "pushdown"]
+
+
+def test_substitute_skips_inactive_exercises_and_appends_explicit_options(client, auth_headers, db, user):
+    def exercise_id(key: str) -> str:
+        return f"{key}-{user.id}"
+
+    db.add_all(
+        GymExercise(
+            id=exercise_id(key), user_id=user.id, name=name, primary_muscle=primary, secondary_muscle=secondary, muscle_groups=groups
+        )
+        for key, name, primary, secondary, groups in LIBRARY
+    )
+    db.add(GymExercise(id=exercise_id("decline"), user_id=user.id, name="Decline press", primary_muscle="Chest", is_active=False))
+    db.add(GymExercise(id=exercise_id("old"), user_id=user.id, name="Old press", primary_muscle="Quads", is_active=False))
+    assignment = GymDayAssignment(
+        user_id=user.id,
+        day_key="monday",
+        slot_id="press",
+        slot_name="Press",
+        default_exercise_id=exercise_id("bench"),
+        # Neither option matches the slot's muscles; only the active one joins the rotation, after the ranked ones.
+        options=[exercise_id("squat"), exercise_id("old")],
+    )
+    db.add(assignment)
+    db.commit()
+
+    response = client.post(f"/api/gym/assignments/{assignment.id}/substitute", headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["selected_exercise_id"] == exercise_id("fly")
+    rotation = ["fly", "incline", "dips", "ohp", "pushdown", "raise", "squat", "bench"]
+    assert body["options"] == [exercise_id(key) for key in rotation]
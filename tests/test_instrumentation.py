@@ -0,0 +1,20 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import engine
+
+from .conftest import count_statements
+
+
+def test_failed_statement_leaves_no_start_time_on_the_connection():
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM no_such_table"))
+        assert connection.info.get("query_started_at") == []
+
+        with count_statements() as stats:
+            connection.execute(text("SELECT 1"))
+        assert connection.info["query_started_at"] == []
+
+    assert stats.db_statements == 1
@@ -0,0 +1,34 @@
+from datetime import date, datetime, time, timedelta
+
+from app.models.task import TaskScheduledSlot
+
+
+def test_bulk_snooze_then_complete_clears_the_moved_slot(client, auth_headers, db):
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    slot = datetime.combine(today, time(9, 0)).isoformat()
+    moved_slot = datetime.combine(tomorrow, time(9, 0)).isoformat()
+    created = client.post(
+        "/api/tasks/",
+        json={"title": "Water plants", "metadata_json": {"scheduled_slots": [slot]}},
+        headers=auth_headers,
+    )
+    assert created.status_code == 201
+    task_id = created.json()["id"]
+
+    response = client.post(
+        "/api/tasks/actions",
+        json={
+            "actions": [
+                {"task_id": task_id, "action": "snooze", "action_date": slot, "scheduled_slot": slot, "target_date": tomorrow.isoformat()},
+                {"task_id": task_id, "action": "complete", "action_date": moved_slot, "scheduled_slot": moved_slot},
+            ]
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["ok"] for result in results] == [True, True]
+    assert results[-1]["task"]["metadata_json"]["scheduled_slots"] == []
+    assert db.query(TaskScheduledSlot).filter(TaskScheduledSlot.task_id == task_id).count() == 0
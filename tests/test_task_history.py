@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+from app.models.task import TaskHistory, TaskTemplate
+
+
+def _task(db, user, title: str = "Read") -> TaskTemplate:
+    task = TaskTemplate(user_id=user.id, category="daily", title=title)
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _log(db, user, task: TaskTemplate, completed_at: datetime, record_id: str | None = None) -> TaskHistory:
+    record = TaskHistory(id=record_id, user_id=user.id, task_id=task.id, completed_at=completed_at, duration_minutes=10)
+    db.add(record)
+    return record
+
+
+def _pages(client, url: str, headers: dict, **params) -> list[list[str]]:
+    pages: list[list[str]] = []
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        pages.append([entry["id"] for entry in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_history_cursor_walks_completed_at_ties_in_id_order(client, auth_headers, db, user):
+    reading, running = _task(db, user, "Read"), _task(db, user, "Run")
+    tied = datetime(2026, 3, 4, 18, 0)
+    for task, completed_at, record_id in [
+        (reading, tied, "b" * 36),
+        (running, tied, "d" * 36),
+        (reading, tied, "a" * 36),
+        (running, tied, "c" * 36),
+        (reading, tied + timedelta(seconds=1), "0" * 36),
+        (running, tied - timedelta(microseconds=1), "f" * 36),
+    ]:
+        _log(db, user, task, completed_at, record_id)
+    db.commit()
+    expected = ["0" * 36, "d" * 36, "c" * 36, "b" * 36, "a" * 36, "f" * 36]
+
+    pages = _pages(client, "/api/tasks/history", auth_headers, limit=2)
+
+    assert pages == [expected[0:2], expected[2:4], expected[4:6]]
+    # Pages of one task skip the other task's rows on either side of the tie.
+    pages = _pages(client, f"/api/tasks/{reading.id}/history", auth_headers, limit=1)
+    assert [ids for page in pages for ids in page] == ["0" * 36, "b" * 36, "a" * 36]
+
+
+def test_history_date_filter_covers_whole_days(client, auth_headers, db, user):
+    task = _task(db, user)
+    inside = [
+        _log(db, user, task, datetime(2026, 3, 4, 0, 0)),
+        _log(db, user, task, datetime(2026, 3, 5, 23, 59, 59, 999999)),
+    ]
+    _log(db, user, task, datetime(2026, 3, 3, 23, 59, 59, 999999))
+    _log(db, user, task, datetime(2026, 3, 6, 0, 0))
+    db.commit()
+    params = {"start_date": "2026-03-04", "end_date": "2026-03-05"}
+
+    for url in ("/api/tasks/history", f"/api/tasks/{task.id}/history"):
+        pages = _pages(client, url, auth_headers, limit=1, **params)
+        assert pages == [[inside[1].id], [inside[0].id]]
+
+
+def test_task_history_defaults_to_a_250_row_page(client, auth_headers, db, user):
+    task = _task(db, user)
+    start = datetime(2026, 1, 1, 8, 0)
+    for offset in range(251):
+        _log(db, user, task, start + timedelta(hours=offset))
+    db.commit()
+
+    response = client.get(f"/api/tasks/{task.id}/history", headers=auth_headers)
+
+    assert len(response.json()) == 250
+    oldest = client.get(
+        f"/api/tasks/{task.id}/history", params={"cursor": response.headers["X-Next-Cursor"]}, headers=auth_headers
+    )
+    assert [entry["completed_at"] for entry in oldest.json()] == [start.isoformat()]
+    assert "X-Next-Cursor" not in oldest.headers
+
+
+def test_history_rejects_a_malformed_cursor(client, auth_headers):
+    response = client.get("/api/tasks/history", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+
+    assert response.status_code == 400
@@ -0,0 +1,50 @@
+from datetime import date, datetime, timedelta
+
+from app.models.task import TaskHistory, TaskTemplate
+from app.routers.tasks import preview_schedule
+from app.schemas.task import ScheduleRequest
+
+from .conftest import count_statements
+
+
+def _add_occasional_tasks(db, user, count: int, completed_at: datetime) -> None:
+    for index in range(count):
+        task = TaskTemplate(
+            user_id=user.id,
+            title=f"Occasional {index}",
+            recurrence={"mode": "repeat", "config": {"start_after_days": 7, "end_before_days": 14}},
+            last_completed_at=completed_at,
+        )
+        db.add(task)
+        db.flush()
+        for days_ago in (30, 20, 10):
+            db.add(TaskHistory(user_id=user.id, task_id=task.id, completed_at=completed_at - timedelta(days=days_ago), duration_minutes=30))
+    db.commit()
+
+
+def _preview(db, user):
+    with count_statements() as stats:
+        response = preview_schedule(ScheduleRequest(), db=db, current_user=user)
+    return response, stats.db_statements
+
+
+def test_schedule_preview_query_count_is_flat(db, user):
+    completed_at = datetime.combine(date.today() - timedelta(days=3), datetime.min.time())
+    _add_occasional_tasks(db, user, 3, completed_at)
+    small, small_statements = _preview(db, user)
+
+    _add_occasional_tasks(db, user, 30, completed_at)
+    large, large_statements = _preview(db, user)
+
+    assert len(small.tasks) == 3
+    assert len(large.tasks) == 33
+    assert large_statements == small_statements
+
+
+def test_schedule_preview_reads_last_completed_at(db, user):
+    completed_at = datetime.combine(date.today() - timedelta(days=3), datetime.min.time())
+    _add_occasional_tasks(db, user, 1, completed_at)
+
+    response, _ = _preview(db, user)
+
+    assert response.tasks[0].last_completed_at.date() == completed_at.date()
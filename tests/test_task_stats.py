@@ -0,0 +1,84 @@
+from datetime import UTC, date, datetime, timedelta, timezone
+
+from app.core.database import SessionLocal
+from app.models.task import TaskDailyStat, TaskHistory, TaskTemplate
+from app.services.task_stats import build_task_stats, record_history_stats, tally_history
+
+
+def _task(category: str, created: date, **fields) -> TaskTemplate:
+    return TaskTemplate(
+        id=f"{category}-task",
+        category=category,
+        title=category,
+        metadata_json={},
+        created_at=datetime.combine(created, datetime.min.time()),
+        **fields,
+    )
+
+
+def test_occasional_completion_rate_counts_scheduled_days():
+    end = date(2026, 3, 31)
+    start = end - timedelta(days=29)
+    task = _task("occasional", start)
+    rows = [
+        (task.id, date(2026, 3, 5), 1, 0, 0, 30),
+        (task.id, date(2026, 3, 12), 0, 0, 1, 0),
+        (task.id, date(2026, 3, 19), 1, 0, 0, 30),
+    ]
+    # The missed slot stays behind; completed and skipped slots were cleared by their actions.
+    scheduled = [(task.id, date(2026, 3, 26)), (task.id, date(2026, 2, 1))]
+
+    stats = build_task_stats([task], rows, start, end, end, scheduled)
+
+    entry = stats.tasks[0]
+    assert entry.eligible_days == 4
+    assert entry.active_days == 2
+    assert entry.completion_rate == 0.5
+    assert stats.categories[0].completion_rate == 0.5
+
+
+def test_daily_completion_rate_still_counts_every_day():
+    end = date(2026, 3, 31)
+    start = end - timedelta(days=9)
+    task = _task("daily", start)
+    rows = [(task.id, start + timedelta(days=offset), 1, 0, 0, 10) for offset in range(5)]
+
+    entry = build_task_stats([task], rows, start, end, end).tasks[0]
+
+    assert entry.eligible_days == 10
+    assert entry.completion_rate == 0.5
+
+
+def test_record_history_stats_adds_to_the_existing_day_row(db, user):
+    task = TaskTemplate(user_id=user.id, category="daily", title="Read")
+    db.add(task)
+    db.commit()
+    morning = TaskHistory(user_id=user.id, task_id=task.id, completed_at=datetime(2026, 3, 4, 8, 0), duration_minutes=20)
+    record_history_stats(db, user.id, [morning])
+    db.commit()
+
+    # A second request on its own session lands on the same (task_id, day) key.
+    with SessionLocal() as other:
+        evening = [
+            TaskHistory(user_id=user.id, task_id=task.id, completed_at=datetime(2026, 3, 4, 21, 0), duration_minutes=15),
+            TaskHistory(
+                user_id=user.id, task_id=task.id, completed_at=datetime(2026, 3, 4, 22, 0), duration_minutes=15, status="skipped"
+            ),
+        ]
+        record_history_stats(other, user.id, evening)
+        other.commit()
+
+    row = db.query(TaskDailyStat).filter(TaskDailyStat.task_id == task.id).one()
+    db.refresh(row)
+    assert (row.day, row.completed_count, row.progress_count, row.skipped_count, row.minutes) == (date(2026, 3, 4), 2, 0, 1, 35)
+
+
+def test_tally_history_buckets_by_utc_day():
+    late_evening = datetime(2026, 3, 4, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+    rows = [
+        ("user", "task", late_evening, "completed", 10),
+        ("user", "task", datetime(2026, 3, 5, 1, 0), "progress", 5),
+        ("user", "task", datetime(2026, 3, 5, 0, 0, tzinfo=UTC), None, 0),
+    ]
+
+    assert tally_history(rows) == {("user", "task", date(2026, 3, 5)): [2, 1, 0, 15]}
@@ -0,0 +1,62 @@
+from app.core.ttl_cache import VersionedTTLCache, cache_collector
+
+
+def test_put_with_a_stale_version_is_ignored():
+    cache: VersionedTTLCache[str, str] = VersionedTTLCache(8, 60)
+    version = cache.version("user")
+    cache.invalidate("user")
+
+    cache.put("user", "graph", version)
+
+    assert cache.get("user") is None
+    cache.put("user", "graph", cache.version("user"))
+    assert cache.get("user") == "graph"
+
+
+def test_invalidate_drops_every_entry_of_the_owner():
+    cache: VersionedTTLCache[tuple[str, int], str] = VersionedTTLCache(8, 60)
+    cache.put(("a", 1), "a1", owner="a")
+    cache.put(("a", 7), "a7", owner="a")
+    cache.put(("b", 1), "b1", owner="b")
+
+    cache.invalidate("a")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get(("a", 1)) is None
+    assert cache.get(("b", 1)) == "b1"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: VersionedTTLCache[str, str] = VersionedTTLCache(2, 60)
+    cache.put("a", "a")
+    cache.put("b", "b")
+    cache.get("a")
+
+    cache.put("c", "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.core.ttl_cache.time.monotonic", lambda: now[0])
+    cache: VersionedTTLCache[str, str] = VersionedTTLCache(8, 10)
+    cache.put("a", "a")
+
+    now[0] += 11
+
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 0, "hits": 0, "misses": 1, "hit_ratio": 0.0}
+
+
+def test_cache_collector_exports_counters():
+    cache: VersionedTTLCache[str, str] = VersionedTTLCache(8, 60)
+    cache.put("a", "a")
+    cache.get("a")
+    cache.get("b")
+
+    metrics = {name: samples[0][1] for name, _, _, samples in cache_collector(cache, "demo_cache", "h", "m", "e")()}
+
+    assert metrics == {"demo_cache_hits_total": 1, "demo_cache_misses_total": 1, "demo_cache_hit_ratio": 0.5, "demo_cache_entries": 1}